@@ -0,0 +1,315 @@
+"""Benchmark suite for the Froeling Connect integration.
+
+Runs offline against MockFroelingConnect. From the repository root::
+
+    python -m benchmarks.bench
+    python -m benchmarks.bench --save-baseline baseline.json
+    python -m benchmarks.bench --baseline baseline.json --tolerance 0.3
+
+The process exits with 1 when a budget or the baseline is exceeded.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import httpx
+
+from custom_components.froeling_connect.const import (
+    CONF_FACILITY_ID,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DATA_HTTP_CLIENT,
+)
+from custom_components.froeling_connect.coordinator import FroelingAPIData
+from custom_components.froeling_connect.froeling_client.parser import DeviceModel, parse_devices
+
+from .mock_server import MockFroelingConnect
+from .synthetic import make_overview, mutate
+
+# Budgets that do not depend on the speed of the machine.
+BUDGETS = {
+    # Bytes allocated by a poll that patches existing devices, per device.
+    'patch_peak_bytes_per_device': 256,
+    # State writes of a refresh where no value changed.
+    'unchanged_refresh_writes': 0,
+    # Logins for a series of refreshes.
+    'refresh_logins': 1,
+}
+
+
+def timed(func: Callable[[], object], repeat: int = 20) -> float:
+    """Return the median run time of func in milliseconds."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs)
+
+
+def allocations(func: Callable[[], object]) -> int:
+    """Return the peak memory allocated while running func, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_parse(components: int) -> dict:
+    """Compare building all devices with patching the persistent model."""
+    overview = make_overview(components)
+    model = DeviceModel('bench')
+    devices = len(model.update(overview))
+    return {
+        'devices': devices,
+        'rebuild_ms': timed(lambda: parse_devices('bench', overview)),
+        'patch_ms': timed(lambda: model.update(overview)),
+        'rebuild_peak_bytes': allocations(lambda: parse_devices('bench', overview)),
+        'patch_peak_bytes': allocations(lambda: model.update(overview)),
+    }
+
+
+def bench_decode(components: int) -> dict:
+    """Compare decoding an overview with json and, if installed, orjson."""
+    payload = json.dumps(make_overview(components)).encode()
+    result = {
+        'payload_bytes': len(payload),
+        'json_ms': timed(lambda: json.loads(payload)),
+    }
+    try:
+        import orjson
+    except ImportError:
+        return result
+    result['orjson_ms'] = timed(lambda: orjson.loads(payload))
+    return result
+
+
+def bench_index(components: int) -> dict:
+    """Compare the lookups of all entities of a refresh: list scan vs. index."""
+    devices = parse_devices('bench', make_overview(components))
+    keys = [device.key for device in devices]
+
+    def scan():
+        for key in keys:
+            [device for device in devices if device.key == key][0]
+
+    def index():
+        data = FroelingAPIData('bench', devices)
+        for key in keys:
+            data.by_key.get(key)
+
+    return {'scan_ms': timed(scan, 5), 'index_ms': timed(index, 5)}
+
+
+async def bench_refresh(components: int, polls: int) -> dict:
+    """Measure coordinator refreshes and the entity fan-out against the mock server."""
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.froeling_connect.coordinator import FroelingDataCoordinator
+    from custom_components.froeling_connect.sensor import FroelingSensor
+
+    server = MockFroelingConnect(components=components, churn=0)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        client = httpx.AsyncClient(transport=server.transport())
+        future = hass.loop.create_future()
+        future.set_result(client)
+        hass.data[DATA_HTTP_CLIENT] = future
+
+        entry = SimpleNamespace(
+            entry_id='bench',
+            data={
+                CONF_USERNAME: 'bench@example.com',
+                CONF_PASSWORD: 'secret',
+                CONF_FACILITY_ID: server.facility_ids[0],
+            },
+            options={},
+        )
+        coordinator = FroelingDataCoordinator(hass, entry)
+        await coordinator._async_setup()
+        await coordinator.async_refresh()
+
+        sensors = []
+        for number, device in enumerate(coordinator.data.devices):
+            sensor = FroelingSensor(hass, coordinator, device, entry)
+            sensor.hass = hass
+            sensor.entity_id = f"sensor.bench_{number}"
+            coordinator.async_add_listener(sensor._handle_coordinator_update)
+            sensors.append(sensor)
+
+        async def refresh() -> float:
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            return (time.perf_counter() - start) * 1000
+
+        unchanged = [await refresh() for _ in range(polls)]
+        writes = coordinator.state_writes
+
+        rng = random.Random(1)
+        changed = []
+        for _ in range(polls):
+            for overview in server.overviews.values():
+                mutate(overview, 0.2, rng)
+            changed.append(await refresh())
+
+        def write_states():
+            for sensor in sensors:
+                sensor.async_write_ha_state()
+
+        result = {
+            'entities': len(sensors),
+            # What HA does per entity on a state write: read the attributes and set the state.
+            'state_write_us': timed(write_states, 5) * 1000 / len(sensors),
+            'unchanged_refresh_ms': statistics.median(unchanged),
+            'changed_refresh_ms': statistics.median(changed),
+            'unchanged_refresh_writes': writes,
+            'state_writes': coordinator.state_writes,
+            'state_writes_skipped': coordinator.state_writes_skipped,
+            'refresh_logins': server.logins,
+            'overview_requests': server.overview_requests,
+            'fingerprint_hits': coordinator.hub.api.fingerprint_hits,
+            'fingerprint_misses': coordinator.hub.api.fingerprint_misses,
+            **{
+                f"last_{phase}_ms": seconds * 1000
+                for phase, seconds in coordinator.hub.api.timings[coordinator.facilityId].items()
+                if phase != 'bytes'
+            },
+            'poll_bytes': coordinator.hub.api.timings[coordinator.facilityId]['bytes'],
+        }
+        await client.aclose()
+        await hass.async_stop(force=True)
+    return result
+
+
+async def bench_setup(components: int, latency: float) -> dict:
+    """Compare the time until the entities can be created: first refresh vs. snapshot."""
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.froeling_connect.coordinator import FroelingDataCoordinator
+
+    server = MockFroelingConnect(components=components, churn=0, latency=latency)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        client = httpx.AsyncClient(transport=server.transport())
+        future = hass.loop.create_future()
+        future.set_result(client)
+        hass.data[DATA_HTTP_CLIENT] = future
+        entry = SimpleNamespace(
+            entry_id='bench',
+            data={
+                CONF_USERNAME: 'bench@example.com',
+                CONF_PASSWORD: 'secret',
+                CONF_FACILITY_ID: server.facility_ids[0],
+            },
+            options={},
+        )
+
+        start = time.perf_counter()
+        coordinator = FroelingDataCoordinator(hass, entry)
+        await coordinator._async_setup()
+        await coordinator.async_refresh()
+        refresh = (time.perf_counter() - start) * 1000
+        await coordinator._snapshot_store.async_save(coordinator._snapshot_data())
+
+        start = time.perf_counter()
+        restored = FroelingDataCoordinator(hass, entry)
+        await restored.async_load_snapshot()
+        snapshot = (time.perf_counter() - start) * 1000
+
+        result = {
+            'devices': len(restored.data.devices),
+            'first_refresh_ms': refresh,
+            'snapshot_ms': snapshot,
+        }
+        await client.aclose()
+        await hass.async_stop(force=True)
+    return result
+
+
+def check(results: dict, baseline: dict | None, tolerance: float) -> list[str]:
+    """Return the budgets and baseline timings the results exceed."""
+    failures = []
+    for components, result in results.items():
+        parse = result['parse']
+        perDevice = parse['patch_peak_bytes'] / parse['devices']
+        if perDevice > BUDGETS['patch_peak_bytes_per_device']:
+            failures.append(f"{components} components: patch allocates {perDevice:.0f} bytes per device")
+        refresh = result.get('refresh')
+        if refresh is not None:
+            for budget in ('unchanged_refresh_writes', 'refresh_logins'):
+                if refresh[budget] > BUDGETS[budget]:
+                    failures.append(f"{components} components: {budget} is {refresh[budget]}")
+
+        if baseline is None or components not in baseline:
+            continue
+        for group, values in result.items():
+            for name, value in values.items():
+                previous = baseline[components].get(group, {}).get(name)
+                if name.endswith(('_ms', '_us')) and previous and value > previous * (1 + tolerance):
+                    unit = name.rsplit('_', 1)[-1]
+                    failures.append(
+                        f"{components} components: {group}.{name} {value:.3f} {unit}, baseline {previous:.3f} {unit}"
+                    )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite for the Froeling Connect integration.")
+    parser.add_argument('--components', default='1,10,50,100,250,500',
+                        help="Comma separated component counts of the synthetic facilities")
+    parser.add_argument('--polls', type=int, default=10, help="Coordinator refreshes per measurement")
+    parser.add_argument('--no-refresh', action='store_true', help="Skip the Home Assistant coordinator benchmarks")
+    parser.add_argument('--latency', type=float, default=0.2,
+                        help="Seconds the mock server delays every response in the setup benchmark")
+    parser.add_argument('--baseline', help="JSON file with the results of a previous run")
+    parser.add_argument('--tolerance', type=float, default=0.3, help="Allowed slowdown against the baseline")
+    parser.add_argument('--save-baseline', help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for components in args.components.split(','):
+        result = {
+            'parse': bench_parse(int(components)),
+            'decode': bench_decode(int(components)),
+            'index': bench_index(int(components)),
+        }
+        if not args.no_refresh:
+            result['refresh'] = asyncio.run(bench_refresh(int(components), args.polls))
+            result['setup'] = asyncio.run(bench_setup(int(components), args.latency))
+        results[components] = result
+        print(f"{components} components")
+        for group, values in result.items():
+            print(f"  {group}: " + ", ".join(
+                f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in values.items()
+            ))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+    failures = check(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Throughput benchmarks of the fleet poller and its time-series store.
+
+Runs offline against MockFroelingConnect, without Home Assistant. From the
+repository root, with the client installed (pip install -e .)::
+
+    python -m benchmarks.fleet
+    python -m benchmarks.fleet --facilities 100,500 --concurrency 8,32 --latency 0.05
+
+The process exits with 1 when a record takes more than the fixed record size on disk.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+from froeling_client.fleet import FleetPoller
+from froeling_client.tsdb import RECORD_SIZE, TimeSeriesReader, TimeSeriesWriter
+
+from .mock_server import MockFroelingConnect
+
+ACCOUNT = {'username': 'bench@example.com', 'password': 'secret', 'base_url': 'http://mock'}
+
+
+def store_bytes(path: str) -> tuple[int, int]:
+    """Return the bytes of the segments and of the series file of a store."""
+    segments = series = 0
+    for name in os.listdir(path):
+        size = os.path.getsize(os.path.join(path, name))
+        if name.endswith('.bin'):
+            segments += size
+        else:
+            series += size
+    return segments, series
+
+
+async def bench_throughput(facilities: int, components: int, concurrency: int, latency: float,
+                           duration: float) -> dict:
+    """Poll all facilities back to back for duration seconds, so the workers are the limit."""
+    server = MockFroelingConnect(facilities, components, latency=latency)
+    with tempfile.TemporaryDirectory() as path:
+        writer = TimeSeriesWriter(path)
+        async with httpx.AsyncClient(
+                transport=server.transport(), limits=httpx.Limits(max_connections=concurrency)
+        ) as client:
+            poller = FleetPoller([ACCOUNT], client, writer, interval=0, concurrency=concurrency, jitter=0,
+                                 rate_limit=None, seed=0)
+            await poller.async_start()
+            start = time.perf_counter()
+            await poller.async_run(duration)
+            elapsed = time.perf_counter() - start
+        segments, series = store_bytes(path)
+
+        reader = TimeSeriesReader(path)
+        now = time.time()
+        start = time.perf_counter()
+        # The last second, found by binary search.
+        recent = sum(1 for _ in reader.query(now - 1, now + 1))
+        range_ms = (time.perf_counter() - start) * 1000
+        seriesIds = set(reader.find(facility=server.facility_ids[0]))
+        start = time.perf_counter()
+        facility = sum(1 for _ in reader.query(0, now + 1, seriesIds))
+        facility_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        scanned = sum(1 for _ in reader.query(0, now + 1))
+        scan_ms = (time.perf_counter() - start) * 1000
+    return {
+        'polls': poller.polls,
+        'failures': poller.failures,
+        'facilities_per_s': poller.polls / elapsed,
+        'samples': writer.samples,
+        'samples_per_s': writer.samples / elapsed,
+        'bytes_per_sample': segments / max(writer.samples, 1),
+        'series_bytes': series,
+        'range_samples': recent,
+        'range_ms': range_ms,
+        'facility_samples': facility,
+        'facility_ms': facility_ms,
+        'scan_samples': scanned,
+        'scan_ms': scan_ms,
+    }
+
+
+async def bench_spread(facilities: int, interval: float, concurrency: int) -> dict:
+    """Measure how evenly the scheduled polls of the fleet are spread over the interval."""
+    server = MockFroelingConnect(facilities, 1)
+    requests: list[float] = []
+
+    async def record(request: httpx.Request) -> None:
+        if request.url.path.endswith('/overview'):
+            requests.append(time.monotonic())
+
+    with tempfile.TemporaryDirectory() as path:
+        async with httpx.AsyncClient(transport=server.transport(), event_hooks={'request': [record]}) as client:
+            poller = FleetPoller([ACCOUNT], client, TimeSeriesWriter(path), interval=interval,
+                                 concurrency=concurrency, rate_limit=None, seed=0)
+            await poller.async_start()
+            await poller.async_run(interval * 3)
+
+    # Requests per tenth of the interval
+    buckets: dict[int, int] = {}
+    for timestamp in requests:
+        bucket = int((timestamp - requests[0]) / (interval / 10))
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+    mean = len(requests) / max(len(buckets), 1)
+    return {
+        'polls': len(requests),
+        'peak_to_mean': max(buckets.values(), default=0) / mean if mean else 0.0,
+        'lateness_ms': poller.lateness / max(poller.polls, 1) * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Throughput benchmarks of the fleet poller.")
+    parser.add_argument('--facilities', default='100,500', help="Comma separated fleet sizes")
+    parser.add_argument('--components', type=int, default=10, help="Components of every synthetic facility")
+    parser.add_argument('--concurrency', default='8,32', help="Comma separated worker counts")
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help="Seconds the mock server delays every response")
+    parser.add_argument('--duration', type=float, default=5, help="Seconds of every throughput measurement")
+    parser.add_argument('--interval', type=float, default=2, help="Poll interval of the spread measurement")
+    args = parser.parse_args()
+
+    failures = []
+    for facilities in map(int, args.facilities.split(',')):
+        for concurrency in map(int, args.concurrency.split(',')):
+            result = asyncio.run(
+                bench_throughput(facilities, args.components, concurrency, args.latency, args.duration)
+            )
+            print(f"{facilities} facilities, {concurrency} workers: " + ", ".join(
+                f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in result.items()
+            ))
+            if result['bytes_per_sample'] > RECORD_SIZE:
+                failures.append(f"{facilities} facilities: {result['bytes_per_sample']:.1f} bytes per sample")
+        result = asyncio.run(bench_spread(facilities, args.interval, max(map(int, args.concurrency.split(',')))))
+        print(f"{facilities} facilities, every {args.interval:g} s: " + ", ".join(
+            f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}"
+            for name, value in result.items()
+        ))
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
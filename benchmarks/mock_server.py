@@ -0,0 +1,198 @@
+"""Local stand-in for the Froeling Connect login and overview endpoints.
+
+Use it in-process as an httpx transport::
+
+    server = MockFroelingConnect(facilities=2, components=50)
+    client = httpx.AsyncClient(transport=server.transport())
+
+or run it as a server on localhost::
+
+    python -m benchmarks.mock_server --facilities 2 --components 50 --port 8080
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import re
+import time
+
+import httpx
+
+from .synthetic import make_overview, mutate
+
+OVERVIEW_PATH = re.compile(r"^/fcs/v1\.0/resources/user/(\d+)/facility/([^/]+)/overview$")
+PARAMETER_PATH = re.compile(r"^/fcs/v1\.0/resources/user/(\d+)/facility/([^/]+)/([^/]+)/param/(\d+)$")
+COMPONENT_PATH = re.compile(r"^/fcs/v1\.0/resources/user/(\d+)/facility/([^/]+)/component/([^/]+)$")
+LOGIN_PATH = "/connect/v1.0/resources/login"
+
+
+def make_token(userId: int, lifetime: int) -> str:
+    """Return a bearer token shaped like a JWT."""
+    def encode(part: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip('=')
+
+    claims = {'sub': userId, 'exp': int(time.time()) + lifetime, 'jti': random.getrandbits(64)}
+    return f"Bearer {encode({'alg': 'none'})}.{encode(claims)}.signature"
+
+
+class MockFroelingConnect:
+    """Serves synthetic facilities, and counts the requests it answers."""
+
+    def __init__(
+            self,
+            facilities: int = 1,
+            components: int = 10,
+            churn: float = 0.1,
+            userId: int = 4711,
+            tokenLifetime: int = 3600,
+            seed: int = 0,
+            etags: bool = False,
+            latency: float = 0.0,
+    ) -> None:
+        """Initialise."""
+        self.etags = etags
+        # Seconds every in-process response is delayed, like the round trip to the cloud
+        self.latency = latency
+        self.userId = userId
+        self.tokenLifetime = tokenLifetime
+        self.churn = churn
+        self.rng = random.Random(seed)
+        self.overviews = {
+            str(100_000 + number): make_overview(components, seed + number)
+            for number in range(facilities)
+        }
+        self.tokens: set[str] = set()
+        self.logins = 0
+        self.overview_requests = 0
+        self.component_requests = 0
+        self.parameter_writes = 0
+
+    @property
+    def facility_ids(self) -> list[str]:
+        """Return the ids of the facilities."""
+        return list(self.overviews)
+
+    def revoke_tokens(self) -> None:
+        """Reject all issued tokens, like an expired session."""
+        self.tokens.clear()
+
+    def handle(
+            self, method: str, path: str, authorization: str | None, body: bytes, ifNoneMatch: str | None = None
+    ) -> tuple[int, dict, bytes]:
+        """Answer a request with status, headers and body."""
+        if method == 'POST' and path == LOGIN_PATH:
+            self.logins += 1
+            token = make_token(self.userId, self.tokenLifetime)
+            self.tokens.add(token)
+            userData = {
+                'userId': self.userId,
+                'facilities': [{'facilityId': facilityId} for facilityId in self.overviews],
+            }
+            return 200, {'Authorization': token}, json.dumps({'userData': userData}).encode()
+
+        match = OVERVIEW_PATH.match(path)
+        if method == 'GET' and match:
+            if authorization not in self.tokens:
+                return 401, {}, b'{}'
+            overview = self.overviews.get(match.group(2))
+            if overview is None or int(match.group(1)) != self.userId:
+                return 404, {}, b'{}'
+            self.overview_requests += 1
+            mutate(overview, self.churn, self.rng)
+            body = json.dumps(overview).encode()
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if self.etags and ifNoneMatch == etag:
+                return 304, {'ETag': etag}, b''
+            return 200, {'ETag': etag} if self.etags else {}, body
+
+        match = COMPONENT_PATH.match(path)
+        if method == 'GET' and match:
+            if authorization not in self.tokens:
+                return 401, {}, b'{}'
+            overview = self.overviews.get(match.group(2), {'components': []})
+            component = next(
+                (component for component in overview['components'] if component['componentId'] == match.group(3)),
+                None,
+            )
+            if component is None:
+                return 404, {}, b'{}'
+            self.component_requests += 1
+            parameters = [value for value in component.values() if isinstance(value, dict) and 'name' in value]
+            details = {
+                'componentId': component['componentId'],
+                'displayName': component['displayName'],
+                'parameters': parameters,
+            }
+            return 200, {}, json.dumps(details).encode()
+
+        match = PARAMETER_PATH.match(path)
+        if method == 'PUT' and match:
+            if authorization not in self.tokens:
+                return 401, {}, b'{}'
+            overview = self.overviews.get(match.group(2), {'components': []})
+            for component in overview['components']:
+                if component['componentId'] != match.group(3):
+                    continue
+                for value in component.values():
+                    if isinstance(value, dict) and value.get('id') == int(match.group(4)) and value.get('editable'):
+                        self.parameter_writes += 1
+                        value['value'] = str(json.loads(body)['value'])
+                        if 'stringListKeyValues' in value:
+                            value['displayValue'] = value['stringListKeyValues'].get(value['value'], value['value'])
+                        return 200, {}, b'{}'
+            return 404, {}, b'{}'
+
+        return 404, {}, b'{}'
+
+    async def _handle_httpx(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        status, headers, body = self.handle(
+            request.method, request.url.path, request.headers.get('Authorization'), request.content,
+            request.headers.get('If-None-Match'),
+        )
+        headers['Content-Type'] = 'application/json'
+        return httpx.Response(status, headers=headers, content=body)
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport answering in-process, without network."""
+        return httpx.MockTransport(self._handle_httpx)
+
+    def app(self):
+        """Return an aiohttp application serving the endpoints."""
+        from aiohttp import web
+
+        async def handler(request: web.Request) -> web.Response:
+            status, headers, body = self.handle(
+                request.method, request.path, request.headers.get('Authorization'), await request.read(),
+                request.headers.get('If-None-Match'),
+            )
+            return web.Response(status=status, headers=headers, body=body, content_type='application/json')
+
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handler)
+        return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--facilities', type=int, default=1)
+    parser.add_argument('--components', type=int, default=10)
+    parser.add_argument('--churn', type=float, default=0.1)
+    parser.add_argument('--etags', action='store_true', help="Answer conditional requests with 304")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+
+    from aiohttp import web
+
+    server = MockFroelingConnect(args.facilities, args.components, args.churn, etags=args.etags)
+    print(f"Facilities: {', '.join(server.facility_ids)}")
+    web.run_app(server.app(), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
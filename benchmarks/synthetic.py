@@ -0,0 +1,96 @@
+"""Synthetic facilities shaped like the Froeling Connect overview."""
+
+import random
+
+# Values of the component types the parser knows. Not imported from the parser, so that the
+# benchmarks load the client only from the root they measure.
+COMPONENTS = {
+    'BOILER': ('boilerTemp', 'mode2', 'ignitionWhenBufferTempBelow'),
+    'CIRCUIT': ('desiredRoomTemp', 'mode', 'actualFlowTemp'),
+    'DHW': ('dhwTempTop', 'mode', 'setDhwTemp'),
+    'BUFFER_TANK': ('bufferPumpControl', 'bufferTankCharge', 'bufferTempBottom', 'bufferTempTop'),
+    'FEED_SYSTEM': ('pelletsUsageCounter', 'remainingPelletsAmount', 'totalPelletConsumption'),
+}
+
+# Values with a unit, the other values are modes and get a displayValue.
+UNITS = {
+    'boilerTemp': '°C',
+    'ignitionWhenBufferTempBelow': '°C',
+    'desiredRoomTemp': '°C',
+    'actualFlowTemp': '°C',
+    'dhwTempTop': '°C',
+    'setDhwTemp': '°C',
+    'bufferPumpControl': '%',
+    'bufferTankCharge': '%',
+    'bufferTempBottom': '°C',
+    'bufferTempTop': '°C',
+    'pelletsUsageCounter': 't',
+    'remainingPelletsAmount': 't',
+    'totalPelletConsumption': 't',
+}
+
+MODES = ('Auto', 'Heizen', 'Absenken', 'Aus')
+# Setpoints that can be changed, with their limits
+SETPOINTS = {'desiredRoomTemp': (10, 30), 'setDhwTemp': (30, 75)}
+
+
+def make_value(name: str, rng: random.Random) -> dict:
+    """Return a value of a component."""
+    unit = UNITS.get(name)
+    if unit is None:
+        mode = rng.randrange(len(MODES))
+        return {
+            'id': rng.randrange(1, 10_000), 'name': name, 'displayName': name,
+            'value': str(mode), 'displayValue': MODES[mode], 'editable': True,
+            'stringListKeyValues': {str(number): label for number, label in enumerate(MODES)},
+        }
+    if name in SETPOINTS:
+        minVal, maxVal = SETPOINTS[name]
+        return {
+            'id': rng.randrange(1, 10_000), 'name': name, 'displayName': name,
+            'value': str(rng.randrange(minVal, maxVal)), 'unit': unit, 'editable': True,
+            'minVal': str(minVal), 'maxVal': str(maxVal),
+        }
+    return {
+        'id': rng.randrange(1, 10_000), 'name': name, 'displayName': name,
+        'value': str(round(rng.uniform(0, 90), 1)), 'unit': unit, 'editable': False,
+    }
+
+
+def make_component(componentType: str, number: int, rng: random.Random) -> dict:
+    """Return a component of the given type with all values the parser knows."""
+    component = {
+        'componentId': f"{number}_{rng.randrange(100, 999)}",
+        'componentNumber': number,
+        'displayName': f"{componentType.title()} {number}",
+        'type': componentType,
+        'state': {'displayValue': rng.choice(MODES)},
+        'mode': {'displayValue': rng.choice(MODES), 'displayName': 'mode', 'value': '1'},
+        'active': True,
+    }
+    for name in COMPONENTS[componentType]:
+        component.setdefault(name, make_value(name, rng))
+    return component
+
+
+def make_overview(components: int, seed: int = 0) -> dict:
+    """Return an overview with the given number of components of every known type."""
+    rng = random.Random(seed)
+    types = list(COMPONENTS)
+    return {
+        'outTemp': {'value': '4.5', 'unit': '°C', 'displayName': 'Außentemperatur'},
+        'components': [
+            make_component(types[number % len(types)], number, rng)
+            for number in range(components)
+        ],
+    }
+
+
+def mutate(overview: dict, fraction: float, rng: random.Random) -> None:
+    """Change the numeric values of a fraction of the components in place."""
+    for component in overview['components']:
+        if rng.random() >= fraction:
+            continue
+        for value in component.values():
+            if isinstance(value, dict) and 'unit' in value:
+                value['value'] = str(round(rng.uniform(0, 90), 1))
@@ -1,23 +1,28 @@
 """Froeling Component"""
 
 import logging
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
-from .coordinator import FroelingDataCoordinator
+from .coordinator import FroelingDataCoordinator, forecast_store, snapshot_store
+from .services import async_setup_services
+from .hub import session_store
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.NUMBER, Platform.SELECT, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 @dataclass
@@ -28,37 +33,55 @@ class RuntimeData:
     cancel_update_listener: Callable
 
 
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(
         hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up platform from a ConfigEntry."""
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = entry.data
 
-    # Forward the setup to the sensor platform.
+    start = time.perf_counter()
     coordinator = FroelingDataCoordinator(hass, entry)
 
-    await coordinator.async_config_entry_first_refresh()
+    # Set up the entities from the last known devices, without waiting for the cloud.
+    fromSnapshot = await coordinator.async_load_snapshot()
+    if not fromSnapshot:
+        await coordinator.async_config_entry_first_refresh()
 
-    if not coordinator.api.connected:
-        raise ConfigEntryNotReady
+        if not coordinator.hub.api.connected:
+            raise ConfigEntryNotReady
 
     cancel_update_listener = entry.add_update_listener(_async_update_listener)
 
     hass.data[DOMAIN][entry.entry_id] = RuntimeData(
         coordinator, cancel_update_listener
     )
-    for platform in PLATFORMS:
-        hass.async_create_task(
-            hass.config_entries.async_forward_entry_setup(entry, platform)
+    # Forward the setup to the platforms.
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if fromSnapshot:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
         )
+    _LOGGER.debug(
+        "Set up %s in %.3f s, from snapshot: %s", entry.entry_id, time.perf_counter() - start, fromSnapshot
+    )
     # Return true to denote a successful setup.
     return True
 
 
 async def _async_update_listener(hass: HomeAssistant, config_entry):
     """Handle config options update."""
-    # Reload the integration when the options change.
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    # Apply the options to the running coordinator, instead of reloading the integration.
+    coordinator: FroelingDataCoordinator = hass.data[DOMAIN][config_entry.entry_id].coordinator
+    coordinator.async_apply_options()
+    # Not throttled like the refresh service, so the new options are applied right away.
+    await coordinator.async_refresh_changed()
 
 
 async def async_remove_config_entry_device(
@@ -79,6 +102,9 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     # Remove the config options update listener
     hass.data[DOMAIN][config_entry.entry_id].cancel_update_listener()
 
+    # Leave the account hub, so its facility is no longer fetched
+    await hass.data[DOMAIN][config_entry.entry_id].coordinator.async_shutdown()
+
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(
         config_entry, PLATFORMS
@@ -90,3 +116,17 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
     # Return that unloading was successful.
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the stored devices and forecasts, and the login session with the last config entry of an account."""
+    await forecast_store(hass, config_entry.entry_id).async_remove()
+    await snapshot_store(hass, config_entry.entry_id).async_remove()
+    # The session store is per account, named after the slug of the username.
+    store = session_store(hass, config_entry.data[CONF_USERNAME])
+    if not any(
+            session_store(hass, entry.data[CONF_USERNAME]).key == store.key
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id != config_entry.entry_id
+    ):
+        await store.async_remove()
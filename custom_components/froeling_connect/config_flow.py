@@ -7,19 +7,24 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant.config_entries import (
+    ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
+    OptionsFlow,
 )
 from homeassistant.const import (
     CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
     CONF_USERNAME
 )
 
-from .const import (DOMAIN, CONF_FACILITY_ID)
-from homeassistant.core import HomeAssistant
+from .const import (DOMAIN, CONF_ALLOW, CONF_COMPONENT_DETAILS, CONF_DENY, CONF_DISCOVER, CONF_FACILITY_ID,
+                    CONF_STALE_GRACE, DEFAULT_SCAN_INTERVAL, DEFAULT_STALE_GRACE, MIN_SCAN_INTERVAL)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .api import API, APIAuthError, APIConnectionError
+from .froeling_client.api import API, APIAuthError, APIConnectionError
+from .http_client import async_get_http_client, get_circuit_breaker, get_rate_limiter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,17 +44,12 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    # TODO validate the data can be used to set up a connection.
-
-    # If your PyPI package is not built with async, pass your methods
-    # to the executor:
-    # await hass.async_add_executor_job(
-    #     your_validate_func, data[CONF_USERNAME], data[CONF_PASSWORD]
-    # )
-
-    api = API(data[CONF_USERNAME], data[CONF_PASSWORD],data[CONF_FACILITY_ID])
+    client = await async_get_http_client(hass)
+    api = API(
+        data[CONF_USERNAME], data[CONF_PASSWORD], client, get_rate_limiter(hass), get_circuit_breaker(hass)
+    )
     try:
-        await hass.async_add_executor_job(api.connect)
+        await api.connect()
         # If you cannot connect, raise CannotConnect
         # If the authentication is wrong, raise InvalidAuth
     except APIAuthError as err:
@@ -65,7 +65,11 @@ class FroelingConfigFlow(ConfigFlow, domain=DOMAIN):
     VERSION = 1
     _input_data: dict[str, Any]
 
-
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return FroelingOptionsFlow(config_entry)
 
     async def async_step_user(
             self, user_input: dict[str, Any] | None = None
@@ -145,6 +149,52 @@ class FroelingConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class FroelingOptionsFlow(OptionsFlow):
+    """Handle the options of a facility."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialise options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Handle options flow."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Clamp(min=MIN_SCAN_INTERVAL)),
+                    vol.Required(
+                        CONF_STALE_GRACE,
+                        default=options.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE),
+                    ): vol.All(vol.Coerce(int), vol.Clamp(min=0)),
+                    vol.Required(
+                        CONF_COMPONENT_DETAILS,
+                        default=options.get(CONF_COMPONENT_DETAILS, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_DISCOVER,
+                        default=options.get(CONF_DISCOVER, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ALLOW,
+                        description={"suggested_value": options.get(CONF_ALLOW, "")},
+                    ): str,
+                    vol.Optional(
+                        CONF_DENY,
+                        description={"suggested_value": options.get(CONF_DENY, "")},
+                    ): str,
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -1,9 +1,93 @@
+# Settings of the client library, imported from here by the integration
+from .froeling_client.const import (
+    API_BASE_URL,
+    TOKEN_LIFETIME,
+    TOKEN_EXPIRY_MARGIN,
+    REQUEST_TIMEOUT,
+    CONNECT_TIMEOUT,
+    LOGIN_TIMEOUT,
+    OVERVIEW_TIMEOUT,
+    COMPONENT_TIMEOUT,
+    WRITE_TIMEOUT,
+    MAX_PARALLEL_FETCHES,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    TRANSIENT_STATUS_CODES,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+)
 
 DOMAIN = "froeling_connect"
 OUT_TEMP = "outTemp"
 DEFAULT_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 10
+MAX_SCAN_INTERVAL = 600
 CONF_FACILITY_ID = "facility_id"
 CONF_PASSWORD = "password"
 CONF_USERNAME = "username"
+CONF_COMPONENT_DETAILS = "component_details"
+CONF_STALE_GRACE = "stale_grace"
+CONF_DISCOVER = "discover"
+# Comma separated names of discovered values
+CONF_ALLOW = "allow"
+CONF_DENY = "deny"
 
+# Seconds the last good devices are served after failed refreshes, before the entities become unavailable
+DEFAULT_STALE_GRACE = 600
+
+# Seconds between refreshes requested by the service; options changes and polls are not throttled
+MIN_REFRESH_SPACING = 10
+
+# Seconds a component's details are cached
+DETAIL_SCAN_INTERVAL = 900
+
+# Part of its poll interval before which a facility joins the poll of another facility of the account
+FAN_OUT_SLACK = 0.2
+
+DATA_HTTP_CLIENT = f"{DOMAIN}_http_client"
+DATA_HUBS = f"{DOMAIN}_hubs"
+DATA_RATE_LIMITER = f"{DOMAIN}_rate_limiter"
+DATA_CIRCUIT_BREAKER = f"{DOMAIN}_circuit_breaker"
+SESSION_STORE_VERSION = 1
+
+# Polls kept for the performance metrics
+POLL_METRICS_WINDOW = 100
+
+# Adaptive poll interval
+# Lower case boiler states or mode2 values while preparing, igniting or heating
+ADAPTIVE_ACTIVE_STATES = frozenset((
+    "vorbereitung", "zündung", "anheizen", "heizen", "preparation", "ignition", "firing up", "heating",
+))
+# Seconds the minimum interval is held after the boiler became active, then the configured interval applies
+ADAPTIVE_ACTIVE_HOLD = 300
+# Temperature change in K/min that keeps the configured interval
+ADAPTIVE_RATE_THRESHOLD = 0.2
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+
+# Pellet forecast
+# Samples of the consumption counter, every FORECAST_SAMPLE_INTERVAL seconds (7 days)
+FORECAST_WINDOW = 672
+FORECAST_SAMPLE_INTERVAL = 900
+FORECAST_STORE_VERSION = 1
+# Seconds new samples are collected before the store is written
+FORECAST_SAVE_DELAY = 300
+
+# Hours of statistics written to the recorder at once by the history import
+IMPORT_CHUNK_SIZE = 1000
+
+# Last known devices, saved at most every SNAPSHOT_SAVE_INTERVAL seconds
+SNAPSHOT_STORE_VERSION = 1
+SNAPSHOT_SAVE_INTERVAL = 900
+SNAPSHOT_SAVE_DELAY = 10
+
+# Values of the overview that can be changed, as number or select entities
+WRITABLE_NUMBERS = ('desiredRoomTemp', 'setDhwTemp')
+WRITABLE_SELECTS = ('mode', 'mode2')
+# Seconds changes of a component are collected before they are written
+WRITE_DEBOUNCE = 2
@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
@@ -8,22 +10,74 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import APIAuthError, API
 from .const import *
-from .froelingDevice import FroelingDevice
+from .details import ComponentDetailCache
+from .forecast import KILOGRAMS_PER_UNIT, PelletForecast
+from .froeling_client.api import APIAuthError, controller_name
+from .froeling_client.froelingDevice import FeedSystem, FroelingDevice
+from .froeling_client.parser import FieldFilter
+from .hub import FroelingHub, async_get_hub
+from .metrics import PollMetrics
+from .scheduler import AdaptivePollScheduler
+from .snapshot import dump_snapshot, load_snapshot
+from .writer import ParameterWriter
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def forecast_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store of the pellet forecasts of a config entry."""
+    return Store(hass, FORECAST_STORE_VERSION, f"{DOMAIN}.forecast.{entry_id}")
+
+
+def field_filter(options) -> FieldFilter | None:
+    """Return the filter of the discovered values from the options, None without discovery."""
+    if not options.get(CONF_DISCOVER, False):
+        return None
+
+    def names(option: str) -> frozenset[str]:
+        return frozenset(name.strip() for name in options.get(option, '').split(',') if name.strip())
+
+    return FieldFilter(allow=names(CONF_ALLOW), deny=names(CONF_DENY))
+
+
+def kilograms(sensor: FroelingDevice) -> float | None:
+    """Return the value of a pellet sensor in kg."""
+    if sensor.device.unit not in KILOGRAMS_PER_UNIT:
+        return None
+    return sensor.device.native_value
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store of the last known devices of a config entry."""
+    return Store(hass, SNAPSHOT_STORE_VERSION, f"{DOMAIN}.snapshot.{entry_id}")
+
+
 @dataclass
 class FroelingAPIData:
     """Class to hold api data."""
 
     controller_name: str
     devices: list[FroelingDevice]
+    by_key: dict[str, FroelingDevice] = field(init=False, repr=False)
+    by_unique_id: dict[str, FroelingDevice] = field(init=False, repr=False)
+    by_parent: dict[str, list[FroelingDevice]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Index the devices once per refresh."""
+        self.by_key = {}
+        self.by_unique_id = {}
+        self.by_parent = {}
+        for device in self.devices:
+            self.by_key[device.key] = device
+            self.by_unique_id[device.device.device_unique_id] = device
+            parentIdentifier = getattr(device.device, 'parentIdentifier', None)
+            if parentIdentifier is not None:
+                self.by_parent.setdefault(parentIdentifier, []).append(device)
 
 
 class FroelingDataCoordinator(DataUpdateCoordinator):
@@ -35,7 +89,8 @@ class FroelingDataCoordinator(DataUpdateCoordinator):
         """Initialize coordinator."""
 
         # Set variables from values entered in config flow setup
-        self.config_entry = config_entry
+        # Kept apart from config_entry, which DataUpdateCoordinator sets to the entry being set up, if any.
+        self._entry = config_entry
         self.user = config_entry.data[CONF_USERNAME]
         self.pwd = config_entry.data[CONF_PASSWORD]
         self.facilityId = config_entry.data[CONF_FACILITY_ID]
@@ -61,34 +116,350 @@ class FroelingDataCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=self.poll_interval),
         )
 
-        # Initialise your api here
-        self.api = API(user=self.user, pwd=self.pwd, facilityId=self.facilityId)
+        self.hub: FroelingHub | None = None
+        self.scheduler = AdaptivePollScheduler(self.poll_interval)
+        self.details: ComponentDetailCache | None = None
+        if config_entry.options.get(CONF_COMPONENT_DETAILS, False):
+            self.details = ComponentDetailCache(
+                controller_name(self.facilityId), config_entry.options.get(CONF_DISCOVER, False)
+            )
+
+        # Keys of the devices whose state, unit or name changed in the last refresh.
+        self.changed_keys: set[str] = set()
+        self._fingerprints: dict[str, tuple] = {}
+        self._revision: int | None = None
+        self.state_writes = 0
+        self.state_writes_skipped = 0
+        self.metrics = PollMetrics()
+        self._login_count = 0
+        # Pellet forecast by component id of the feed system
+        self.forecasts: dict[str, PelletForecast] = {}
+        self._forecast_store = forecast_store(hass, config_entry.entry_id)
+        self.writer = ParameterWriter(self)
+        # True while the devices are from the snapshot, until the first refresh,
+        # or while the last good devices are served after failed refreshes
+        self.stale = False
+        self.stale_grace = config_entry.options.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE)
+        self.last_success: float | None = None
+        self._serving_stale = False
+        self.stale_polls = 0
+        self.flaps_prevented = 0
+        self._snapshot_store = snapshot_store(hass, config_entry.entry_id)
+        self._snapshot_saved: float | None = None
+        # Refresh in progress, joined by all refreshes requested meanwhile
+        self._refreshing: asyncio.Future | None = None
+        # When the last refresh was requested by the service, the scheduled polls do not count
+        self._last_requested: float | None = None
+        self.coalesced_refreshes = 0
+        self.throttled_refreshes = 0
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply changed options without reloading the config entry."""
+        options = self._entry.options
+        self.poll_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self.scheduler = AdaptivePollScheduler(self.poll_interval)
+        self.update_interval = timedelta(seconds=self.poll_interval)
+        self.stale_grace = options.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE)
+        if not options.get(CONF_COMPONENT_DETAILS, False):
+            self.details = None
+        elif self.details is None:
+            self.details = ComponentDetailCache(controller_name(self.facilityId), options.get(CONF_DISCOVER, False))
+        else:
+            self.details.discover = options.get(CONF_DISCOVER, False)
+        if self.hub is not None:
+            self.hub.api.set_filter(self.facilityId, field_filter(options))
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        """Refresh, or join the refresh in progress, so only one fetch runs at a time."""
+        if self._refreshing is not None:
+            self.coalesced_refreshes += 1
+            await asyncio.shield(self._refreshing)
+            return
+        self._refreshing = self.hass.loop.create_future()
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            self._refreshing.set_result(None)
+            self._refreshing = None
+
+    async def async_refresh_now(self) -> bool:
+        """Refresh outside of the poll interval, returning False if the last request was too recent.
+
+        A refresh in progress is joined. Otherwise requested refreshes are at
+        least MIN_REFRESH_SPACING seconds apart, so automations cannot flood
+        the cloud; the scheduled polls do not count.
+        """
+        now = time.monotonic()
+        if (
+                self._refreshing is None
+                and self._last_requested is not None
+                and now - self._last_requested < MIN_REFRESH_SPACING
+        ):
+            self.throttled_refreshes += 1
+            _LOGGER.debug("Refresh skipped, the last one was requested %.0f s ago", now - self._last_requested)
+            return False
+        self._last_requested = now
+        await self.async_refresh()
+        _LOGGER.debug(
+            "Requested refreshes joined: %s, throttled: %s", self.coalesced_refreshes, self.throttled_refreshes
+        )
+        return True
+
+    async def async_refresh_changed(self) -> None:
+        """Refresh after the options changed, with a fetch that starts after the refresh in progress."""
+        while self._refreshing is not None:
+            await asyncio.shield(self._refreshing)
+        await self.async_refresh()
+
+    async def async_load_snapshot(self) -> bool:
+        """Serve the last known devices until the first refresh, returning whether there were any."""
+        snapshot = await self._snapshot_store.async_load()
+        if not snapshot:
+            return False
+        devices, details = load_snapshot(snapshot)
+        if not devices:
+            return False
+        self.data = FroelingAPIData(controller_name(self.facilityId), devices)
+        if self.details is not None:
+            self.details.restore(details)
+        self.stale = True
+        return True
+
+    async def _async_setup(self) -> None:
+        """Join the hub of the account."""
+        self.hub = await async_get_hub(self.hass, self.user, self.pwd)
+        self.hub.register(self)
+        self.hub.api.set_filter(self.facilityId, field_filter(self._entry.options))
+        for componentId, data in (await self._forecast_store.async_load() or {}).items():
+            self.forecasts[componentId] = forecast = PelletForecast()
+            forecast.restore(data)
+
+    async def async_shutdown(self) -> None:
+        """Leave the hub of the account."""
+        await super().async_shutdown()
+        self.writer.async_shutdown()
+        if self.hub is not None:
+            self.hub.unregister(self)
 
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
+        self.changed_keys = set()
         try:
-            await self.hass.async_add_executor_job(self.api.connect)
-            devices = await self.hass.async_add_executor_job(self.api.get_Devices)
+            if self.hub is None:
+                # Started from the snapshot, without async_config_entry_first_refresh.
+                await self._async_setup()
+            devices = await self.hub.async_get_devices(self.facilityId)
 
         except APIAuthError as err:
+            self.metrics.failures += 1
             _LOGGER.error(err)
             raise UpdateFailed(err) from err
         except Exception as err:
+            self.metrics.failures += 1
+            if self._serve_stale(err):
+                return self.data
             # This will show entities as unavailable by raising UpdateFailed exception
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-        return FroelingAPIData(self.api.controller_name, devices)
+        data = self.process_devices(devices)
+        if self.details is not None:
+            self.changed_keys |= await self.async_update_details()
+        return data
+
+    def _serve_stale(self, err: Exception) -> bool:
+        """Return if the last good devices are served after a failed refresh, within the grace window."""
+        self._serving_stale = (
+                self.data is not None
+                and self.last_success is not None
+                and time.monotonic() - self.last_success <= self.stale_grace
+        )
+        if not self._serving_stale:
+            return False
+        # Entering the grace window, all entities show the stale flag.
+        self.changed_keys = set() if self.stale else set(self.data.by_key)
+        self.stale = True
+        self.stale_polls += 1
+        _LOGGER.debug("Serving devices of %.0f s ago, error communicating with API: %s", self.data_age, err)
+        return True
+
+    def poll_due(self, now: float) -> bool:
+        """Return if the facility is due for a poll at a monotonic time, within FAN_OUT_SLACK of its interval."""
+        return self.last_success is None or now - self.last_success >= self.scheduler.interval * (1 - FAN_OUT_SLACK)
+
+    @property
+    def data_age(self) -> float | None:
+        """Return the seconds since the last successful refresh."""
+        return None if self.last_success is None else time.monotonic() - self.last_success
+
+    async def async_update_details(self) -> set[str]:
+        """Fetch the details of the components with enabled sensors, or of all once to discover them."""
+        model = self.hub.api.models.get(self.facilityId)
+        if model is None:
+            return set()
+        components = model.components
+        discovery = self.details.discovery_due
+        componentIds = list(components) if discovery else [
+            componentId for componentId in self.details.due() if componentId in components
+        ]
+        if not componentIds:
+            return set()
+
+        changed = set()
+        results = await self.hub.async_get_component_details(self.facilityId, componentIds)
+        for componentId, result in results.items():
+            if isinstance(result, BaseException):
+                # Details are optional, they must not fail the refresh.
+                _LOGGER.debug("Error fetching details of component %s: %s", componentId, result)
+                continue
+            changed |= self.details.update(components[componentId], result)
+        if discovery:
+            self.details.discovered = True
+        return changed
+
+    def process_devices(self, devices: list[FroelingDevice]) -> FroelingAPIData:
+        """Diff and index the devices of a refresh."""
+        start = time.perf_counter()
+        model = self.hub.api.models.get(self.facilityId) if self.hub is not None else None
+        revision = model.revision if model is not None else None
+        if self.data is not None and devices is self.data.devices and revision == self._revision:
+            # The overview was not parsed again, so nothing changed.
+            self.changed_keys = set()
+        else:
+            self.changed_keys = self._diff_devices(devices)
+        self._revision = revision
+        if model is not None:
+            self._update_forecasts(model)
+        if self._serving_stale:
+            # Recovered within the grace window, the entities never became unavailable.
+            self._serving_stale = False
+            self.flaps_prevented += 1
+        if self.stale:
+            # Clear the stale flag of the entities whose value did not change too.
+            self.changed_keys |= {device.key for device in devices}
+        self.stale = False
+        self.last_success = time.monotonic()
+        self._save_snapshot()
+        self._record_metrics(time.perf_counter() - start)
+        _LOGGER.debug(
+            "Changed devices: %s of %s, state writes: %s, skipped: %s",
+            len(self.changed_keys), len(devices), self.state_writes, self.state_writes_skipped
+        )
+
+        self.update_interval = timedelta(seconds=self.scheduler.update(devices))
+
+        if self.data is not None and devices is self.data.devices:
+            # No device was added or removed, the devices were patched in place.
+            return self.data
+        return FroelingAPIData(controller_name(self.facilityId), devices)
+
+    def _update_forecasts(self, model) -> None:
+        """Add the consumption counters of the feed systems to their forecasts."""
+        now = time.time()
+        added = False
+        for componentId, parent in model.components.items():
+            if not isinstance(parent.device, FeedSystem):
+                continue
+            consumed = model.sensor(componentId, 'totalPelletConsumption')
+            if consumed is None:
+                continue
+            consumed = kilograms(consumed)
+            if consumed is None:
+                continue
+            remaining = model.sensor(componentId, 'remainingPelletsAmount')
+            if remaining is not None:
+                remaining = kilograms(remaining)
+            forecast = self.forecasts.get(componentId)
+            if forecast is None:
+                forecast = self.forecasts[componentId] = PelletForecast()
+            added |= forecast.add(now, consumed, remaining)
+        if added:
+            self._forecast_store.async_delay_save(self._forecast_data, FORECAST_SAVE_DELAY)
+
+    @callback
+    def _forecast_data(self) -> dict:
+        return {componentId: forecast.as_dict() for componentId, forecast in self.forecasts.items()}
+
+    def _save_snapshot(self) -> None:
+        now = time.monotonic()
+        if self._snapshot_saved is None or now - self._snapshot_saved >= SNAPSHOT_SAVE_INTERVAL:
+            self._snapshot_saved = now
+            self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_data(self) -> dict:
+        if self.data is None:
+            return {}
+        return dump_snapshot(self.data.devices, self.details.devices if self.details is not None else None)
+
+    def _record_metrics(self, diffSeconds: float) -> None:
+        """Record the timings of the poll that fetched the current devices."""
+        metrics = self.metrics
+        metrics.polls += 1
+        total = diffSeconds
+        metrics.add('diff', diffSeconds)
+
+        if self.hub is not None:
+            api = self.hub.api
+            if api.login_count != self._login_count:
+                metrics.logins += api.login_count - self._login_count
+                self._login_count = api.login_count
+                metrics.add('login', api.last_login_seconds)
+                total += api.last_login_seconds
+            timings = api.timings.get(self.facilityId, {})
+            for phase in ('connect', 'request', 'decode', 'parse'):
+                if phase in timings:
+                    metrics.add(phase, timings[phase])
+                    total += timings[phase]
+            if 'bytes' in timings:
+                metrics.add_bytes(timings['bytes'])
+        metrics.add('total', total)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the entities, recording the duration and state writes of the fan-out."""
+        start = time.perf_counter()
+        writes = self.state_writes
+        super().async_update_listeners()
+        self.metrics.add('fanout', time.perf_counter() - start)
+        self.metrics.entity_writes += self.state_writes - writes
+
+    def _diff_devices(self, devices: list[FroelingDevice]) -> set[str]:
+        """Return the keys of the devices whose state, unit or name changed since the last refresh."""
+        fingerprints = {
+            device.key: (
+                device.device.state,
+                getattr(device.device, 'unit', None),
+                device.device.displayName,
+            )
+            for device in devices
+        }
+        previous = self._fingerprints
+        self._fingerprints = fingerprints
+        return {
+            key
+            for key, fingerprint in fingerprints.items()
+            if previous.get(key) != fingerprint
+        }
 
     def get_device_by_key(
             self, deviceKey: str
     ) -> FroelingDevice | None:
         """Return device by device id."""
         # Called by the binary sensors and sensors to get their updated data from self.data
-        try:
-            return [
-                device
-                for device in self.data.devices
-                if device.key == deviceKey
-            ][0]
-        except IndexError:
-            return None
+        device = self.data.by_key.get(deviceKey)
+        if device is None and self.details is not None:
+            return self.details.devices.get(deviceKey)
+        return device
+
+    def get_device_by_unique_id(
+            self, uniqueId: str
+    ) -> FroelingDevice | None:
+        """Return device by unique id."""
+        return self.data.by_unique_id.get(uniqueId)
+
+    def get_devices_by_parent(
+            self, parentIdentifier: str
+    ) -> list[FroelingDevice]:
+        """Return the sensors of a parent device."""
+        return self.data.by_parent.get(parentIdentifier, [])
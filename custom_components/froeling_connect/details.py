@@ -0,0 +1,99 @@
+"""Component details fetched on demand"""
+
+import logging
+import time
+
+from .const import DETAIL_SCAN_INTERVAL
+from .froeling_client.froelingDevice import DeviceSensor, FroelingDevice
+from .froeling_client.parser import device_type_by_unit, ingest, iter_values
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ComponentDetailCache:
+    """Sensors from the component resources of a facility.
+
+    A component is only fetched if one of its sensors is enabled, and at most
+    every DETAIL_SCAN_INTERVAL seconds. With discover, every component is
+    fetched once to find its parameters, unless they were restored from a
+    snapshot.
+    """
+
+    def __init__(self, controller_name: str, discover: bool = False, interval: int = DETAIL_SCAN_INTERVAL) -> None:
+        """Initialise."""
+        self.controller_name = controller_name
+        self.discover = discover
+        self.interval = interval
+        self.devices: dict[str, FroelingDevice] = {}
+        # Keys of the sensors whose entity is enabled
+        self.enabled: set[str] = set()
+        self.discovered = False
+        self._componentIds: dict[str, str] = {}
+        self._fetched: dict[str, float] = {}
+
+    def restore(self, devices: list[FroelingDevice]) -> None:
+        """Add the sensors of a snapshot, so their components are not discovered again."""
+        for device in devices:
+            self.devices[device.key] = device
+            self._componentIds[device.key] = device.device.parentIdentifier.removeprefix(f"{self.controller_name}_")
+        if devices:
+            self.discovered = True
+
+    @property
+    def discovery_due(self) -> bool:
+        """Return if every component is fetched on the next update to discover its parameters."""
+        return self.discover and not self.discovered
+
+    def due(self, now: float | None = None) -> list[str]:
+        """Return the ids of the components with enabled sensors whose details are outdated."""
+        now = time.monotonic() if now is None else now
+        componentIds = {self._componentIds[key] for key in self.enabled if key in self._componentIds}
+        return [
+            componentId
+            for componentId in componentIds
+            if now - self._fetched.get(componentId, -self.interval) >= self.interval
+        ]
+
+    def update(self, parent: FroelingDevice, data_json: dict, now: float | None = None) -> set[str]:
+        """Add or patch the sensors of a component, returning the keys of changed sensors."""
+        now = time.monotonic() if now is None else now
+        componentId = parent.device.key
+        self._fetched[componentId] = now
+        changed = set()
+
+        for value in iter_values(data_json):
+            name = value.get('name') or value['displayName']
+            key = f"{self.controller_name}_{componentId}_detail_{name}"
+            state = value['displayValue'] if 'displayValue' in value else value['value']
+            unit = value.get('unit') or None
+            displayName = value.get('displayName') or name
+
+            sensor = self.devices.get(key)
+            if sensor is None:
+                self.devices[key] = FroelingDevice(
+                    key=key,
+                    isParent=False,
+                    device=DeviceSensor(device_id=f"{componentId}_{name}",
+                                        device_unique_id=f"{self.controller_name}_{componentId}_{name}",
+                                        key=f"{componentId}_{name}", icon=parent.device.icon,
+                                        state=state, displayName=displayName,
+                                        parentIdentifier=parent.device.device_unique_id,
+                                        type=device_type_by_unit(unit), unit=unit)
+                )
+                ingest(self.devices[key].device)
+                self._componentIds[key] = componentId
+                changed.add(key)
+                continue
+
+            device = sensor.device
+            if (device.state, device.unit, device.displayName) != (state, unit, displayName):
+                device.displayName = displayName
+                if (device.state, device.unit) != (state, unit):
+                    device.state = state
+                    if unit != device.unit:
+                        device.unit = unit
+                        device.type = device_type_by_unit(unit)
+                    ingest(device)
+                changed.add(key)
+
+        return changed
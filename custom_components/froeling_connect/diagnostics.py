@@ -0,0 +1,72 @@
+"""Diagnostics support for Froeling Connect"""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import FroelingDataCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "Authorization", "authorization", "userData"}
+
+
+async def async_get_config_entry_diagnostics(
+        hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry, without credentials."""
+    coordinator: FroelingDataCoordinator = hass.data[DOMAIN][config_entry.entry_id].coordinator
+    diagnostics = {
+        "entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "poll_metrics": coordinator.metrics.as_dict(),
+        "poll_interval": {
+            "seconds": coordinator.scheduler.interval,
+            "reason": coordinator.scheduler.reason,
+        },
+        "stale": {
+            "serving": coordinator.stale,
+            "age": coordinator.data_age,
+            "grace": coordinator.stale_grace,
+            "polls": coordinator.stale_polls,
+            "flaps_prevented": coordinator.flaps_prevented,
+        },
+        "requested_refreshes": {
+            "joined": coordinator.coalesced_refreshes,
+            "throttled": coordinator.throttled_refreshes,
+        },
+        "state_writes": {
+            "performed": coordinator.state_writes,
+            "skipped": coordinator.state_writes_skipped,
+        },
+        "parameter_writes": {
+            "requested": coordinator.writer.requested,
+            "merged": coordinator.writer.coalesced,
+            "written": coordinator.writer.written,
+            "failed": coordinator.writer.failed,
+        },
+        "devices": len(coordinator.data.devices) if coordinator.data is not None else 0,
+    }
+    if coordinator.hub is None:
+        # Started from the snapshot and not connected yet, or the first refresh failed.
+        return diagnostics
+
+    api = coordinator.hub.api
+    diagnostics.update({
+        "api": {
+            "logins": api.login_count,
+            "reused_sessions": api.reuse_count,
+            "retries": api.retry_count,
+            "unchanged_overviews": api.fingerprint_hits,
+            "changed_overviews": api.fingerprint_misses,
+            "last_poll": api.timings.get(coordinator.facilityId),
+        },
+        "hub": {
+            "facilities": len(coordinator.hub.coordinators),
+            "fan_outs": coordinator.hub.fan_out_count,
+        },
+        "circuit_breaker": api.breaker.counters if api.breaker is not None else None,
+        "rate_limiter": api.limiter.counters if api.limiter is not None else None,
+    })
+    return diagnostics
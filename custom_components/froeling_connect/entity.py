@@ -0,0 +1,118 @@
+"""Base entity for the values that can be changed, and the incremental setup of the platforms"""
+
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import FroelingDataCoordinator
+from .froeling_client.froelingDevice import FroelingDevice
+
+
+@callback
+def async_add_new_entities(
+        coordinator: FroelingDataCoordinator,
+        config_entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+        create: Callable[[FroelingDevice], list[Entity]],
+) -> None:
+    """Add the entities of the current devices, and later the ones of devices that appear in a refresh.
+
+    Existing entities are kept; devices are only checked again when a refresh
+    added or removed devices or component details.
+    """
+    known: set[str] = set()
+    seen = [None, -1]
+
+    @callback
+    def add_new() -> None:
+        details = coordinator.details.devices if coordinator.details is not None else {}
+        if seen == [coordinator.data, len(details)]:
+            return
+        seen[:] = [coordinator.data, len(details)]
+        entities = []
+        for froelingDevice in (*coordinator.data.devices, *details.values()):
+            if froelingDevice.key not in known:
+                known.add(froelingDevice.key)
+                entities.extend(create(froelingDevice))
+        if entities:
+            async_add_entities(entities)
+
+    add_new()
+    config_entry.async_on_unload(coordinator.async_add_listener(add_new))
+
+
+class FroelingParameterEntity(CoordinatorEntity):
+    """Value of a component that is written through the API.
+
+    A new value is shown right away and written after the debounce time of
+    the ParameterWriter. It is replaced by the value of the facility once
+    written, or rolled back if the write failed.
+    """
+
+    coordinator: FroelingDataCoordinator
+
+    def __init__(self, coordinator: FroelingDataCoordinator, froelingDevice: FroelingDevice, name: str) -> None:
+        """Initialise entity."""
+        super().__init__(coordinator)
+        device = froelingDevice.device
+        self.key = froelingDevice.key
+        self.froelingDevice = froelingDevice
+        self.componentId = device.parentIdentifier.removeprefix(f"{coordinator.data.controller_name}_")
+        self.parameterId = device.parameterId
+        self._optimistic: str | None = None
+        self._last_available = coordinator.last_update_success
+        # False while the value is missing from the devices
+        self._present = True
+        self._attr_name = device.displayName
+        self._attr_icon = device.icon
+        self._attr_unique_id = f"{DOMAIN}-{device.parentIdentifier}_{name}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device.parentIdentifier)})
+
+    @property
+    def value(self) -> str:
+        """Return the changed value until it is written, otherwise the value of the facility."""
+        if self._optimistic is not None:
+            return self._optimistic
+        return str(self.froelingDevice.device.state)
+
+    @property
+    def available(self) -> bool:
+        """Return if the last refresh succeeded and still has the value."""
+        return self._present and super().available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the value, unless a change is still being written."""
+        device = self.coordinator.get_device_by_key(self.key)
+        self._present = device is not None
+        if device is not None:
+            self.froelingDevice = device
+        written = False
+        if self._optimistic is not None and not self.coordinator.writer.pending(self.componentId, self.parameterId):
+            self._optimistic = None
+            written = True
+        # Only write the state if the value changed or the entity became (un)available.
+        available = self.available
+        if written or self.key in self.coordinator.changed_keys or available != self._last_available:
+            self._last_available = available
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_value(self, value: str, optimistic: str) -> None:
+        """Show a new value and queue its write."""
+        self._optimistic = optimistic
+        self.coordinator.writer.async_set(self.componentId, self.parameterId, value, self._async_rollback)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_rollback(self) -> None:
+        """Show the value of the facility again after a failed write."""
+        self._optimistic = None
+        if self.hass is not None:
+            self.async_write_ha_state()
@@ -0,0 +1,158 @@
+"""Pellet consumption rate and refill forecast"""
+
+import logging
+from array import array
+
+from .const import FORECAST_SAMPLE_INTERVAL, FORECAST_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+# Unit of a pellet value -> kilograms per unit
+KILOGRAMS_PER_UNIT: dict[str | None, float] = {
+    't': 1000.0,
+    'kg': 1.0,
+}
+
+
+def to_kilograms(state, unit: str | None) -> float | None:
+    """Return a pellet value in kilograms, or None if it is not a number in a known unit."""
+    factor = KILOGRAMS_PER_UNIT.get(unit)
+    if factor is None:
+        return None
+    try:
+        return float(state) * factor
+    except (TypeError, ValueError):
+        return None
+
+
+class PelletForecast:
+    """Consumption rate of a feed system from the recent samples of its consumption counter.
+
+    Samples are kept in a fixed size ring buffer. The rate is the slope of a
+    least squares fit over the buffer, whose sums are updated in O(1) for each
+    added and evicted sample. Times are hours since the oldest sample at the
+    last rebase; the sums are rebuilt every time the buffer wrapped around, so
+    rounding errors cannot accumulate.
+    """
+
+    def __init__(self, capacity: int = FORECAST_WINDOW, sample_interval: float = FORECAST_SAMPLE_INTERVAL) -> None:
+        """Initialise."""
+        self.capacity = capacity
+        self.sample_interval = sample_interval
+        # Consumed pellets in kg at a unix timestamp
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+        self._evicted = 0
+        self._origin = 0.0
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0.0
+        self.remaining: float | None = None
+        self.last_time: float | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, timestamp: float, consumed: float, remaining: float | None = None) -> bool:
+        """Add a sample of the consumption counter, returning whether it was kept.
+
+        Samples closer than sample_interval to the previous one are dropped.
+        A counter that went backwards was reset, so the history is cleared.
+        """
+        if remaining is not None:
+            self.remaining = remaining
+        if self._count:
+            last = (self._head - 1) % self.capacity
+            if consumed < self._values[last]:
+                _LOGGER.debug("Pellet consumption counter was reset, clearing the forecast")
+                self.clear()
+            elif timestamp - self._times[last] < self.sample_interval:
+                return False
+
+        if self._count == 0:
+            self._origin = timestamp
+        if self._count == self.capacity:
+            self._subtract(self._times[self._head], self._values[self._head])
+            self._evicted += 1
+        else:
+            self._count += 1
+        self._times[self._head] = timestamp
+        self._values[self._head] = consumed
+        self._head = (self._head + 1) % self.capacity
+        self._add(timestamp, consumed)
+        self.last_time = timestamp
+
+        if self._evicted >= self.capacity:
+            self._rebase()
+        return True
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._head = self._count = self._evicted = 0
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0.0
+
+    def _add(self, timestamp: float, consumed: float) -> None:
+        x = (timestamp - self._origin) / 3600
+        self._sum_x += x
+        self._sum_y += consumed
+        self._sum_xx += x * x
+        self._sum_xy += x * consumed
+
+    def _subtract(self, timestamp: float, consumed: float) -> None:
+        x = (timestamp - self._origin) / 3600
+        self._sum_x -= x
+        self._sum_y -= consumed
+        self._sum_xx -= x * x
+        self._sum_xy -= x * consumed
+
+    def _rebase(self) -> None:
+        """Move the origin to the oldest sample and rebuild the sums."""
+        samples = self.samples()
+        self._origin = samples[0][0]
+        self._evicted = 0
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0.0
+        for timestamp, consumed in samples:
+            self._add(timestamp, consumed)
+
+    def samples(self) -> list[tuple[float, float]]:
+        """Return the samples, oldest first."""
+        start = (self._head - self._count) % self.capacity
+        return [
+            (self._times[(start + i) % self.capacity], self._values[(start + i) % self.capacity])
+            for i in range(self._count)
+        ]
+
+    @property
+    def rate(self) -> float | None:
+        """Return the consumption in kg/h, or None with too few samples."""
+        n = self._count
+        if n < 2:
+            return None
+        denominator = n * self._sum_xx - self._sum_x * self._sum_x
+        if denominator <= 0:
+            return None
+        return max(0.0, (n * self._sum_xy - self._sum_x * self._sum_y) / denominator)
+
+    @property
+    def refill_time(self) -> float | None:
+        """Return the unix timestamp at which the pellets run out at the current rate."""
+        rate = self.rate
+        if not rate or self.remaining is None or self.last_time is None:
+            return None
+        return self.last_time + self.remaining / rate * 3600
+
+    def as_dict(self) -> dict:
+        """Return the samples for the store."""
+        return {
+            'samples': self.samples(),
+            'remaining': self.remaining,
+        }
+
+    def restore(self, data: dict | None) -> None:
+        """Restore the samples saved with as_dict."""
+        self.clear()
+        if not data:
+            return
+        for timestamp, consumed in data.get('samples', [])[-self.capacity:]:
+            self.add(timestamp, consumed)
+        self.remaining = data.get('remaining')
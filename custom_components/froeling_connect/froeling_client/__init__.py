@@ -0,0 +1,58 @@
+"""Async client for Froeling Connect, without Home Assistant
+
+The integration is built on it, but it only needs httpx. Outside Home Assistant
+it is installed as the top-level package froeling_client (see pyproject.toml):
+
+    pip install . && froeling-client dump
+"""
+
+import httpx
+
+from .api import API, APIAuthError, APIConnectionError, controller_name
+from .const import (
+    API_BASE_URL,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    REQUEST_TIMEOUT,
+)
+from .fleet import FleetPoller
+from .froelingDevice import DeviceType, FroelingDevice
+from .parser import DeviceModel, FieldFilter, iter_readings, parse_devices
+from .resilience import CircuitBreaker, CircuitOpenError, TokenBucket
+from .tsdb import Series, TimeSeriesReader, TimeSeriesWriter
+
+__all__ = [
+    'API',
+    'API_BASE_URL',
+    'APIAuthError',
+    'APIConnectionError',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'DeviceModel',
+    'DeviceType',
+    'FieldFilter',
+    'FleetPoller',
+    'FroelingDevice',
+    'Series',
+    'TimeSeriesReader',
+    'TimeSeriesWriter',
+    'TokenBucket',
+    'controller_name',
+    'create_client',
+    'iter_readings',
+    'parse_devices',
+]
+
+
+def create_client(http2: bool = True, max_connections: int = HTTP_MAX_CONNECTIONS) -> httpx.AsyncClient:
+    """Create an httpx client with the pool settings of the API, loading the ssl context (blocking)."""
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(HTTP_MAX_KEEPALIVE_CONNECTIONS, max_connections),
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
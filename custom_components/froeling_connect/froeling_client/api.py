@@ -0,0 +1,404 @@
+"""
+API
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+
+import httpx
+
+from .const import (
+    API_BASE_URL,
+    COMPONENT_TIMEOUT,
+    CONNECT_TIMEOUT,
+    LOGIN_TIMEOUT,
+    OVERVIEW_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    TOKEN_EXPIRY_MARGIN,
+    TOKEN_LIFETIME,
+    TRANSIENT_STATUS_CODES,
+    WRITE_TIMEOUT,
+)
+from .froelingDevice import FroelingDevice
+from .parser import DeviceModel, FieldFilter
+from .resilience import CircuitBreaker, CircuitOpenError, TokenBucket, backoff_delay
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    # Decodes straight from the response bytes, several times faster than json.
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+class API:
+    """Class for example API."""
+
+    def __init__(
+            self,
+            user: str,
+            pwd: str,
+            client: httpx.AsyncClient,
+            limiter: TokenBucket | None = None,
+            breaker: CircuitBreaker | None = None,
+            base_url: str = API_BASE_URL,
+    ) -> None:
+        """Initialise."""
+        self.client = client
+        self.base_url = base_url.rstrip('/')
+        self.limiter = limiter
+        self.breaker = breaker
+        self.retry_count = 0
+        self.last_login_seconds = 0.0
+        self.payload = {
+            'osType': 'web',
+            'password': pwd,
+            'username': user
+        }
+        self.connected: bool = False
+        self.headers = {
+            'Content-Type': 'application/json',
+        }
+        self.userData = {}
+        self.models: dict[str, DeviceModel] = {}
+        # Facilities whose values are discovered, with the filter of the discovered values
+        self.filters: dict[str, FieldFilter] = {}
+        self.token_expires: float = 0
+        self.login_count = 0
+        self.reuse_count = 0
+        self.fingerprint_hits = 0
+        self.fingerprint_misses = 0
+        self._fingerprints: dict[str, bytes] = {}
+        # Seconds spent on the last poll of each facility by connect, request, decode
+        # and parse, and the bytes downloaded.
+        self.timings: dict[str, dict[str, float]] = {}
+        self._etags: dict[str, str] = {}
+        self._login_lock = asyncio.Lock()
+
+    @property
+    def facilities(self) -> list[str]:
+        """Return the ids of the facilities listed in the userData of the account."""
+        return [
+            str(facility.get('facilityId', facility.get('id')))
+            for facility in self.userData.get('facilities', [])
+            if isinstance(facility, dict)
+        ]
+
+    @property
+    def session(self) -> dict:
+        """Return the login session, so it can be persisted."""
+        return {
+            'username': self.payload['username'],
+            'authorization': self.headers.get('Authorization'),
+            'userData': self.userData,
+            'expires': self.token_expires,
+        }
+
+    def restore_session(self, session: dict | None) -> None:
+        """Restore a persisted login session, unless it has expired."""
+        if (
+                not session
+                or session.get('username') != self.payload['username']
+                or not session.get('authorization')
+                or 'userId' not in session.get('userData', {})
+        ):
+            return
+        self.headers['Authorization'] = session['authorization']
+        self.userData = session['userData']
+        self.token_expires = session.get('expires', 0)
+        self.connected = self.session_valid
+
+    @property
+    def session_valid(self) -> bool:
+        """Return if the bearer token can be reused."""
+        return (
+                'Authorization' in self.headers
+                and time.time() < self.token_expires - TOKEN_EXPIRY_MARGIN
+        )
+
+    async def _send(self, method: str, url: str, timings: dict | None = None, **kwargs) -> httpx.Response:
+        """Send a request through the rate limiter and circuit breaker.
+
+        Transport errors, 429 and 5xx answers are retried with exponential
+        backoff and jitter, and count as one failure for the circuit breaker.
+        The time spent opening connections is added to timings['connect'].
+        """
+        probe = self.breaker is not None and self.breaker.before_call()
+
+        if timings is not None:
+            started = {}
+
+            async def trace(event: str, info: dict) -> None:
+                # DNS lookup happens within connect_tcp.
+                if event.startswith(('connection.connect_tcp.', 'connection.start_tls.')):
+                    if event.endswith('.started'):
+                        started[event] = time.perf_counter()
+                    elif event.endswith(('.complete', '.failed')):
+                        begin = started.pop(event.rsplit('.', 1)[0] + '.started', None)
+                        if begin is not None:
+                            timings['connect'] = timings.get('connect', 0.0) + time.perf_counter() - begin
+
+            kwargs['extensions'] = {'trace': trace}
+
+        try:
+            for attempt in range(RETRY_ATTEMPTS):
+                if self.limiter is not None:
+                    await self.limiter.acquire()
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    error, response = e, None
+                else:
+                    if response.status_code not in TRANSIENT_STATUS_CODES:
+                        if self.breaker is not None:
+                            self.breaker.record_success()
+                        return response
+                    error = None
+
+                if attempt + 1 < RETRY_ATTEMPTS:
+                    self.retry_count += 1
+                    delay = backoff_delay(attempt, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX)
+                    _LOGGER.debug("Retrying %s %s in %.1f s", method, url, delay)
+                    await asyncio.sleep(delay)
+        except BaseException:
+            # Neither success nor failure of the backend, like a cancelled poll.
+            if probe:
+                self.breaker.record_aborted()
+            raise
+
+        if self.breaker is not None:
+            self.breaker.record_failure()
+        if error is not None:
+            raise error
+        return response
+
+    async def connect(self):
+        """Connect to api."""
+        start = time.perf_counter()
+        try:
+            login = await self._send('POST', f"{self.base_url}/connect/v1.0/resources/login",
+                                     headers=self.headers, content=json.dumps(self.payload),
+                                     timeout=httpx.Timeout(LOGIN_TIMEOUT, connect=CONNECT_TIMEOUT))
+            if login.status_code in TRANSIENT_STATUS_CODES:
+                raise APIConnectionError("Error connecting to api.", login.status_code)
+            login.raise_for_status()
+
+            self.headers['Authorization'] = login.headers['Authorization']
+            self.token_expires = token_expiry(self.headers['Authorization'])
+            self.connected = True
+            self.userData = json_loads(login.content)['userData']
+            self.login_count += 1
+            self.last_login_seconds = time.perf_counter() - start
+
+        except APIConnectionError:
+            raise
+        except (httpx.TransportError, CircuitOpenError) as e:
+            raise APIConnectionError("Error connecting to api.", e) from e
+        except Exception as e:
+            raise APIAuthError("Error connecting to api.", e) from e
+
+    async def async_ensure_session(self) -> None:
+        """Log in, unless the current bearer token is still valid."""
+        async with self._login_lock:
+            if self.connected and self.session_valid:
+                self.reuse_count += 1
+                return
+            await self.connect()
+
+    async def async_relogin(self, rejectedAuthorization: str | None) -> None:
+        """Log in again after a token was rejected, once for all concurrent requests."""
+        async with self._login_lock:
+            if self.headers.get('Authorization') != rejectedAuthorization:
+                return
+            _LOGGER.debug("Bearer token rejected, logging in again")
+            self.disconnect()
+            await self.connect()
+
+    def disconnect(self) -> bool:
+        """Disconnect from api."""
+        self.connected = False
+        self.headers.pop('Authorization', None)
+        self.token_expires = 0
+        return True
+
+    async def _request(
+            self,
+            method: str,
+            path: str,
+            extraHeaders: dict | None,
+            timeout: float,
+            timings: dict | None,
+            **kwargs,
+    ) -> httpx.Response:
+        """Send an authorized request."""
+        headers = {**self.headers, **extraHeaders} if extraHeaders else self.headers
+        try:
+            return await self._send(
+                method, f"{self.base_url}{path}", timings, headers=headers,
+                timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT), **kwargs)
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            raise APIConnectionError(f"Error requesting {method} {path}", e) from e
+
+    async def _request_authorized(
+            self,
+            method: str,
+            path: str,
+            extraHeaders: dict | None = None,
+            timeout: float = OVERVIEW_TIMEOUT,
+            timings: dict | None = None,
+            **kwargs,
+    ) -> httpx.Response:
+        """Send a request, logging in again if the token was rejected.
+
+        {userId} in the path is replaced with the id of the logged in user.
+        """
+        await self.async_ensure_session()
+        authorization = self.headers.get('Authorization')
+        path = path.format(userId=self.userData['userId'])
+        response = await self._request(method, path, extraHeaders, timeout, timings, **kwargs)
+
+        if response.status_code in (401, 403):
+            # The token was revoked before it expired, log in again once.
+            await self.async_relogin(authorization)
+            response = await self._request(method, path, extraHeaders, timeout, timings, **kwargs)
+
+        if response.status_code in (401, 403):
+            raise APIAuthError(f"Error requesting {method} {path}", response.status_code)
+        if response.status_code == 304:
+            return response
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise APIConnectionError(f"Error requesting {method} {path}", e) from e
+
+        return response
+
+    async def _get_authorized(
+            self,
+            path: str,
+            extraHeaders: dict | None = None,
+            timeout: float = OVERVIEW_TIMEOUT,
+            timings: dict | None = None,
+    ) -> httpx.Response:
+        """Send a GET request, logging in again if the token was rejected."""
+        return await self._request_authorized('GET', path, extraHeaders, timeout, timings)
+
+    async def get_overview(self, facilityId: str, timings: dict | None = None) -> httpx.Response:
+        """Get the overview of a facility, conditional if the server sent an ETag."""
+        extraHeaders = None
+        etag = self._etags.get(facilityId)
+        if etag is not None and facilityId in self.models:
+            extraHeaders = {'If-None-Match': etag}
+        return await self._get_authorized(
+            f"/fcs/v1.0/resources/user/{{userId}}/facility/{facilityId}/overview",
+            extraHeaders,
+            timings=timings,
+        )
+
+    async def get_component(self, facilityId: str, componentId: str) -> dict:
+        """Get the details of a component, with the parameters the overview leaves out."""
+        response = await self._get_authorized(
+            f"/fcs/v1.0/resources/user/{{userId}}/facility/{facilityId}/component/{componentId}",
+            timeout=COMPONENT_TIMEOUT,
+        )
+        return json_loads(response.content)
+
+    def set_filter(self, facilityId: str, fields: FieldFilter | None) -> None:
+        """Change the discovery of the values of a facility, from its next overview on."""
+        if fields is None:
+            self.filters.pop(facilityId, None)
+        else:
+            self.filters[facilityId] = fields
+        model = self.models.get(facilityId)
+        if model is not None and model.fields != fields:
+            model.fields = fields
+            # Parse the next overview even if it did not change.
+            self._fingerprints.pop(facilityId, None)
+            self._etags.pop(facilityId, None)
+
+    async def set_parameter(self, facilityId: str, componentId: str, parameterId: int | str, value: str) -> None:
+        """Change a parameter of a component."""
+        await self._request_authorized(
+            'PUT',
+            f"/fcs/v1.0/resources/user/{{userId}}/facility/{facilityId}/{componentId}/param/{parameterId}",
+            {'Content-Type': 'application/json'},
+            timeout=WRITE_TIMEOUT,
+            content=json.dumps({'value': value}),
+        )
+
+    async def get_Devices(self, facilityId: str) -> list[FroelingDevice]:
+        """Get devices of a facility on api.
+
+        If the overview is byte for byte the same as the last one, the devices
+        of the last poll are returned without decoding and parsing it again.
+        """
+        timings = {'connect': 0.0}
+        start = time.perf_counter()
+        facilityData = await self.get_overview(facilityId, timings)
+        timings.update(
+            request=time.perf_counter() - start - timings['connect'],
+            decode=0.0,
+            parse=0.0,
+            bytes=facilityData.num_bytes_downloaded,
+        )
+        self.timings[facilityId] = timings
+        model = self.models.get(facilityId)
+
+        fingerprint = None
+        if facilityData.status_code != 304:
+            fingerprint = hashlib.blake2b(facilityData.content, digest_size=16).digest()
+        if model is not None and (
+                facilityData.status_code == 304 or fingerprint == self._fingerprints.get(facilityId)
+        ):
+            self.fingerprint_hits += 1
+            return model.devices
+        self.fingerprint_misses += 1
+
+        if model is None:
+            model = self.models[facilityId] = DeviceModel(controller_name(facilityId), self.filters.get(facilityId))
+        try:
+            start = time.perf_counter()
+            data_json = json_loads(facilityData.content)
+            timings['decode'] = time.perf_counter() - start
+            start = time.perf_counter()
+            devices = model.update(data_json)
+            timings['parse'] = time.perf_counter() - start
+        except Exception as e:
+            raise ValueError('Error fetching Devices', e) from e
+
+        self._fingerprints[facilityId] = fingerprint
+        if 'ETag' in facilityData.headers:
+            self._etags[facilityId] = facilityData.headers['ETag']
+        return devices
+
+
+def controller_name(facilityId: str) -> str:
+    """Return the name of the controller of a facility."""
+    return facilityId.replace(".", "_")
+
+
+def token_expiry(authorization: str) -> float:
+    """Return the expiry timestamp of a bearer token."""
+    # The token is a JWT, fall back to a fixed lifetime if it cannot be decoded.
+    try:
+        payload = authorization.split(' ')[-1].split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + TOKEN_LIFETIME
+
+
+class APIAuthError(Exception):
+    """Exception class for auth error."""
+
+
+class APIConnectionError(Exception):
+    """Exception class for connection error."""
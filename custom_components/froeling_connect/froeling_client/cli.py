@@ -0,0 +1,199 @@
+"""Command line interface: dump, watch, bench, export and record the values of facilities"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict
+
+from . import create_client
+from .api import API, APIAuthError, APIConnectionError
+from .const import API_BASE_URL, FLEET_CONCURRENCY, FLEET_INTERVAL
+from .exporter import FroelingExporter
+from .fleet import FleetPoller
+from .parser import iter_readings
+from .tsdb import TimeSeriesReader, TimeSeriesWriter
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='froeling_client', description=__doc__)
+    parser.add_argument('--username', default=os.environ.get('FROELING_USERNAME'),
+                        help="Account, defaults to $FROELING_USERNAME")
+    parser.add_argument('--password', default=os.environ.get('FROELING_PASSWORD'),
+                        help="Defaults to $FROELING_PASSWORD")
+    parser.add_argument('--base-url', default=os.environ.get('FROELING_BASE_URL', API_BASE_URL))
+    parser.add_argument('--facility', action='append', default=[],
+                        help="Facility id, can be repeated. All facilities of the account by default")
+    parser.add_argument('--debug', action='store_true')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    dump = commands.add_parser('dump', help="Print the devices of the facilities as JSON")
+    dump.add_argument('--raw', action='store_true', help="Print the overviews as received")
+
+    watch = commands.add_parser('watch', help="Print the values whenever they change")
+    watch.add_argument('--interval', type=float, default=60)
+
+    bench = commands.add_parser('bench', help="Measure login and polls of the facilities")
+    bench.add_argument('--polls', type=int, default=10)
+    bench.add_argument('--cold', action='store_true', help="Parse every overview, even if it did not change")
+
+    export = commands.add_parser('export', help="Serve the values in the Prometheus text format")
+    export.add_argument('--host', default='127.0.0.1', help="Address to listen on, 0.0.0.0 for all interfaces")
+    export.add_argument('--port', type=int, default=9105)
+    export.add_argument('--interval', type=float, default=60, help="Seconds between polls of all facilities")
+    export.add_argument('--config', help="JSON list of accounts (username, password, base_url, facilities) "
+                                         "instead of a single account")
+
+    fleet = commands.add_parser('fleet', help="Poll the facilities of many accounts into a time-series store")
+    fleet.add_argument('--store', required=True, help="Folder of the store")
+    fleet.add_argument('--interval', type=float, default=FLEET_INTERVAL, help="Seconds between polls of a facility")
+    fleet.add_argument('--concurrency', type=int, default=FLEET_CONCURRENCY)
+    fleet.add_argument('--config', help="JSON list of accounts, like for export")
+
+    query = commands.add_parser('query', help="Print values of a time-series store as CSV")
+    query.add_argument('--store', required=True)
+    query.add_argument('--name', help="Only values with this name")
+    query.add_argument('--since', type=float, default=3600, help="Seconds back from now")
+    return parser
+
+
+def _accounts(args) -> list[dict]:
+    if args.config:
+        with open(args.config, encoding='utf-8') as handle:
+            accounts = json.load(handle)
+    elif args.username and args.password:
+        accounts = [{'username': args.username, 'password': args.password, 'facilities': args.facility}]
+    else:
+        sys.exit("--config or an account is required")
+    for account in accounts:
+        account.setdefault('base_url', args.base_url)
+    return accounts
+
+
+async def _async_connect(args, client) -> tuple[API, list[str]]:
+    if not args.username or not args.password:
+        sys.exit("--username and --password or $FROELING_USERNAME and $FROELING_PASSWORD are required")
+    api = API(args.username, args.password, client, base_url=args.base_url)
+    await api.connect()
+    return api, args.facility or api.facilities
+
+
+async def async_dump(args, client) -> None:
+    api, facilities = await _async_connect(args, client)
+    result = {}
+    for facilityId in facilities:
+        if args.raw:
+            result[facilityId] = json.loads((await api.get_overview(facilityId)).content)
+        else:
+            result[facilityId] = [
+                {'key': device.key, 'isParent': device.isParent, **asdict(device.device)}
+                for device in await api.get_Devices(facilityId)
+            ]
+    json.dump(result, sys.stdout, indent=2, ensure_ascii=False, default=str)
+    print()
+
+
+async def async_watch(args, client) -> None:
+    api, facilities = await _async_connect(args, client)
+    last: dict[tuple[str, str], float] = {}
+    while True:
+        started = time.monotonic()
+        for facilityId in facilities:
+            try:
+                devices = await api.get_Devices(facilityId)
+            except (APIAuthError, APIConnectionError) as err:
+                print(f"{time.strftime('%H:%M:%S')} {facilityId} failed: {err}", file=sys.stderr)
+                continue
+            for device, value, unit in iter_readings(devices):
+                if last.get((facilityId, device.key)) != value:
+                    last[(facilityId, device.key)] = value
+                    print(f"{time.strftime('%H:%M:%S')} {facilityId} {device.device.displayName}: "
+                          f"{value:g} {unit or ''}".rstrip(), flush=True)
+        await asyncio.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
+async def async_bench(args, client) -> None:
+    api, facilities = await _async_connect(args, client)
+    print(f"login: {api.last_login_seconds * 1000:.1f} ms, {len(facilities)} facilities")
+    for facilityId in facilities:
+        samples = {'total': [], 'connect': [], 'request': [], 'decode': [], 'parse': [], 'bytes': []}
+        for _ in range(args.polls):
+            if args.cold:
+                api.models.pop(facilityId, None)
+            start = time.perf_counter()
+            await api.get_Devices(facilityId)
+            samples['total'].append(time.perf_counter() - start)
+            for name, value in api.timings[facilityId].items():
+                samples[name].append(value)
+        report = ', '.join(
+            f"{name} {statistics.median(values) * 1000:.2f} ms" for name, values in samples.items() if name != 'bytes'
+        )
+        print(f"{facilityId}: median of {args.polls} polls: {report}, "
+              f"{statistics.median(samples['bytes']):.0f} bytes")
+    print(f"unchanged overviews skipped: {api.fingerprint_hits}, parsed: {api.fingerprint_misses}")
+
+
+async def async_export(args, client) -> None:
+    exporter = FroelingExporter(_accounts(args), client, args.interval)
+    await exporter.async_refresh()
+    server = await exporter.async_serve(args.host, args.port)
+    print(f"Serving {len(exporter.facilities)} facilities on http://{args.host}:{args.port}/metrics", flush=True)
+    async with server:
+        await exporter.async_run()
+
+
+async def async_fleet(args, client) -> None:
+    writer = TimeSeriesWriter(args.store)
+    poller = FleetPoller(_accounts(args), client, writer, args.interval, args.concurrency)
+    await poller.async_start()
+    print(f"Polling {poller.facilities} facilities every {args.interval:g} s into {args.store}", flush=True)
+    try:
+        await poller.async_run()
+    finally:
+        print(f"{poller.polls} polls, {poller.failures} failed, {writer.samples} values", file=sys.stderr)
+
+
+async def async_query(args, client) -> None:
+    reader = TimeSeriesReader(args.store)
+    series = {
+        seriesId: found for seriesId, found in reader.find(name=args.name).items()
+        if not args.facility or found.facility in args.facility
+    }
+    now = time.time()
+    print("time,facility,device,name,value,unit")
+    for timestamp, seriesId, value in reader.query(now - args.since, now, set(series)):
+        found = series[seriesId]
+        print(f"{timestamp},{found.facility},{found.device},{json.dumps(found.name, ensure_ascii=False)},"
+              f"{value:g},{found.unit or ''}")
+
+
+COMMANDS = {
+    'dump': async_dump,
+    'watch': async_watch,
+    'bench': async_bench,
+    'export': async_export,
+    'fleet': async_fleet,
+    'query': async_query,
+}
+
+
+async def async_main(args) -> None:
+    # h2 is optional outside Home Assistant.
+    async with create_client(http2=importlib.util.find_spec('h2') is not None) as client:
+        await COMMANDS[args.command](args, client)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    try:
+        asyncio.run(async_main(args))
+    except KeyboardInterrupt:
+        pass
+    except (APIAuthError, APIConnectionError) as err:
+        sys.exit(f"Error: {err}")
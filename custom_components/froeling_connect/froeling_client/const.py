@@ -0,0 +1,46 @@
+"""Froeling Connect API settings"""
+
+API_BASE_URL = "https://connect-api.froeling.com"
+
+# Bearer token lifetime in seconds, used when the token carries no expiry
+TOKEN_LIFETIME = 3600
+TOKEN_EXPIRY_MARGIN = 60
+
+# Timeouts in seconds
+REQUEST_TIMEOUT = 20
+CONNECT_TIMEOUT = 10
+LOGIN_TIMEOUT = 15
+OVERVIEW_TIMEOUT = 20
+COMPONENT_TIMEOUT = 20
+WRITE_TIMEOUT = 20
+
+# Overview requests per account running at the same time
+MAX_PARALLEL_FETCHES = 4
+
+# Requests per second to Froeling Connect, shared by all users of a limiter
+RATE_LIMIT = 2
+RATE_LIMIT_BURST = 10
+
+# Retries of transient failures, with exponential backoff and jitter
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 1
+RETRY_BACKOFF_MAX = 10
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Consecutive failed requests that stop all requests for CIRCUIT_RESET_TIMEOUT seconds
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 300
+
+# Connection pool of the shared client
+HTTP_MAX_CONNECTIONS = 10
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 5
+HTTP_KEEPALIVE_EXPIRY = 300
+
+# Fleet poller
+# Polls running at the same time, over all accounts
+FLEET_CONCURRENCY = 16
+# Seconds between polls of a facility, varied by up to FLEET_JITTER of it
+FLEET_INTERVAL = 300
+FLEET_JITTER = 0.1
+# Seconds between writes of the polled values to the store
+FLEET_FLUSH_INTERVAL = 10
@@ -0,0 +1,193 @@
+"""Prometheus exporter for the values of many facilities"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from .api import API, APIAuthError, APIConnectionError
+from .const import (
+    API_BASE_URL,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    MAX_PARALLEL_FETCHES,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+)
+from .parser import iter_readings
+from .resilience import CircuitBreaker, TokenBucket
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Metric -> (type, help)
+METRICS = {
+    'froeling_value': ('gauge', "Numeric value of a facility, in the unit of the unit label."),
+    'froeling_up': ('gauge', "1 if the last poll of the facility succeeded."),
+    'froeling_poll_seconds': ('gauge', "Duration of the last poll of the facility."),
+    'froeling_last_success_timestamp_seconds': ('gauge', "Unix time of the last successful poll of the facility."),
+    'froeling_refresh_seconds': ('gauge', "Duration of the last refresh of all facilities."),
+}
+
+
+def escape(value) -> str:
+    """Escape a label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labels(**values) -> str:
+    """Return a label set."""
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in values.items()) + '}'
+
+
+@dataclass(slots=True)
+class FacilityState:
+    """Last poll of a facility. The values of the last successful poll are kept while it fails."""
+
+    facilityId: str
+    up: bool = False
+    poll_seconds: float = 0.0
+    last_success: float | None = None
+    # Metric lines of the values
+    lines: list[str] = field(default_factory=list)
+
+
+class FroelingExporter:
+    """Polls the facilities of several accounts every interval seconds and renders their values once per refresh.
+
+    Scrapes are answered from the rendered text, so any number of scrapers
+    cause no requests to Froeling Connect.
+    """
+
+    def __init__(self, accounts: list[dict], client: httpx.AsyncClient, interval: float = 60) -> None:
+        """Initialise with accounts of username, password and optionally base_url and facilities."""
+        self.interval = interval
+        # API -> facilities to poll, all of the account if empty
+        self.accounts: list[tuple[API, list[str]]] = [
+            (
+                API(
+                    account['username'], account['password'], client,
+                    TokenBucket(RATE_LIMIT, RATE_LIMIT_BURST),
+                    CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT),
+                    account.get('base_url', API_BASE_URL),
+                ),
+                [str(facilityId) for facilityId in account.get('facilities', [])],
+            )
+            for account in accounts
+        ]
+        self.facilities: dict[str, FacilityState] = {}
+        self.refresh_seconds = 0.0
+        self.refresh_started = 0.0
+        self.refreshes = 0
+        self.scrapes = 0
+        self.text = b''
+
+    async def async_refresh(self) -> None:
+        """Poll all facilities and render the metrics."""
+        self.refresh_started = time.monotonic()
+        start = time.perf_counter()
+        await asyncio.gather(*(self._async_refresh_account(api, facilities) for api, facilities in self.accounts))
+        self.refresh_seconds = time.perf_counter() - start
+        self.refreshes += 1
+        self.text = self.render().encode()
+
+    async def _async_refresh_account(self, api: API, facilities: list[str]) -> None:
+        try:
+            await api.async_ensure_session()
+        except (APIAuthError, APIConnectionError) as err:
+            _LOGGER.warning("Login of %s failed: %s", api.payload['username'], err)
+            for facilityId in facilities or api.facilities:
+                self._state(facilityId).up = False
+            return
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+
+        async def poll(facilityId: str) -> None:
+            async with semaphore:
+                await self._async_poll(api, facilityId)
+
+        await asyncio.gather(*(poll(facilityId) for facilityId in facilities or api.facilities))
+
+    def _state(self, facilityId: str) -> FacilityState:
+        state = self.facilities.get(facilityId)
+        if state is None:
+            state = self.facilities[facilityId] = FacilityState(facilityId)
+        return state
+
+    async def _async_poll(self, api: API, facilityId: str) -> None:
+        state = self._state(facilityId)
+        start = time.perf_counter()
+        try:
+            devices = await api.get_Devices(facilityId)
+        except (APIAuthError, APIConnectionError, ValueError) as err:
+            _LOGGER.warning("Poll of facility %s failed: %s", facilityId, err)
+            state.up = False
+            return
+        finally:
+            state.poll_seconds = time.perf_counter() - start
+        state.up = True
+        state.last_success = time.time()
+        state.lines = [
+            "froeling_value" + labels(
+                facility=facilityId, device=device.device.key, name=device.device.displayName, unit=unit or ''
+            ) + f" {value}"
+            for device, value, unit in iter_readings(devices)
+        ]
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text format."""
+        states = sorted(self.facilities.values(), key=lambda state: state.facilityId)
+        samples = {
+            'froeling_value': [line for state in states for line in state.lines],
+            'froeling_up': [f"froeling_up{labels(facility=state.facilityId)} {int(state.up)}" for state in states],
+            'froeling_poll_seconds': [
+                f"froeling_poll_seconds{labels(facility=state.facilityId)} {state.poll_seconds:.6f}"
+                for state in states
+            ],
+            'froeling_last_success_timestamp_seconds': [
+                f"froeling_last_success_timestamp_seconds{labels(facility=state.facilityId)} {state.last_success:.3f}"
+                for state in states if state.last_success is not None
+            ],
+            'froeling_refresh_seconds': [f"froeling_refresh_seconds {self.refresh_seconds:.6f}"],
+        }
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", *samples[name]]
+        return '\n'.join(lines) + '\n'
+
+    async def async_run(self) -> None:
+        """Refresh every interval seconds after the last refresh, until cancelled."""
+        while True:
+            if self.refreshes:
+                await asyncio.sleep(max(0.0, self.refresh_started + self.interval - time.monotonic()))
+            try:
+                await self.async_refresh()
+            except Exception:
+                _LOGGER.exception("Refresh failed")
+                self.refreshes += 1
+
+    async def async_serve(self, host: str, port: int) -> asyncio.Server:
+        """Serve GET /metrics."""
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 10)
+            method, path, *_ = request.split(b'\r\n', 1)[0].decode('latin-1').split(' ')
+            if method == 'GET' and path.split('?', 1)[0] == '/metrics':
+                self.scrapes += 1
+                status, body = '200 OK', self.text
+            else:
+                status, body = '404 Not Found', b'Not found\n'
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError,
+                ConnectionError):
+            pass
+        finally:
+            writer.close()
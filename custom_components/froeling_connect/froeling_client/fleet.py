@@ -0,0 +1,180 @@
+"""Poller for the facilities of many accounts, writing their values to a time-series store"""
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+
+import httpx
+
+from .api import API, APIAuthError, APIConnectionError
+from .const import (
+    API_BASE_URL,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    FLEET_CONCURRENCY,
+    FLEET_FLUSH_INTERVAL,
+    FLEET_INTERVAL,
+    FLEET_JITTER,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+)
+from .parser import iter_readings
+from .resilience import CircuitBreaker, TokenBucket
+from .tsdb import Series, TimeSeriesWriter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FleetPoller:
+    """Polls every facility of the accounts every interval seconds with a fixed number of workers.
+
+    Each facility has its own schedule: the first poll is at a random offset
+    within the interval, later ones follow after interval seconds, varied by
+    up to jitter of it. So the polls of the fleet stay spread over the interval
+    instead of hitting the API in bursts. A facility is scheduled again when
+    its poll finished, so a slow one is never polled twice at the same time.
+    """
+
+    def __init__(
+            self,
+            accounts: list[dict],
+            client: httpx.AsyncClient,
+            writer: TimeSeriesWriter,
+            interval: float = FLEET_INTERVAL,
+            concurrency: int = FLEET_CONCURRENCY,
+            jitter: float = FLEET_JITTER,
+            rate_limit: float | None = RATE_LIMIT,
+            seed: int | None = None,
+    ) -> None:
+        """Initialise with accounts of username, password and optionally base_url and facilities.
+
+        Each account gets its own rate limiter of rate_limit requests per second, None disables it.
+        """
+        self.writer = writer
+        self.interval = interval
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.accounts: list[tuple[API, list[str]]] = [
+            (
+                API(
+                    account['username'], account['password'], client,
+                    TokenBucket(rate_limit, max(RATE_LIMIT_BURST, concurrency)) if rate_limit else None,
+                    CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT),
+                    account.get('base_url', API_BASE_URL),
+                ),
+                [str(facilityId) for facilityId in account.get('facilities', [])],
+            )
+            for account in accounts
+        ]
+        # (due time, sequence, api, facility id), the sequence keeps equal due times comparable
+        self._schedule: list[tuple[float, int, API, str]] = []
+        self._sequence = 0
+        self._wakeup = asyncio.Event()
+        self.polls = 0
+        self.failures = 0
+        # Seconds polls started after they were due
+        self.lateness = 0.0
+
+    @property
+    def facilities(self) -> int:
+        """Return the number of scheduled facilities."""
+        return len(self._schedule)
+
+    def _schedule_poll(self, due: float, api: API, facilityId: str) -> None:
+        self._sequence += 1
+        heapq.heappush(self._schedule, (due, self._sequence, api, facilityId))
+        self._wakeup.set()
+
+    def _next_due(self, due: float) -> float:
+        return due + self.interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    async def async_start(self) -> None:
+        """Log in to all accounts and spread the first polls of their facilities over the interval."""
+        now = time.monotonic()
+        for api, facilities in self.accounts:
+            try:
+                await api.async_ensure_session()
+            except (APIAuthError, APIConnectionError) as err:
+                if not facilities:
+                    _LOGGER.error("Login of %s failed, its facilities are unknown: %s", api.payload['username'], err)
+                    continue
+                _LOGGER.warning("Login of %s failed: %s", api.payload['username'], err)
+            for facilityId in facilities or api.facilities:
+                self._schedule_poll(now + self.rng.uniform(0, self.interval), api, facilityId)
+
+    async def async_run(self, duration: float | None = None) -> None:
+        """Poll the scheduled facilities, for duration seconds or until cancelled."""
+        queue: asyncio.Queue[tuple[float, API, str]] = asyncio.Queue(self.concurrency)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+        flusher = asyncio.create_task(self._flusher())
+        try:
+            await asyncio.wait_for(self._dispatch(queue), duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in (*workers, flusher):
+                task.cancel()
+            await asyncio.gather(*workers, flusher, return_exceptions=True)
+            self.writer.flush()
+
+    async def _dispatch(self, queue: asyncio.Queue) -> None:
+        """Hand the facilities to the workers when they are due."""
+        while True:
+            if not self._schedule:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            due = self._schedule[0][0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    # A facility scheduled earlier wakes the dispatcher up.
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            due, _, api, facilityId = heapq.heappop(self._schedule)
+            # Waits while all workers are busy.
+            await queue.put((due, api, facilityId))
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            due, api, facilityId = await queue.get()
+            self.lateness += max(0.0, time.monotonic() - due)
+            try:
+                await self.async_poll(api, facilityId)
+            finally:
+                self._schedule_poll(max(self._next_due(due), time.monotonic()), api, facilityId)
+
+    async def async_poll(self, api: API, facilityId: str) -> bool:
+        """Poll a facility and append its values to the store, returning if it succeeded."""
+        self.polls += 1
+        try:
+            # Logs in when the token expired.
+            devices = await api.get_Devices(facilityId)
+            now = time.time()
+            for device, value, unit in iter_readings(devices):
+                self.writer.append(now, Series(facilityId, device.device.key, device.device.displayName, unit), value)
+        except (APIAuthError, APIConnectionError, ValueError) as err:
+            self.failures += 1
+            _LOGGER.warning("Poll of facility %s failed: %s", facilityId, err)
+            return False
+        except Exception:  # pylint: disable=broad-except
+            # Like an overview of an unexpected shape, the worker goes on with the next facility.
+            self.failures += 1
+            _LOGGER.exception("Unexpected error polling facility %s", facilityId)
+            return False
+        return True
+
+    async def _flusher(self) -> None:
+        while True:
+            await asyncio.sleep(FLEET_FLUSH_INTERVAL)
+            try:
+                self.writer.flush()
+            except OSError as err:
+                # The records stay buffered for the next flush.
+                _LOGGER.error("Writing %s failed: %s", self.writer.path, err)
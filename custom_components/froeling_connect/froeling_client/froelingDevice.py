@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import StrEnum
+from typing import Any
 
 
 class DeviceType(StrEnum):
@@ -8,12 +9,12 @@ class DeviceType(StrEnum):
     TEMP_SENSOR = "temp_sensor"
     DOOR_SENSOR = "door_sensor"
     PELLET_SENSOR = "pellet_sensor"
-    OTHER = "other",
-    PERCENTAGE = "percentage",
+    OTHER = "other"
+    PERCENTAGE = "percentage"
     COMPONENT = 'component'
 
 
-@dataclass
+@dataclass(slots=True)
 class OutTemp:
     """API device."""
     key: int | str
@@ -24,9 +25,11 @@ class OutTemp:
     state: int | bool | str
     type: DeviceType
     icon: str | None
+    native_value: Any = None
+    invalid: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceSensor:
     """API device."""
     key: int | str
@@ -38,9 +41,20 @@ class DeviceSensor:
     icon: str | None
     parentIdentifier: tuple
     unit: str | None
-
-
-@dataclass
+    # State converted to the unit of the entity, None with the raw state in invalid if it is no number
+    native_value: Any = None
+    invalid: str | None = None
+    # Not one of the entities of its component spec, found by discovery
+    discovered: bool = False
+    # Parameter id, limits and options (value -> label) of values that can be changed
+    parameterId: int | None = None
+    editable: bool = False
+    minVal: float | None = None
+    maxVal: float | None = None
+    options: dict[str, str] | None = None
+
+
+@dataclass(slots=True)
 class Circuit:
     """API device."""
     key: int | str
@@ -50,9 +64,11 @@ class Circuit:
     state: int | bool | str
     type: DeviceType
     icon: str | None
+    native_value: Any = None
+    invalid: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Boiler:
     """API device."""
     key: int | str
@@ -62,9 +78,11 @@ class Boiler:
     state: int | bool | str
     type: DeviceType
     icon: str | None
+    native_value: Any = None
+    invalid: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Buffer:
     """API device."""
     key: int | str
@@ -74,9 +92,11 @@ class Buffer:
     state: int | bool | str
     type: DeviceType
     icon: str | None
+    native_value: Any = None
+    invalid: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FeedSystem:
     """API device."""
     key: int | str
@@ -87,13 +107,17 @@ class FeedSystem:
     type: DeviceType
     unit: str
     icon: str | None
+    native_value: Any = None
+    invalid: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FroelingDevice:
-
-    def __init__(self, key, device, isParent):
-        self.isParent = isParent
-        self.name = key
-        self.key = key
-        self.device = device
+    """Device or sensor of a facility."""
+    key: str
+    device: OutTemp | DeviceSensor | Circuit | Boiler | Buffer | FeedSystem
+    isParent: bool
+    name: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.name = self.key
@@ -0,0 +1,348 @@
+"""
+Parser for the facility overview
+"""
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .froelingDevice import FroelingDevice, DeviceType, OutTemp, Boiler, Buffer, FeedSystem, DeviceSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentSpec:
+    """How a component of the overview is turned into a device and its sensors."""
+
+    keyName: str
+    deviceClass: type
+    icon: str
+    type: DeviceType
+    state: Callable[[dict], Any]
+    entities: tuple[str, ...]
+    unit: Callable[[dict], str | None] | None = None
+
+
+# Component type -> spec. Components of other types are skipped.
+COMPONENT_SPECS: dict[str, ComponentSpec] = {
+    'BOILER': ComponentSpec(
+        keyName='kessel', deviceClass=Boiler, icon='mdi:water-boiler', type=DeviceType.COMPONENT,
+        state=lambda component: component['state']['displayValue'],
+        entities=('boilerTemp', 'mode2', 'ignitionWhenBufferTempBelow'),
+    ),
+    'CIRCUIT': ComponentSpec(
+        keyName='circuit', deviceClass=Boiler, icon='mdi:heating-coil', type=DeviceType.COMPONENT,
+        state=lambda component: component['mode']['displayValue'],
+        entities=('desiredRoomTemp', 'mode', 'actualFlowTemp'),
+    ),
+    'DHW': ComponentSpec(
+        keyName='boiler', deviceClass=Boiler, icon='mdi:water-boiler', type=DeviceType.COMPONENT,
+        state=lambda component: component['active'],
+        entities=('dhwTempTop', 'mode', 'setDhwTemp'),
+    ),
+    'BUFFER_TANK': ComponentSpec(
+        keyName='buffer', deviceClass=Buffer, icon='mdi:propane-tank', type=DeviceType.COMPONENT,
+        state=lambda component: component['active'],
+        entities=('bufferPumpControl', 'bufferTankCharge', 'bufferTempBottom', 'bufferTempTop'),
+    ),
+    'FEED_SYSTEM': ComponentSpec(
+        keyName='feedSystem', deviceClass=FeedSystem, icon='mdi:cog-box', type=DeviceType.PELLET_SENSOR,
+        state=lambda component: component['remainingPelletsAmount']['value'],
+        unit=lambda component: component['remainingPelletsAmount']['unit'],
+        entities=('pelletsUsageCounter', 'remainingPelletsAmount', 'totalPelletConsumption'),
+    ),
+}
+
+# Components of unknown types, only with discovery
+DISCOVERED_SPEC = ComponentSpec(
+    keyName='component', deviceClass=Boiler, icon='mdi:cog', type=DeviceType.COMPONENT,
+    state=lambda component: component.get('active'),
+    entities=(),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FieldFilter:
+    """Which values of a component besides the entities of its spec become sensors.
+
+    Every value-bearing field is discovered unless it is denied, or an allow
+    list is given and does not contain it. The entities of the specs are
+    always included.
+    """
+
+    allow: frozenset[str] = frozenset()
+    deny: frozenset[str] = frozenset()
+
+    def includes(self, name: str) -> bool:
+        """Return if a discovered value becomes a sensor."""
+        return name not in self.deny and (not self.allow or name in self.allow)
+
+
+UNIT_DEVICE_TYPES: dict[str | None, DeviceType] = {
+    '°C': DeviceType.TEMP_SENSOR,
+    't': DeviceType.PELLET_SENSOR,
+    'kg': DeviceType.PELLET_SENSOR,
+    '%': DeviceType.PERCENTAGE,
+}
+
+# A number at the start of a state, with a decimal comma or point and thousands separators
+NUMBER = re.compile(r'[+-]?\d[\d.,]*')
+
+
+def parse_number(state: Any) -> float:
+    """Return a state as a number, also from display values like '21,5 °C' or '1.234,5 kg'.
+
+    Raises ValueError if the state is no number followed by at most a unit.
+    """
+    if isinstance(state, (int, float)) and not isinstance(state, bool):
+        return float(state)
+    text = str(state).strip()
+    match = NUMBER.match(text)
+    if match is None or any(char.isdigit() for char in text[match.end():]):
+        raise ValueError(f"Not a number: {state!r}")
+    number = match.group()
+    if ',' in number and '.' in number:
+        # The last separator is the decimal one.
+        number = number.replace('.' if number.rfind(',') > number.rfind('.') else ',', '')
+    return float(number.replace(',', '.'))
+
+
+# Unit -> conversion of a state to the unit of the entity (t to kg). States of other units are kept as they are.
+UNIT_CONVERTERS: dict[str | None, Callable[[Any], float]] = {
+    '°C': parse_number,
+    't': lambda state: parse_number(state) * 1000,
+    'kg': parse_number,
+    '%': parse_number,
+}
+
+# Unit of a value -> unit of its native value, where ingest converts it
+NATIVE_UNITS: dict[str | None, str] = {
+    't': 'kg',
+}
+
+
+def device_type_by_unit(unit: str | None) -> DeviceType:
+    """Return the device type of a sensor by its unit."""
+    return UNIT_DEVICE_TYPES.get(unit, DeviceType.OTHER)
+
+
+def ingest(device) -> None:
+    """Convert the state of a device to its native value, once per changed state."""
+    convert = UNIT_CONVERTERS.get(getattr(device, 'unit', None))
+    if convert is None:
+        device.native_value = device.state
+        device.invalid = None
+        return
+    try:
+        device.native_value = convert(device.state)
+        device.invalid = None
+    except (TypeError, ValueError):
+        _LOGGER.debug("Cannot convert %r of %s to a number", device.state, device.key)
+        device.native_value = None
+        device.invalid = str(device.state)
+
+
+def iter_values(data: Any):
+    """Yield every value-bearing object (with a value or displayValue) in a response, depth first."""
+    if isinstance(data, dict):
+        if ('value' in data or 'displayValue' in data) and ('name' in data or 'displayName' in data):
+            yield data
+            return
+        for item in data.values():
+            yield from iter_values(item)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_values(item)
+
+
+def _number(value) -> float | None:
+    try:
+        return parse_number(value)
+    except ValueError:
+        return None
+
+
+def parameter_fields(value: dict) -> dict:
+    """Return the parameter id, limits and options of a value, for changing it."""
+    options = value.get('stringListKeyValues')
+    return {
+        'parameterId': value.get('id'),
+        'editable': bool(value.get('editable', False)),
+        'minVal': _number(value.get('minVal')),
+        'maxVal': _number(value.get('maxVal')),
+        'options': {str(key): str(label) for key, label in options.items()} if isinstance(options, dict) else None,
+    }
+
+
+def iter_readings(devices: list[FroelingDevice]):
+    """Yield the device, numeric native value and its unit of every device with a number as state."""
+    for device in devices:
+        value = device.device.native_value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            unit = getattr(device.device, 'unit', None)
+            yield device, float(value), NATIVE_UNITS.get(unit, unit)
+
+
+def parse_devices(controller_name: str, data_json: dict) -> list[FroelingDevice]:
+    """Parse the overview of a facility into devices, followed by their sensors."""
+    return DeviceModel(controller_name).update(data_json)
+
+
+class DeviceModel:
+    """Devices of a facility, built once and patched in place on every poll."""
+
+    def __init__(self, controller_name: str, fields: FieldFilter | None = None) -> None:
+        """Initialise."""
+        self.controller_name = controller_name
+        # Discovers all values of the components if set, otherwise only the entities of the specs
+        self.fields = fields
+        self.devices: list[FroelingDevice] = []
+        # Incremented with every parsed overview, unchanged ones are not parsed.
+        self.revision = 0
+        self._outTemp: FroelingDevice | None = None
+        self._parents: dict[str, FroelingDevice] = {}
+        self._sensors: dict[tuple[str, str], FroelingDevice] = {}
+
+    @property
+    def components(self) -> dict[str, FroelingDevice]:
+        """Return the component devices by component id."""
+        return self._parents
+
+    def sensor(self, componentId: str, entity: str) -> FroelingDevice | None:
+        """Return the sensor of a value of a component."""
+        return self._sensors.get((componentId, entity))
+
+    def update(self, data_json: dict) -> list[FroelingDevice]:
+        """Patch the devices with a new overview.
+
+        Devices are only built for components and values seen for the first time.
+        The same list is returned as long as no device was added or removed.
+        """
+        self.revision += 1
+        controller_name = self.controller_name
+        outTempData = data_json['outTemp']
+        if self._outTemp is None:
+            self._outTemp = FroelingDevice(
+                key=f"{controller_name}_outTemp", isParent=True,
+                device=OutTemp(device_id='outTemp1', icon="mdi:sun-thermometer",
+                               device_unique_id=f"{controller_name}_outTemp",
+                               key='outTemp', state=outTempData['value'],
+                               unit=outTempData['unit'],
+                               displayName=outTempData['displayName'],
+                               type=DeviceType.TEMP_SENSOR))
+            ingest(self._outTemp.device)
+        else:
+            outTemp = self._outTemp.device
+            outTemp.displayName = outTempData['displayName']
+            if (outTemp.state, outTemp.unit) != (outTempData['value'], outTempData['unit']):
+                outTemp.state = outTempData['value']
+                outTemp.unit = outTempData['unit']
+                ingest(outTemp)
+
+        parents = {}
+        sensors = {}
+        added = False
+
+        fields = self.fields
+        for component in data_json['components']:
+            spec = COMPONENT_SPECS.get(component.get('type'))
+            if spec is None:
+                if fields is None:
+                    _LOGGER.debug("Skipping component of unknown type %s", component.get('type'))
+                    continue
+                spec = DISCOVERED_SPEC
+
+            componentId = component['componentId']
+            parent = self._parents.get(componentId)
+            if parent is None:
+                parent = self._build_parent(spec, component)
+                added = True
+            else:
+                device = parent.device
+                device.displayName = component['displayName']
+                state = spec.state(component)
+                unit = spec.unit(component) if spec.unit is not None else None
+                if state != device.state or (spec.unit is not None and unit != device.unit):
+                    device.state = state
+                    if spec.unit is not None:
+                        device.unit = unit
+                    ingest(device)
+            parents[componentId] = parent
+
+            entities = spec.entities
+            if fields is not None:
+                entities = (*entities, *(
+                    name
+                    for name, value in component.items()
+                    if isinstance(value, dict)
+                    and ('value' in value or 'displayValue' in value)
+                    and name not in spec.entities
+                    and fields.includes(name)
+                ))
+            for entity in entities:
+                value = component.get(entity)
+                if value is None:
+                    _LOGGER.debug("Component %s has no value %s", componentId, entity)
+                    continue
+                sensor = self._sensors.get((componentId, entity))
+                if sensor is None:
+                    sensor = self._build_sensor(spec, component, entity, value)
+                    added = True
+                else:
+                    device = sensor.device
+                    device.displayName = value.get('displayName', entity)
+                    state = value['displayValue'] if 'displayValue' in value else value['value']
+                    unit = value.get('unit')
+                    if state != device.state or unit != device.unit:
+                        device.state = state
+                        if unit != device.unit:
+                            device.unit = unit
+                            device.type = device_type_by_unit(unit)
+                        ingest(device)
+                sensors[(componentId, entity)] = sensor
+
+        if added or len(parents) != len(self._parents) or len(sensors) != len(self._sensors):
+            self._parents = parents
+            self._sensors = sensors
+            self.devices = [self._outTemp, *parents.values(), *sensors.values()]
+        return self.devices
+
+    def _build_parent(self, spec: ComponentSpec, component: dict) -> FroelingDevice:
+        """Build the device of a component."""
+        componentId = component['componentId']
+        parentId = f"{self.controller_name}_{componentId}"
+        extra = {'unit': spec.unit(component)} if spec.unit is not None else {}
+        parent = FroelingDevice(
+            key=f"{parentId}_{spec.keyName}_{component.get('componentNumber', 0)}",
+            isParent=True,
+            device=spec.deviceClass(device_id=componentId, device_unique_id=parentId, key=componentId,
+                                    icon=spec.icon, state=spec.state(component),
+                                    displayName=component['displayName'], type=spec.type, **extra)
+        )
+        ingest(parent.device)
+        return parent
+
+    def _build_sensor(self, spec: ComponentSpec, component: dict, entity: str, value: dict) -> FroelingDevice:
+        """Build a sensor for a value of a component."""
+        componentId = component['componentId']
+        unit = value.get('unit')
+        discovered = entity not in spec.entities
+        sensor = FroelingDevice(
+            key=f"{self.controller_name}_{componentId}_kessel_{component.get('componentNumber', 0)}_{entity}",
+            isParent=False,
+            device=DeviceSensor(device_id=f"{componentId}_{entity}",
+                                # The ids of the spec entities are kept, discovered ones include the component.
+                                device_unique_id=(
+                                    f"{self.controller_name}_{componentId}_{entity}"
+                                    if discovered else f"{self.controller_name}_{entity}"
+                                ),
+                                key=f"{componentId}_{entity}", icon=spec.icon,
+                                state=value['displayValue'] if 'displayValue' in value else value['value'],
+                                displayName=value.get('displayName', entity), discovered=discovered,
+                                parentIdentifier=f"{self.controller_name}_{componentId}",
+                                type=device_type_by_unit(unit), unit=unit, **parameter_fields(value))
+        )
+        ingest(sensor.device)
+        return sensor
@@ -0,0 +1,145 @@
+"""
+Rate limiting, retries and circuit breaking for the API
+"""
+import asyncio
+import logging
+import random
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Return the delay before a retry, exponential with full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Limits the requests per second, allowing short bursts."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialise."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.throttled_count = 0
+        self.throttled_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                self.throttled_count += 1
+                self.throttled_seconds += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+
+    @property
+    def counters(self) -> dict:
+        """Return the state and counters."""
+        return {
+            'tokens': round(self.tokens, 2),
+            'throttled_count': self.throttled_count,
+            'throttled_seconds': round(self.throttled_seconds, 3),
+        }
+
+
+class CircuitBreaker:
+    """Stops outbound calls for a while after repeated failures.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected for reset_timeout seconds. Then one call is let through
+    (half open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialise."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.failure_count = 0
+        self.open_count = 0
+        self.rejected_count = 0
+        self._opened = 0.0
+        # The call let through while half open, until it succeeded or failed
+        self._probe_in_flight = False
+
+    @property
+    def retry_after(self) -> float:
+        """Return the seconds until an open circuit lets a call through."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened + self.reset_timeout - time.monotonic())
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError if calls are currently stopped, otherwise return if the call is the probe."""
+        if self.state == OPEN:
+            if self.retry_after > 0:
+                self.rejected_count += 1
+                raise CircuitOpenError(f"Circuit open, retry in {self.retry_after:.0f} s")
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected_count += 1
+                raise CircuitOpenError("Circuit half open, waiting for the probe")
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_aborted(self) -> None:
+        """Let another call probe, after the probe ended without an answer (cancelled)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.state != CLOSED:
+            _LOGGER.info("Froeling Connect is reachable again, closing circuit")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        self.failure_count += 1
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.open_count += 1
+                _LOGGER.warning(
+                    "Froeling Connect failed %s times, pausing requests for %s s",
+                    self.consecutive_failures, self.reset_timeout
+                )
+            self.state = OPEN
+            self._opened = time.monotonic()
+
+    @property
+    def counters(self) -> dict:
+        """Return the state and counters."""
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'failure_count': self.failure_count,
+            'open_count': self.open_count,
+            'rejected_count': self.rejected_count,
+            'retry_after': round(self.retry_after, 1),
+        }
+
+
+class CircuitOpenError(Exception):
+    """Exception class for calls rejected by an open circuit."""
@@ -0,0 +1,159 @@
+"""Append-only time-series store with fixed-width records
+
+A store is a folder with one segment file per UTC day and series.json, which
+maps the series ids of the records to their facility, device, name and unit.
+Every record is RECORD_SIZE bytes: the unix time in seconds (uint32), the
+series id (uint32) and the value (float64), little endian. Records of a
+segment are in time order, so the reader finds the start of a range by
+binary search over the memory-mapped file.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterator
+from dataclasses import astuple, dataclass
+
+RECORD = struct.Struct('<IId')
+RECORD_SIZE = RECORD.size
+SERIES_FILE = 'series.json'
+
+
+@dataclass(frozen=True, slots=True)
+class Series:
+    """What the values of a series id are."""
+
+    facility: str
+    device: str
+    name: str
+    unit: str | None
+
+
+def segment_name(timestamp: int) -> str:
+    """Return the file name of the segment a timestamp belongs to."""
+    return time.strftime('%Y%m%d.bin', time.gmtime(timestamp))
+
+
+def load_series(path: str) -> list[Series]:
+    """Return the series of a store, by series id."""
+    try:
+        with open(os.path.join(path, SERIES_FILE), encoding='utf-8') as handle:
+            return [Series(*series) for series in json.load(handle)]
+    except FileNotFoundError:
+        return []
+
+
+class TimeSeriesWriter:
+    """Buffers records and appends them to the segment files on flush."""
+
+    def __init__(self, path: str) -> None:
+        """Initialise, continuing the series of an existing store."""
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.series = load_series(path)
+        self._ids = {series: seriesId for seriesId, series in enumerate(self.series)}
+        self._new_series = False
+        # Segment name -> records not written yet
+        self._buffers: dict[str, bytearray] = {}
+        self._last_time = 0
+        self.samples = 0
+        self.bytes_written = 0
+
+    def series_id(self, series: Series) -> int:
+        """Return the id of a series, adding it if it is new."""
+        seriesId = self._ids.get(series)
+        if seriesId is None:
+            seriesId = self._ids[series] = len(self.series)
+            self.series.append(series)
+            self._new_series = True
+        return seriesId
+
+    def append(self, timestamp: float, series: Series, value: float) -> None:
+        """Add a value. Timestamps before the last appended one are moved up to it, to keep the order."""
+        timestamp = max(int(timestamp), self._last_time)
+        self._last_time = timestamp
+        buffer = self._buffers.get(name := segment_name(timestamp))
+        if buffer is None:
+            buffer = self._buffers[name] = bytearray()
+        buffer += RECORD.pack(timestamp, self.series_id(series), value)
+        self.samples += 1
+
+    def flush(self) -> None:
+        """Write the buffered records, and the series before the records that use them."""
+        if self._new_series:
+            temporary = os.path.join(self.path, SERIES_FILE + '.tmp')
+            with open(temporary, 'w', encoding='utf-8') as handle:
+                json.dump([astuple(series) for series in self.series], handle)
+            os.replace(temporary, os.path.join(self.path, SERIES_FILE))
+            self._new_series = False
+        for name in list(self._buffers):
+            buffer = self._buffers[name]
+            with open(os.path.join(self.path, name), 'ab') as handle:
+                handle.write(buffer)
+            # Only written segments are dropped, the others are written with the next flush.
+            del self._buffers[name]
+            self.bytes_written += len(buffer)
+
+
+class TimeSeriesReader:
+    """Range queries over the memory-mapped segments of a store."""
+
+    def __init__(self, path: str) -> None:
+        """Initialise."""
+        self.path = path
+        self.series = load_series(path)
+
+    def find(self, facility: str | None = None, name: str | None = None) -> dict[int, Series]:
+        """Return the series of a facility and/or with a name by id."""
+        return {
+            seriesId: series for seriesId, series in enumerate(self.series)
+            if (facility is None or series.facility == facility) and (name is None or series.name == name)
+        }
+
+    def segments(self, start: float, end: float) -> list[str]:
+        """Return the segment files that may hold records from start to end."""
+        first, last = segment_name(int(start)), segment_name(int(end))
+        return sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.endswith('.bin') and first <= name <= last
+        )
+
+    def query(
+            self, start: float, end: float, seriesIds: set[int] | None = None
+    ) -> Iterator[tuple[int, int, float]]:
+        """Yield the timestamp, series id and value of the records from start to end (exclusive)."""
+        # Seconds, like the records; a fractional start includes its second.
+        start, end = int(start), int(-(-end // 1))
+        for segment in self.segments(start, end):
+            with open(segment, 'rb') as handle:
+                size = os.fstat(handle.fileno()).st_size
+                # A record that is being appended is ignored.
+                count = size // RECORD_SIZE
+                if not count:
+                    continue
+                with mmap.mmap(handle.fileno(), count * RECORD_SIZE, access=mmap.ACCESS_READ) as data:
+                    first = self._bisect(data, count, start)
+                    view = memoryview(data)[first * RECORD_SIZE:count * RECORD_SIZE]
+                    try:
+                        for timestamp, seriesId, value in RECORD.iter_unpack(view):
+                            if timestamp >= end:
+                                break
+                            if seriesIds is None or seriesId in seriesIds:
+                                yield timestamp, seriesId, value
+                    finally:
+                        view.release()
+
+    @staticmethod
+    def _bisect(data: mmap.mmap, count: int, timestamp: int) -> int:
+        """Return the index of the first record at or after timestamp."""
+        low, high = 0, count
+        unpack = struct.Struct('<I').unpack_from
+        while low < high:
+            middle = (low + high) // 2
+            if unpack(data, middle * RECORD_SIZE)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
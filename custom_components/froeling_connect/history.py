@@ -0,0 +1,119 @@
+"""Import of the pellet consumption history into the long-term statistics"""
+
+import csv
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID, UnitOfMass
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import IMPORT_CHUNK_SIZE
+from .forecast import KILOGRAMS_PER_UNIT, to_kilograms
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_FILE = "file"
+ATTR_UNIT = "unit"
+
+IMPORT_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Required(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_UNIT, default=UnitOfMass.KILOGRAMS): vol.In(list(KILOGRAMS_PER_UNIT)),
+    }
+)
+
+
+def read_history(path: str, unit: str) -> dict[datetime, float]:
+    """Read a consumption counter export, returning its last value in kg of every hour.
+
+    The file is a CSV with the columns time and value, or a JSON list of objects
+    with these keys. Times are ISO 8601, without an offset they are local time.
+    """
+    file = Path(path)
+    with file.open(encoding="utf-8") as handle:
+        if file.suffix.lower() == ".json":
+            rows = json.load(handle)
+        else:
+            rows = list(csv.DictReader(handle))
+
+    hours: dict[datetime, tuple[datetime, float]] = {}
+    for number, row in enumerate(rows, 1):
+        time = dt_util.parse_datetime(str(row.get("time")))
+        value = to_kilograms(row.get("value"), unit)
+        if time is None or value is None:
+            _LOGGER.warning("Skipping row %s of %s: %s", number, path, row)
+            continue
+        if time.tzinfo is None:
+            time = time.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+        hour = dt_util.as_utc(time).replace(minute=0, second=0, microsecond=0)
+        # Rows may be unordered, the latest one of an hour wins.
+        previous = hours.get(hour)
+        if previous is None or time >= previous[0]:
+            hours[hour] = (time, value)
+    return {hour: value for hour, (_, value) in sorted(hours.items())}
+
+
+async def async_import_history(hass: HomeAssistant, entity_id: str, path: str, unit: str) -> int:
+    """Import a consumption history into the statistics of an entity, returning the imported hours.
+
+    Hours that already have statistics are skipped. The sums of the imported
+    hours continue into the existing statistics, which start at the first
+    recorded state of the entity.
+    """
+    # The recorder is only imported when the service is used, not on every start.
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    from homeassistant.components.recorder.statistics import async_import_statistics, statistics_during_period
+
+    if not hass.config.is_allowed_path(path):
+        raise HomeAssistantError(f"Access to {path} is not allowed, add it to allowlist_external_dirs")
+    recorder = get_instance(hass)
+    try:
+        hours = await hass.async_add_executor_job(read_history, path, unit)
+    except (OSError, ValueError) as err:
+        raise HomeAssistantError(f"Cannot read {path}: {err}") from err
+    if not hours:
+        return 0
+
+    existing = await recorder.async_add_executor_job(
+        statistics_during_period, hass, next(iter(hours)), None, {entity_id}, "hour", None, {"state", "sum"}
+    )
+    rows = existing.get(entity_id, [])
+    imported = {dt_util.utc_from_timestamp(row["start"]) for row in rows}
+    if rows and rows[0].get("sum") is not None and rows[0].get("state") is not None:
+        offset = rows[0]["sum"] - rows[0]["state"]
+    else:
+        offset = -next(iter(hours.values()))
+
+    statistics = [
+        StatisticData(start=hour, state=value, sum=value + offset)
+        for hour, value in hours.items()
+        if hour not in imported
+    ]
+    metadata = StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=None,
+        source="recorder",
+        statistic_id=entity_id,
+        unit_of_measurement=UnitOfMass.KILOGRAMS,
+    )
+    for start in range(0, len(statistics), IMPORT_CHUNK_SIZE):
+        async_import_statistics(hass, metadata, statistics[start:start + IMPORT_CHUNK_SIZE])
+        # Let the recorder write a chunk before queueing the next one.
+        await recorder.async_block_till_done()
+
+    _LOGGER.info(
+        "Imported %s hours of %s into %s, skipped %s existing", len(statistics), path, entity_id,
+        len(hours) - len(statistics)
+    )
+    return len(statistics)
+
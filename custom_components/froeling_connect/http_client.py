@@ -0,0 +1,53 @@
+"""Shared HTTP client"""
+
+import httpx
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    DATA_CIRCUIT_BREAKER,
+    DATA_HTTP_CLIENT,
+    DATA_RATE_LIMITER,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+)
+from .froeling_client import create_client
+from .froeling_client.resilience import CircuitBreaker, TokenBucket
+
+
+async def _async_create_client(hass: HomeAssistant) -> httpx.AsyncClient:
+    """Create the shared client and close it when Home Assistant stops."""
+    # The ssl context is loaded outside the event loop.
+    client = await hass.async_add_executor_job(create_client)
+
+    async def _async_close_client(event: Event) -> None:
+        await client.aclose()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_client)
+    return client
+
+
+async def async_get_http_client(hass: HomeAssistant) -> httpx.AsyncClient:
+    """Return the httpx client shared by all config entries of this hass instance."""
+    # Store the creation task, so concurrent setups wait for the same client.
+    if DATA_HTTP_CLIENT not in hass.data:
+        hass.data[DATA_HTTP_CLIENT] = hass.async_create_task(
+            _async_create_client(hass)
+        )
+    return await hass.data[DATA_HTTP_CLIENT]
+
+
+def get_rate_limiter(hass: HomeAssistant) -> TokenBucket:
+    """Return the rate limiter shared by all config entries."""
+    if DATA_RATE_LIMITER not in hass.data:
+        hass.data[DATA_RATE_LIMITER] = TokenBucket(RATE_LIMIT, RATE_LIMIT_BURST)
+    return hass.data[DATA_RATE_LIMITER]
+
+
+def get_circuit_breaker(hass: HomeAssistant) -> CircuitBreaker:
+    """Return the circuit breaker shared by all config entries."""
+    if DATA_CIRCUIT_BREAKER not in hass.data:
+        hass.data[DATA_CIRCUIT_BREAKER] = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+    return hass.data[DATA_CIRCUIT_BREAKER]
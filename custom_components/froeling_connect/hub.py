@@ -0,0 +1,189 @@
+"""Account hub shared by the config entries of one Froeling account"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import DATA_HUBS, DOMAIN, MAX_PARALLEL_FETCHES, SESSION_STORE_VERSION
+from .froeling_client.api import API
+from .froeling_client.froelingDevice import FroelingDevice
+from .http_client import async_get_http_client, get_circuit_breaker, get_rate_limiter
+
+if TYPE_CHECKING:
+    from .coordinator import FroelingDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def session_store(hass: HomeAssistant, user: str) -> Store:
+    """Return the store of the login session of an account."""
+    return Store(
+        hass, SESSION_STORE_VERSION, f"{DOMAIN}.session.{slugify(user)}", private=True
+    )
+
+
+async def async_get_hub(hass: HomeAssistant, user: str, pwd: str) -> FroelingHub:
+    """Return the hub of an account, creating it for the first config entry."""
+    client = await async_get_http_client(hass)
+    hubs: dict[str, FroelingHub] = hass.data.setdefault(DATA_HUBS, {})
+    hub = hubs.get(user)
+    if hub is None:
+        api = API(user, pwd, client, get_rate_limiter(hass), get_circuit_breaker(hass))
+        hub = hubs[user] = FroelingHub(hass, api, session_store(hass, user))
+    elif hub.api.payload['password'] != pwd:
+        # The password was reconfigured, log in again with the new one.
+        hub.api.payload['password'] = pwd
+        hub.api.disconnect()
+    await hub.async_load()
+    return hub
+
+
+class FroelingHub:
+    """Logs in once per account and fetches all facilities concurrently."""
+
+    def __init__(self, hass: HomeAssistant, api: API, store: Store) -> None:
+        """Initialise."""
+        self.hass = hass
+        self.api = api
+        self.coordinators: dict[str, FroelingDataCoordinator] = {}
+        self.fan_out_count = 0
+        self._store = store
+        self._saved_login_count = 0
+        self._load_task: asyncio.Task | None = None
+        self._semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+        self._fan_out: asyncio.Task | None = None
+        self._waiting: set[str] = set()
+        # Results of a fan-out for the facilities that did not request it, until their coordinators refresh
+        self._fetched: dict[str, list[FroelingDevice] | Exception] = {}
+
+    async def async_load(self) -> None:
+        """Restore the persisted login session."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        self.api.restore_session(await self._store.async_load())
+
+    def register(self, coordinator: FroelingDataCoordinator) -> None:
+        """Add the facility of a coordinator to the fan-out."""
+        self.coordinators[coordinator.facilityId] = coordinator
+        if self.api.facilities and coordinator.facilityId not in self.api.facilities:
+            _LOGGER.warning(
+                "Facility %s is not listed for this account, facilities: %s",
+                coordinator.facilityId, self.api.facilities
+            )
+
+    def unregister(self, coordinator: FroelingDataCoordinator) -> None:
+        """Remove the facility of a coordinator, and the hub with the last one."""
+        self.coordinators.pop(coordinator.facilityId, None)
+        self.api.models.pop(coordinator.facilityId, None)
+        self.api.filters.pop(coordinator.facilityId, None)
+        self._fetched.pop(coordinator.facilityId, None)
+        if not self.coordinators:
+            self.hass.data.get(DATA_HUBS, {}).pop(self.api.payload['username'], None)
+
+    async def async_get_devices(self, facilityId: str) -> list[FroelingDevice]:
+        """Return the devices of a facility, joining a fan-out already in progress."""
+        if facilityId in self._fetched:
+            # Fetched by the fan-out of another facility, which refreshes this coordinator.
+            result = self._fetched.pop(facilityId)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        self._waiting.add(facilityId)
+        if self._fan_out is None or self._fan_out.done():
+            self._fan_out = self.hass.async_create_task(self._async_fan_out())
+        fan_out = self._fan_out
+        results = await asyncio.shield(fan_out)
+
+        if facilityId not in results:
+            # Registered while the fan-out was already running.
+            return await self._async_fetch(facilityId)
+        result = results[facilityId]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _async_hand_over(self, coordinator: FroelingDataCoordinator) -> None:
+        """Refresh a coordinator with the result fetched for it by a fan-out."""
+        try:
+            await coordinator.async_refresh()
+        finally:
+            # Left over if the coordinator joined a refresh in progress, which fetched its own.
+            self._fetched.pop(coordinator.facilityId, None)
+
+    async def _async_fetch(self, facilityId: str) -> list[FroelingDevice]:
+        """Fetch the devices of one facility, bounded by the parallel fetch limit."""
+        async with self._semaphore:
+            return await self.api.get_Devices(facilityId)
+
+    async def async_get_component_details(
+            self, facilityId: str, componentIds: list[str]
+    ) -> dict[str, dict | BaseException]:
+        """Fetch the details of components concurrently over the shared connection."""
+        async def fetch(componentId: str) -> dict:
+            async with self._semaphore:
+                return await self.api.get_component(facilityId, componentId)
+
+        fetched = await asyncio.gather(
+            *(fetch(componentId) for componentId in componentIds), return_exceptions=True
+        )
+        return dict(zip(componentIds, fetched))
+
+    async def _async_fan_out(self) -> dict[str, list[FroelingDevice] | Exception]:
+        """Fetch the requested and due facilities of the account concurrently with one login.
+
+        Facilities that are not due keep the interval of their own adaptive scheduler,
+        instead of being polled at the rate of the busiest facility.
+        """
+        try:
+            self.fan_out_count += 1
+            now = time.monotonic()
+            facilityIds = [
+                facilityId for facilityId, coordinator in self.coordinators.items()
+                if facilityId in self._waiting or coordinator.poll_due(now)
+            ]
+            try:
+                await self.api.async_ensure_session()
+            except Exception as err:  # pylint: disable=broad-except
+                results = {facilityId: err for facilityId in facilityIds}
+            else:
+                fetched = await asyncio.gather(
+                    *(self._async_fetch(facilityId) for facilityId in facilityIds),
+                    return_exceptions=True,
+                )
+                results = dict(zip(facilityIds, fetched))
+
+            # The coordinators that did not ask refresh with their result, failures included.
+            for facilityId, result in results.items():
+                coordinator = self.coordinators.get(facilityId)
+                if coordinator is not None and facilityId not in self._waiting:
+                    self._fetched[facilityId] = result
+                    self.hass.async_create_task(self._async_hand_over(coordinator))
+        finally:
+            self._fan_out = None
+            self._waiting = set()
+
+        if self.api.login_count != self._saved_login_count:
+            # Only persist the session when a new token was issued.
+            self._saved_login_count = self.api.login_count
+            await self._store.async_save(self.api.session)
+        _LOGGER.debug(
+            "Fan-outs: %s, logins: %s, reused sessions: %s, unchanged overviews: %s, changed: %s",
+            self.fan_out_count, self.api.login_count, self.api.reuse_count,
+            self.api.fingerprint_hits, self.api.fingerprint_misses
+        )
+        if self.api.breaker is not None and self.api.limiter is not None:
+            _LOGGER.debug(
+                "Retries: %s, circuit: %s, rate limit: %s",
+                self.api.retry_count, self.api.breaker.counters, self.api.limiter.counters
+            )
+        return results
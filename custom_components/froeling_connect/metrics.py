@@ -0,0 +1,83 @@
+"""
+Poll performance metrics
+"""
+from collections import deque
+
+from .const import POLL_METRICS_WINDOW
+
+# Phases of a poll, in order
+PHASES = ('login', 'connect', 'request', 'decode', 'parse', 'diff', 'fanout', 'total')
+
+
+class RollingHistogram:
+    """Keeps the last samples of a value, in a fixed-size window."""
+
+    def __init__(self, size: int = POLL_METRICS_WINDOW) -> None:
+        """Initialise."""
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add a sample, dropping the oldest one when the window is full."""
+        self._samples.append(value)
+        self.count += 1
+
+    @property
+    def last(self) -> float | None:
+        """Return the latest sample."""
+        return self._samples[-1] if self._samples else None
+
+    def summary(self) -> dict:
+        """Return count, mean, percentiles and max of the window."""
+        if not self._samples:
+            return {'count': self.count}
+        ordered = sorted(self._samples)
+        size = len(ordered)
+        return {
+            'count': self.count,
+            'last': self._samples[-1],
+            'mean': sum(ordered) / size,
+            'p50': ordered[size // 2],
+            'p90': ordered[min(size - 1, int(size * 0.9))],
+            'p99': ordered[min(size - 1, int(size * 0.99))],
+            'max': ordered[-1],
+        }
+
+
+class PollMetrics:
+    """Timings in seconds per poll phase, bytes transferred and counters of a facility."""
+
+    def __init__(self, size: int = POLL_METRICS_WINDOW) -> None:
+        """Initialise."""
+        self.phases = {phase: RollingHistogram(size) for phase in PHASES}
+        self.bytes = RollingHistogram(size)
+        self.bytes_total = 0
+        self.polls = 0
+        self.logins = 0
+        self.failures = 0
+        self.entity_writes = 0
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Record the duration of a phase."""
+        self.phases[phase].add(seconds)
+
+    def add_bytes(self, count: int) -> None:
+        """Record the bytes transferred by a poll."""
+        self.bytes.add(count)
+        self.bytes_total += count
+
+    def last(self, phase: str) -> float | None:
+        """Return the latest duration of a phase."""
+        return self.phases[phase].last
+
+    def as_dict(self) -> dict:
+        """Return all metrics."""
+        return {
+            'polls': self.polls,
+            'logins': self.logins,
+            'failures': self.failures,
+            'entity_writes': self.entity_writes,
+            'bytes_total': self.bytes_total,
+            'bytes': self.bytes.summary(),
+            'seconds': {phase: histogram.summary() for phase, histogram in self.phases.items()},
+        }
@@ -0,0 +1,74 @@
+"""Number entities for the setpoints of the components"""
+
+import logging
+
+from homeassistant.components.number import NumberDeviceClass, NumberEntity, NumberMode
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, WRITABLE_NUMBERS
+from .coordinator import FroelingDataCoordinator
+from .entity import FroelingParameterEntity, async_add_new_entities
+from .froeling_client.froelingDevice import DeviceType, FroelingDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+):
+    """Set up the numbers."""
+    coordinator: FroelingDataCoordinator = hass.data[DOMAIN][config_entry.entry_id].coordinator
+
+    def create(froelingDevice: FroelingDevice) -> list[FroelingNumber]:
+        name = writable_name(froelingDevice, WRITABLE_NUMBERS)
+        return [] if name is None else [FroelingNumber(coordinator, froelingDevice, name)]
+
+    async_add_new_entities(coordinator, config_entry, async_add_entities, create)
+
+
+def writable_name(froelingDevice: FroelingDevice, names: tuple[str, ...]) -> str | None:
+    """Return the name of a value that can be changed, or None."""
+    if froelingDevice.isParent:
+        return None
+    device = froelingDevice.device
+    name = device.key.rsplit('_', 1)[-1]
+    if name not in names or not device.editable or device.parameterId is None:
+        return None
+    return name
+
+
+class FroelingNumber(FroelingParameterEntity, NumberEntity):
+    """Setpoint of a component."""
+
+    _attr_mode = NumberMode.BOX
+    _attr_native_step = 0.5
+
+    def __init__(self, coordinator: FroelingDataCoordinator, froelingDevice: FroelingDevice, name: str) -> None:
+        """Initialise number."""
+        super().__init__(coordinator, froelingDevice, name)
+        device = froelingDevice.device
+        if device.minVal is not None:
+            self._attr_native_min_value = device.minVal
+        if device.maxVal is not None:
+            self._attr_native_max_value = device.maxVal
+        if device.type == DeviceType.TEMP_SENSOR:
+            self._attr_device_class = NumberDeviceClass.TEMPERATURE
+            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the setpoint."""
+        try:
+            return float(self.value)
+        except ValueError:
+            return None
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Change the setpoint."""
+        text = f"{value:g}"
+        self.async_write_value(text, text)
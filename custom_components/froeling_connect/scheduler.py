@@ -0,0 +1,99 @@
+"""Adaptive poll interval"""
+
+import logging
+import time
+
+from .const import (
+    ADAPTIVE_ACTIVE_HOLD,
+    ADAPTIVE_ACTIVE_STATES,
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_RATE_THRESHOLD,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+)
+from .froeling_client.froelingDevice import FroelingDevice
+from .froeling_client.parser import COMPONENT_SPECS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Values whose rate of change keeps the interval short
+WATCHED_TEMPERATURES = ('boilerTemp', 'bufferTempTop')
+BOILER_KEY = f"_{COMPONENT_SPECS['BOILER'].keyName}_"
+
+
+class AdaptivePollScheduler:
+    """Chooses the next poll interval from the boiler state and how fast temperatures change.
+
+    The interval drops to MIN_SCAN_INTERVAL for ADAPTIVE_ACTIVE_HOLD seconds
+    when the boiler starts to ignite or heat, so the transition is followed
+    closely, and is the configured interval for as long as it stays active.
+    It also stays at the configured interval while temperatures change, and
+    backs off gradually up to MAX_SCAN_INTERVAL while everything is stable.
+    """
+
+    def __init__(
+            self,
+            base_interval: int,
+            min_interval: int = MIN_SCAN_INTERVAL,
+            max_interval: int = MAX_SCAN_INTERVAL,
+    ) -> None:
+        """Initialise."""
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.interval = base_interval
+        self.reason = "configured interval"
+        self._temperatures: dict[str, tuple[float, float]] = {}
+        # Active boiler state and when it started
+        self._active: str | None = None
+        self._active_since = 0.0
+
+    def update(self, devices: list[FroelingDevice], now: float | None = None) -> int:
+        """Return the next poll interval in seconds for a refresh."""
+        now = time.monotonic() if now is None else now
+        boilerStates = []
+        rate = 0.0
+
+        for device in devices:
+            if device.isParent:
+                if BOILER_KEY in device.key:
+                    boilerStates.append(str(device.device.state))
+                continue
+            name = device.device.key.rsplit('_', 1)[-1]
+            if name == 'mode2':
+                boilerStates.append(str(device.device.state))
+            elif name in WATCHED_TEMPERATURES:
+                rate = max(rate, self._rate(device.key, device.device.native_value, now))
+
+        active = next((state for state in boilerStates if state.strip().lower() in ADAPTIVE_ACTIVE_STATES), None)
+        if active != self._active:
+            self._active = active
+            self._active_since = now
+        if active is not None and now - self._active_since < ADAPTIVE_ACTIVE_HOLD:
+            self.interval = self.min_interval
+            self.reason = f"boiler became active: {active}"
+        elif active is not None:
+            self.interval = self.base_interval
+            self.reason = f"boiler active: {active}"
+        elif rate >= ADAPTIVE_RATE_THRESHOLD:
+            self.interval = self.base_interval
+            self.reason = f"temperature changing {rate:.2f} K/min"
+        else:
+            self.interval = min(
+                self.max_interval,
+                max(self.base_interval, round(self.interval * ADAPTIVE_BACKOFF_FACTOR)),
+            )
+            self.reason = "values stable, backing off"
+
+        _LOGGER.debug("Next poll in %s s (%s)", self.interval, self.reason)
+        return self.interval
+
+    def _rate(self, key: str, value: float | None, now: float) -> float:
+        """Return the absolute rate of change of a temperature in K per minute."""
+        if not isinstance(value, float):
+            return 0.0
+        previous = self._temperatures.get(key)
+        self._temperatures[key] = (now, value)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        return abs(value - previous[1]) / (now - previous[0]) * 60
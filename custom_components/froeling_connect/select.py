@@ -0,0 +1,60 @@
+"""Select entities for the modes of the components"""
+
+import logging
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, WRITABLE_SELECTS
+from .coordinator import FroelingDataCoordinator
+from .entity import FroelingParameterEntity, async_add_new_entities
+from .froeling_client.froelingDevice import FroelingDevice
+from .number import writable_name
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+):
+    """Set up the selects."""
+    coordinator: FroelingDataCoordinator = hass.data[DOMAIN][config_entry.entry_id].coordinator
+
+    def create(froelingDevice: FroelingDevice) -> list[FroelingSelect]:
+        name = writable_name(froelingDevice, WRITABLE_SELECTS)
+        # Modes are only known with their options.
+        if name is None or not froelingDevice.device.options:
+            return []
+        return [FroelingSelect(coordinator, froelingDevice, name)]
+
+    async_add_new_entities(coordinator, config_entry, async_add_entities, create)
+
+
+class FroelingSelect(FroelingParameterEntity, SelectEntity):
+    """Mode of a component."""
+
+    @property
+    def options(self) -> list[str]:
+        """Return the labels of the modes."""
+        return list(self.froelingDevice.device.options.values())
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the label of the current mode."""
+        value = self.value
+        # The state is the label if the overview had a displayValue, otherwise the value.
+        return self.froelingDevice.device.options.get(value, value)
+
+    async def async_select_option(self, option: str) -> None:
+        """Change the mode."""
+        value = next(
+            (value for value, label in self.froelingDevice.device.options.items() if label == option), None
+        )
+        if value is None:
+            raise HomeAssistantError(f"Unknown mode {option}")
+        self.async_write_value(value, option)
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import Callable
+from datetime import datetime
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -6,15 +8,20 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature, UnitOfMass, PERCENTAGE
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfMass, UnitOfTime, PERCENTAGE
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .coordinator import FroelingDataCoordinator
-from .froelingDevice import FroelingDevice, DeviceType
+from .entity import async_add_new_entities
+from .forecast import PelletForecast
+from .froeling_client.api import controller_name
+from .froeling_client.froelingDevice import FroelingDevice, DeviceType, FeedSystem
+from .metrics import PHASES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,38 +37,40 @@ async def async_setup_entry(
         config_entry.entry_id
     ].coordinator
 
-    devices = []
-
-    for froelingDevice in coordinator.data.devices:
-        if froelingDevice.isParent:
-            devices.append(
-                FroelingSensor(hass, coordinator, froelingDevice, config_entry)
-
-            )
-
-    sensors = []
-    for froelingDevice in coordinator.data.devices:
-        if not froelingDevice.isParent:
-            sensors.append(
-                FroelingSensor(hass, coordinator, froelingDevice, config_entry)
-
-            )
-
-    # Create the sensors.
-    await add_sensors(sensors, async_add_entities)
-    await add_devices(devices, async_add_entities)
+    def create(froelingDevice: FroelingDevice) -> list[SensorEntity]:
+        sensor = FroelingSensor(hass, coordinator, froelingDevice, config_entry)
+        details = coordinator.details
+        if (details is not None and froelingDevice.key in details.devices) or getattr(froelingDevice.device, 'discovered', False):
+            # Details are only fetched for the components with enabled sensors,
+            # discovered values are only shown once enabled.
+            sensor._attr_entity_registry_enabled_default = False
+        if isinstance(froelingDevice.device, FeedSystem):
+            return [sensor, *forecast_sensors(coordinator, froelingDevice)]
+        return [sensor]
 
-
-async def add_devices(devices, async_add_entities):
-    async_add_entities(devices)
+    # Create the sensors, and the ones of devices that appear later.
+    async_add_new_entities(coordinator, config_entry, async_add_entities, create)
+    await add_sensors(diagnostic_sensors(coordinator), async_add_entities)
 
 
 async def add_sensors(sensors, async_add_entities):
     async_add_entities(sensors)
 
 
+# Device type -> device class, unit and state class of the entity
+TYPE_ATTRIBUTES: dict[DeviceType, tuple[SensorDeviceClass | None, str | None, SensorStateClass | None]] = {
+    DeviceType.TEMP_SENSOR: (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, SensorStateClass.MEASUREMENT),
+    DeviceType.PELLET_SENSOR: (SensorDeviceClass.WEIGHT, UnitOfMass.KILOGRAMS, SensorStateClass.TOTAL),
+    DeviceType.PERCENTAGE: (None, PERCENTAGE, None),
+}
+
+
 class FroelingSensor(CoordinatorEntity, SensorEntity):
-    """Implementation of a sensor."""
+    """Implementation of a sensor.
+
+    The entity attributes are resolved into _attr_* fields when the entity is
+    created and when its device changes, not on every state write.
+    """
 
     def __init__(self, hass: HomeAssistant, coordinator: FroelingDataCoordinator, froelingDevice: FroelingDevice,
                  config_entry: ConfigEntry) -> None:
@@ -70,106 +79,320 @@ class FroelingSensor(CoordinatorEntity, SensorEntity):
         self.froelingDevice = froelingDevice
         self.key = froelingDevice.key
         self.config_entry = config_entry
+        self._last_available = coordinator.last_update_success
+        # False while the value is missing from the devices, like a removed component or a denied value
+        self._present = True
+        self._type = None
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Update sensor with latest data from coordinator."""
-        # This method is called by your DataUpdateCoordinator when a successful update runs.
-        self.froelingDevice = self.coordinator.get_device_by_key(
-            self.froelingDevice.key
-        )
-        _LOGGER.debug("Device: %s", self.froelingDevice.key)
-        self.async_write_ha_state()
-
-    @property
-    def device_class(self) -> str | None:
-        """Return device class."""
-        # https://developers.home-assistant.io/docs/core/entity/sensor/#available-device-classes
-        if self.froelingDevice.device.type == DeviceType.TEMP_SENSOR:
-            return SensorDeviceClass.TEMPERATURE
-        if self.froelingDevice.device.type == DeviceType.PELLET_SENSOR:
-            return SensorDeviceClass.WEIGHT
-        return None
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information."""
+        # All entities must have a unique id.  Think carefully what you want this to be as
+        # changing it later will cause HA to create new entities.
+        self._attr_unique_id = f"{DOMAIN}-{froelingDevice.device.device_unique_id}"
         # Identifiers are what group entities into the same device.
         # If your device is created elsewhere, you can just specify the indentifiers parameter.
         # If your device connects via another device, add via_device parameter with the indentifiers of that device.
-        if self.froelingDevice.isParent:
-            return DeviceInfo(
-                name=f"{self.froelingDevice.device.displayName}",
+        if froelingDevice.isParent:
+            self._attr_device_info = DeviceInfo(
+                name=f"{froelingDevice.device.displayName}",
                 manufacturer="Froeling",
-                identifiers={
-                    (
-                        DOMAIN,
-                        self.froelingDevice.device.device_unique_id,
-                    )
-                },
+                identifiers={(DOMAIN, froelingDevice.device.device_unique_id)},
                 suggested_area='Keller'
             )
         else:
-            return DeviceInfo(
-                name=f"{self.froelingDevice.device.displayName}",
+            self._attr_device_info = DeviceInfo(
+                name=f"{froelingDevice.device.displayName}",
                 manufacturer="Froeling",
-                identifiers={
-                    (
-                        DOMAIN,
-                        self.froelingDevice.device.parentIdentifier
-                    )
-                },
+                identifiers={(DOMAIN, froelingDevice.device.parentIdentifier)},
             )
+        self._resolve_attributes()
+
+    def _resolve_attributes(self) -> None:
+        """Copy the state and attributes of the device, resolving the type dependent ones if it changed."""
+        device = self.froelingDevice.device
+        if device.type != self._type:
+            self._type = device.type
+            # https://developers.home-assistant.io/docs/core/entity/sensor/#available-device-classes
+            (
+                self._attr_device_class,
+                self._attr_native_unit_of_measurement,
+                self._attr_state_class,
+            ) = TYPE_ATTRIBUTES.get(device.type, (None, None, None))
+        self._attr_name = device.displayName
+        self._attr_icon = device.icon
+        # Using native value and native unit of measurement, allows you to change units
+        # in Lovelace and HA will automatically calculate the correct value.
+        # Converted once when the state changed, see parser.ingest.
+        self._attr_native_value = device.native_value
+        # Add any additional attributes you want on your sensor.
+        # Served after failed polls, the data age sensor tells since when.
+        attrs = {"extra_info": "Extra Info", "stale": self.coordinator.stale}
+        if device.invalid is not None:
+            # The state the API sent could not be converted to a number.
+            attrs["invalid_value"] = device.invalid
+        self._attr_extra_state_attributes = attrs
 
     @property
-    def icon(self) -> str | None:
-        return self.froelingDevice.device.icon
+    def available(self) -> bool:
+        """Return if the last refresh succeeded and still has the value."""
+        return self._present and super().available
+
+    async def async_added_to_hass(self) -> None:
+        """Request the details of the component, if this is a detail sensor."""
+        await super().async_added_to_hass()
+        if self.coordinator.details is not None and self.key in self.coordinator.details.devices:
+            self.coordinator.details.enabled.add(self.key)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop fetching details for this sensor."""
+        await super().async_will_remove_from_hass()
+        if self.coordinator.details is not None:
+            self.coordinator.details.enabled.discard(self.key)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update sensor with latest data from coordinator."""
+        # This method is called by your DataUpdateCoordinator when a successful update runs.
+        device = self.coordinator.get_device_by_key(self.key)
+        # A missing value makes the entity unavailable, until it is back.
+        self._present = device is not None
+        if device is not None:
+            self.froelingDevice = device
+        # Only write the state if the value changed or the entity became (un)available.
+        available = self.available
+        if self.key not in self.coordinator.changed_keys and available == self._last_available:
+            self.coordinator.state_writes_skipped += 1
+            return
+        self._last_available = available
+        self._resolve_attributes()
+        self.coordinator.state_writes += 1
+        _LOGGER.debug("Device: %s", self.froelingDevice.key)
+        self.async_write_ha_state()
+
+
+class FroelingPelletForecastSensor(CoordinatorEntity, SensorEntity):
+    """Pellet consumption rate or refill date of a feed system, derived from its forecast."""
+
+    def __init__(
+            self,
+            coordinator: FroelingDataCoordinator,
+            feedSystem: FroelingDevice,
+            key: str,
+            name: str,
+            value: Callable[[PelletForecast], float | datetime | None],
+    ) -> None:
+        """Initialise sensor."""
+        super().__init__(coordinator)
+        self.componentId = feedSystem.device.key
+        self._value = value
+        self._attr_name = name
+        self._attr_unique_id = f"{DOMAIN}-{feedSystem.device.device_unique_id}_{key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, feedSystem.device.device_unique_id)})
+        self._last = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state if the forecast or the availability changed."""
+        current = (self.native_value, self.available)
+        if current != self._last:
+            self._last = current
+            self.async_write_ha_state()
 
     @property
-    def name(self) -> str:
-        """Return the name of the sensor."""
-        return self.froelingDevice.device.displayName
+    def native_value(self) -> float | datetime | None:
+        """Return the forecast value."""
+        forecast = self.coordinator.forecasts.get(self.componentId)
+        return None if forecast is None else self._value(forecast)
 
     @property
-    def native_value(self) -> int | float | str:
-        """Return the state of the entity."""
-        # Using native value and native unit of measurement, allows you to change units
-        # in Lovelace and HA will automatically calculate the correct value.
-        if self.froelingDevice.device.type == DeviceType.PELLET_SENSOR:
-            return float(self.froelingDevice.device.state) * 1000
-        return self.froelingDevice.device.state
+    def extra_state_attributes(self):
+        """Return the samples the forecast is based on."""
+        forecast = self.coordinator.forecasts.get(self.componentId)
+        return {"samples": 0 if forecast is None else len(forecast)}
+
+
+class FroelingPelletRateSensor(FroelingPelletForecastSensor):
+    """Pellet consumption in kg per hour or per day."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-line"
+
+    def __init__(
+            self, coordinator: FroelingDataCoordinator, feedSystem: FroelingDevice, key: str, name: str, hours: int
+    ) -> None:
+        """Initialise sensor."""
+        super().__init__(
+            coordinator, feedSystem, key, name,
+            lambda forecast: None if forecast.rate is None else round(forecast.rate * hours, 2),
+        )
+        self._attr_native_unit_of_measurement = f"{UnitOfMass.KILOGRAMS}/{'h' if hours == 1 else 'd'}"
+
+
+class FroelingRefillSensor(FroelingPelletForecastSensor):
+    """Date at which the pellets run out at the current consumption rate."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:calendar-alert"
+
+    def __init__(self, coordinator: FroelingDataCoordinator, feedSystem: FroelingDevice) -> None:
+        """Initialise sensor."""
+        super().__init__(coordinator, feedSystem, "refill_date", "Estimated refill date", self._refill_date)
+
+    @staticmethod
+    def _refill_date(forecast: PelletForecast) -> datetime | None:
+        if forecast.refill_time is None:
+            return None
+        # Minutes are noise in a forecast of days and would write the state on every sample.
+        return dt_util.utc_from_timestamp(forecast.refill_time).replace(minute=0, second=0, microsecond=0)
+
+
+def forecast_sensors(coordinator: FroelingDataCoordinator, feedSystem: FroelingDevice) -> list[SensorEntity]:
+    """Return the forecast sensors of a feed system."""
+    return [
+        FroelingPelletRateSensor(coordinator, feedSystem, "pellet_rate_hour", "Pellet consumption per hour", 1),
+        FroelingPelletRateSensor(coordinator, feedSystem, "pellet_rate_day", "Pellet consumption per day", 24),
+        FroelingRefillSensor(coordinator, feedSystem),
+    ]
+
+
+def facility_device_info(coordinator: FroelingDataCoordinator) -> DeviceInfo:
+    """Return the device of the facility, holding the diagnostic sensors."""
+    return DeviceInfo(
+        name=f"Froeling {coordinator.facilityId}",
+        manufacturer="Froeling",
+        identifiers={(DOMAIN, controller_name(coordinator.facilityId))},
+    )
+
+
+class FroelingDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor of the facility, computed from the coordinator."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+            self,
+            coordinator: FroelingDataCoordinator,
+            key: str,
+            name: str,
+            value: Callable[[FroelingDataCoordinator], float | int | None],
+            enabled: bool = True,
+    ) -> None:
+        """Initialise sensor."""
+        super().__init__(coordinator)
+        self._value = value
+        self._attr_name = name
+        self._attr_unique_id = f"{DOMAIN}-{controller_name(coordinator.facilityId)}_{key}"
+        self._attr_device_info = facility_device_info(coordinator)
+        self._attr_entity_registry_enabled_default = enabled
+        self._last = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state if the value, its attributes or the availability changed."""
+        current = (self.native_value, self.extra_state_attributes, self.available)
+        if current != self._last:
+            self._last = current
+            self.async_write_ha_state()
 
     @property
-    def native_unit_of_measurement(self) -> str | None:
-        """Return unit of temperature."""
-        if self.froelingDevice.device.type == DeviceType.TEMP_SENSOR:
-            return UnitOfTemperature.CELSIUS
-        if self.froelingDevice.device.type == DeviceType.PELLET_SENSOR:
-            return UnitOfMass.KILOGRAMS
-        if self.froelingDevice.device.type == DeviceType.PERCENTAGE:
-            return PERCENTAGE
-        return None
+    def native_value(self) -> float | int | None:
+        """Return the value."""
+        return self._value(self.coordinator)
+
+
+class FroelingPollIntervalSensor(FroelingDiagnosticSensor):
+    """Current adaptive poll interval and why it was chosen."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    def __init__(self, coordinator: FroelingDataCoordinator) -> None:
+        """Initialise sensor."""
+        super().__init__(
+            coordinator, "poll_interval", "Poll interval", lambda coordinator: coordinator.scheduler.interval
+        )
 
     @property
-    def unique_id(self) -> str:
-        """Return unique id."""
-        # All entities must have a unique id.  Think carefully what you want this to be as
-        # changing it later will cause HA to create new entities.
-        return f"{DOMAIN}-{self.froelingDevice.device.device_unique_id}"
+    def extra_state_attributes(self):
+        """Return why the interval was chosen."""
+        return {"reason": self.coordinator.scheduler.reason}
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class FroelingPollDurationSensor(FroelingDiagnosticSensor):
+    """Duration of the last poll, with the duration of every phase."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: FroelingDataCoordinator) -> None:
+        """Initialise sensor."""
+        super().__init__(
+            coordinator, "poll_duration", "Poll duration",
+            lambda coordinator: _milliseconds(coordinator.metrics.last('total')),
+            enabled=False,
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the duration of every phase of the last poll in milliseconds."""
+        return {
+            phase: _milliseconds(self.coordinator.metrics.last(phase))
+            for phase in PHASES
+            if phase != 'total'
+        }
+
+
+class FroelingCounterSensor(FroelingDiagnosticSensor):
+    """Counter of the poll metrics."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator: FroelingDataCoordinator, key: str, name: str) -> None:
+        """Initialise sensor."""
+        super().__init__(
+            coordinator, key, name, lambda coordinator: getattr(coordinator.metrics, key), enabled=False
+        )
 
     @property
-    def state_class(self) -> str | None:
-        """Return state class."""
-        if self.froelingDevice.device.type == DeviceType.TEMP_SENSOR:
-            return SensorStateClass.MEASUREMENT
-        if self.froelingDevice.device.type == DeviceType.PELLET_SENSOR:
-            return SensorStateClass.TOTAL
+    def extra_state_attributes(self):
+        """Return no attributes."""
         return None
 
+
+class FroelingDataAgeSensor(FroelingDiagnosticSensor):
+    """Seconds since the last successful poll, counting up while the last good values are served."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    def __init__(self, coordinator: FroelingDataCoordinator) -> None:
+        """Initialise sensor."""
+        super().__init__(
+            coordinator, "data_age", "Data age",
+            lambda coordinator: None if coordinator.data_age is None else round(coordinator.data_age),
+        )
+
     @property
     def extra_state_attributes(self):
-        """Return the extra state attributes."""
-        # Add any additional attributes you want on your sensor.
-        attrs = {}
-        attrs["extra_info"] = "Extra Info"
-        return attrs
+        """Return if the values are stale and the failed polls they bridged."""
+        return {
+            "stale": self.coordinator.stale,
+            "stale_polls": self.coordinator.stale_polls,
+            "flaps_prevented": self.coordinator.flaps_prevented,
+        }
+
+
+def diagnostic_sensors(coordinator: FroelingDataCoordinator) -> list[FroelingDiagnosticSensor]:
+    """Return the diagnostic sensors of a facility, the metrics are disabled by default."""
+    return [
+        FroelingPollIntervalSensor(coordinator),
+        FroelingPollDurationSensor(coordinator),
+        FroelingCounterSensor(coordinator, "bytes_total", "Bytes transferred"),
+        FroelingCounterSensor(coordinator, "logins", "Logins"),
+        FroelingCounterSensor(coordinator, "failures", "Failed polls"),
+        FroelingCounterSensor(coordinator, "entity_writes", "Entity state writes"),
+        FroelingDataAgeSensor(coordinator),
+    ]
@@ -0,0 +1,69 @@
+"""Services of the integration"""
+
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+from .history import ATTR_FILE, ATTR_UNIT, IMPORT_STATISTICS_SCHEMA, async_import_history
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_IMPORT_STATISTICS = "import_statistics"
+SERVICE_REFRESH = "refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH):
+        return
+
+    async def async_import_statistics_service(call: ServiceCall) -> ServiceResponse:
+        count = await async_import_history(
+            hass, call.data[ATTR_ENTITY_ID], call.data[ATTR_FILE], call.data[ATTR_UNIT]
+        )
+        return {"imported_hours": count}
+
+    async def async_refresh_service(call: ServiceCall) -> ServiceResponse:
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+            and entry.entry_id in call.data.get(ATTR_CONFIG_ENTRY_ID, [entry.entry_id])
+        ]
+        if not entries:
+            raise HomeAssistantError("No loaded Froeling Connect entry to refresh")
+        # The facilities of an account are fetched together by its hub.
+        refreshed = await asyncio.gather(
+            *(hass.data[DOMAIN][entry.entry_id].coordinator.async_refresh_now() for entry in entries)
+        )
+        return {entry.entry_id: done for entry, done in zip(entries, refreshed)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_STATISTICS,
+        async_import_statistics_service,
+        schema=IMPORT_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_refresh_service,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
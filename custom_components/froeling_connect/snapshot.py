@@ -0,0 +1,56 @@
+"""Last known devices of a facility, to set up the entities without waiting for the cloud"""
+
+from dataclasses import asdict
+
+from .froeling_client.froelingDevice import (
+    Boiler,
+    Buffer,
+    Circuit,
+    DeviceSensor,
+    DeviceType,
+    FeedSystem,
+    FroelingDevice,
+    OutTemp,
+)
+
+DEVICE_CLASSES = {cls.__name__: cls for cls in (OutTemp, DeviceSensor, Circuit, Boiler, Buffer, FeedSystem)}
+
+
+def dump_device(device: FroelingDevice) -> dict:
+    """Return a device as JSON serialisable dict."""
+    return {
+        'key': device.key,
+        'isParent': device.isParent,
+        'class': type(device.device).__name__,
+        'device': asdict(device.device),
+    }
+
+
+def load_device(data: dict) -> FroelingDevice:
+    """Return a device dumped with dump_device."""
+    fields = dict(data['device'])
+    fields['type'] = DeviceType(fields['type'])
+    return FroelingDevice(
+        key=data['key'], isParent=data['isParent'], device=DEVICE_CLASSES[data['class']](**fields)
+    )
+
+
+def dump_snapshot(devices: list[FroelingDevice], details: dict[str, FroelingDevice] | None = None) -> dict:
+    """Return the devices and component details of a facility for the store."""
+    return {
+        'devices': [dump_device(device) for device in devices],
+        'details': [dump_device(device) for device in (details or {}).values()],
+    }
+
+
+def load_snapshot(data: dict) -> tuple[list[FroelingDevice], list[FroelingDevice]]:
+    """Return the devices and component details of a snapshot, skipping the ones that cannot be loaded."""
+    loaded = ([], [])
+    for devices, dumped in zip(loaded, (data.get('devices', []), data.get('details', []))):
+        for device in dumped:
+            try:
+                devices.append(load_device(device))
+            except (KeyError, TypeError, ValueError):
+                # Written by another version of the integration, the first refresh replaces it.
+                continue
+    return loaded
@@ -0,0 +1,128 @@
+"""Debounced writes of changed parameters"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .const import WRITE_DEBOUNCE
+from .froeling_client.api import APIAuthError, APIConnectionError
+
+if TYPE_CHECKING:
+    from .coordinator import FroelingDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParameterWriter:
+    """Collects the changes of a component for WRITE_DEBOUNCE seconds and writes them at once.
+
+    Changes of the same parameter within that time are merged, only the last
+    value is written. When a write fails, the callbacks of its changes roll
+    back the optimistic states of their entities.
+    """
+
+    def __init__(self, coordinator: FroelingDataCoordinator, delay: float = WRITE_DEBOUNCE) -> None:
+        """Initialise."""
+        self.coordinator = coordinator
+        self.delay = delay
+        # Component id -> parameter id -> (value, rollbacks)
+        self._pending: dict[str, dict[int, tuple[str, list[Callable[[], None]]]]] = {}
+        self._debouncers: dict[str, Debouncer] = {}
+        self.requested = 0
+        self.coalesced = 0
+        self.written = 0
+        self.failed = 0
+
+    def pending(self, componentId: str, parameterId: int) -> bool:
+        """Return if a change of a parameter is waiting to be written or being written."""
+        return parameterId in self._pending.get(componentId, {})
+
+    @callback
+    def async_set(self, componentId: str, parameterId: int, value: str, rollback: Callable[[], None]) -> None:
+        """Queue the change of a parameter."""
+        self.requested += 1
+        changes = self._pending.setdefault(componentId, {})
+        rollbacks = [rollback]
+        if parameterId in changes:
+            self.coalesced += 1
+            # A new list, so a write of the previous value in progress does not remove this change.
+            rollbacks = [*changes[parameterId][1], rollback]
+        changes[parameterId] = (value, rollbacks)
+        self._debouncer(componentId).async_schedule_call()
+
+    def _debouncer(self, componentId: str) -> Debouncer:
+        debouncer = self._debouncers.get(componentId)
+        if debouncer is None:
+            debouncer = self._debouncers[componentId] = Debouncer(
+                self.coordinator.hass, _LOGGER, cooldown=self.delay, immediate=False,
+                function=partial(self._async_write, componentId),
+            )
+        return debouncer
+
+    async def _async_write(self, componentId: str) -> None:
+        """Write the changes of a component, then request a refresh to confirm them.
+
+        The debouncer drops calls while it writes, so changes made meanwhile are
+        written by the same call, after collecting them for the debounce delay.
+        """
+        written = again = False
+        while changes := self._pending.get(componentId):
+            if again:
+                await asyncio.sleep(self.delay)
+            again = True
+            written |= await self._async_write_changes(componentId, changes)
+            if not changes and self._pending.get(componentId) is changes:
+                del self._pending[componentId]
+
+        if written:
+            # Not awaited, so the debouncer is not held for a whole poll.
+            self.coordinator.hass.async_create_task(self.coordinator.async_request_refresh())
+        _LOGGER.debug(
+            "Parameter changes: %s, merged: %s, written: %s, failed: %s",
+            self.requested, self.coalesced, self.written, self.failed
+        )
+
+    async def _async_write_changes(self, componentId: str, changes: dict) -> bool:
+        """Write the changes of a component queued so far, returning if any was written."""
+        written = False
+        for parameterId, change in list(changes.items()):
+            value, rollbacks = change
+            try:
+                if self.coordinator.hub is None:
+                    raise APIConnectionError("Not connected yet")
+                await self.coordinator.hub.api.set_parameter(
+                    self.coordinator.facilityId, componentId, parameterId, value
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                self.failed += 1
+                if isinstance(err, (APIAuthError, APIConnectionError)):
+                    _LOGGER.error("Error setting parameter %s of %s to %s: %s", parameterId, componentId, value, err)
+                else:
+                    _LOGGER.exception("Unexpected error setting parameter %s of %s to %s", parameterId, componentId,
+                                      value)
+                if changes.get(parameterId) is change:
+                    # A newer value is still written, and rolls back these entities if it fails too.
+                    for rollback in rollbacks:
+                        rollback()
+            else:
+                self.written += 1
+                written = True
+            finally:
+                # Unless it was changed again while it was written.
+                if changes.get(parameterId) is change:
+                    del changes[parameterId]
+        return written
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop the changes that were not written yet."""
+        for debouncer in self._debouncers.values():
+            debouncer.async_shutdown()
+        self._pending.clear()
@@ -0,0 +1,62 @@
+"""Helpers of the tests that need Home Assistant."""
+
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import httpx
+from homeassistant.core import HomeAssistant
+
+from custom_components.froeling_connect.const import (
+    CONF_FACILITY_ID,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DATA_HTTP_CLIENT,
+)
+from custom_components.froeling_connect.coordinator import FroelingDataCoordinator
+
+from benchmarks.mock_server import MockFroelingConnect
+
+USERNAME = 'test@example.com'
+
+
+@asynccontextmanager
+async def async_test_home_assistant(server: MockFroelingConnect | None = None) -> AsyncIterator[HomeAssistant]:
+    """Yield Home Assistant in a temporary config folder, whose http client is answered by server."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        client = None
+        if server is not None:
+            client = httpx.AsyncClient(transport=server.transport())
+            future = hass.loop.create_future()
+            future.set_result(client)
+            hass.data[DATA_HTTP_CLIENT] = future
+        try:
+            yield hass
+        finally:
+            if client is not None:
+                await client.aclose()
+            await hass.async_stop(force=True)
+
+
+def mock_entry(facilityId: str, options: dict | None = None, entry_id: str = 'test') -> SimpleNamespace:
+    """Return a stand-in for the config entry of a facility."""
+    return SimpleNamespace(
+        entry_id=entry_id,
+        data={
+            CONF_USERNAME: USERNAME,
+            CONF_PASSWORD: 'secret',
+            CONF_FACILITY_ID: facilityId,
+        },
+        options=options or {},
+    )
+
+
+async def async_setup_coordinator(
+        hass: HomeAssistant, facilityId: str, options: dict | None = None
+) -> FroelingDataCoordinator:
+    """Return the coordinator of a facility, joined to the hub of its account."""
+    coordinator = FroelingDataCoordinator(hass, mock_entry(facilityId, options, entry_id=facilityId))
+    await coordinator._async_setup()
+    return coordinator
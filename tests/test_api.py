@@ -0,0 +1,132 @@
+"""Tests of the API client against the mock server."""
+
+import asyncio
+import random
+
+import httpx
+
+from froeling_client.api import API
+from froeling_client.parser import FieldFilter
+
+from benchmarks.mock_server import MockFroelingConnect
+
+
+def run(test, **kwargs):
+    """Run a test with an API of the account of a mock server."""
+    async def main():
+        server = MockFroelingConnect(components=3, churn=0, **kwargs)
+        async with httpx.AsyncClient(transport=server.transport()) as client:
+            await test(API('test@example.com', 'secret', client), server)
+
+    asyncio.run(main())
+
+
+def test_session_is_reused():
+    async def test(api, server):
+        facilityId = server.facility_ids[0]
+        await api.get_Devices(facilityId)
+        await api.get_Devices(facilityId)
+
+        assert server.logins == api.login_count == 1
+        assert api.reuse_count >= 1
+
+    run(test)
+
+
+def test_expiring_token_logs_in_again():
+    async def test(api, server):
+        facilityId = server.facility_ids[0]
+        await api.get_Devices(facilityId)
+        first = api.headers['Authorization']
+
+        await api.get_Devices(facilityId)
+        assert server.logins == 2
+        assert api.headers['Authorization'] != first
+
+    # Within TOKEN_EXPIRY_MARGIN of its expiry from the start
+    run(test, tokenLifetime=10)
+
+
+def test_rejected_token_logs_in_again_once():
+    async def test(api, server):
+        facilityId = server.facility_ids[0]
+        await api.get_Devices(facilityId)
+        server.revoke_tokens()
+
+        await asyncio.gather(api.get_Devices(facilityId), api.get_Devices(facilityId))
+        assert server.logins == 2
+        assert api.session_valid
+
+    run(test)
+
+
+def test_restored_session_skips_login():
+    async def test(api, server):
+        facilityId = server.facility_ids[0]
+        await api.get_Devices(facilityId)
+
+        restored = API('test@example.com', 'secret', api.client)
+        restored.restore_session(api.session)
+        assert restored.connected
+        await restored.get_Devices(facilityId)
+        assert server.logins == 1
+
+        expired = API('test@example.com', 'secret', api.client)
+        expired.restore_session({**api.session, 'expires': 0})
+        assert not expired.connected
+        other = API('other@example.com', 'secret', api.client)
+        other.restore_session(api.session)
+        assert 'Authorization' not in other.headers
+
+    run(test)
+
+
+def test_unchanged_overview_is_not_parsed_again():
+    async def test(api, server):
+        facilityId = server.facility_ids[0]
+        devices = await api.get_Devices(facilityId)
+
+        assert await api.get_Devices(facilityId) is devices
+        assert (api.fingerprint_hits, api.fingerprint_misses) == (1, 1)
+        assert api.models[facilityId].revision == 1
+
+        server.churn = 1.0
+        await api.get_Devices(facilityId)
+        assert api.fingerprint_misses == 2
+        assert api.models[facilityId].revision == 2
+
+    run(test)
+
+
+def test_not_modified_overview_reuses_the_devices():
+    async def test(api, server):
+        facilityId = server.facility_ids[0]
+        devices = await api.get_Devices(facilityId)
+
+        assert await api.get_Devices(facilityId) is devices
+        assert api.fingerprint_hits == 1
+        assert api.timings[facilityId]['bytes'] == 0
+
+        # A changed filter parses the next overview, without a conditional request.
+        api.set_filter(facilityId, FieldFilter())
+        await api.get_Devices(facilityId)
+        assert api.fingerprint_misses == 2
+        assert api.models[facilityId].revision == 2
+
+    run(test, etags=True)
+
+
+def test_changed_values_miss_the_fingerprint():
+    async def test(api, server):
+        facilityId = server.facility_ids[0]
+        await api.get_Devices(facilityId)
+        component = server.overviews[facilityId]['components'][0]
+        name = next(name for name, value in component.items() if isinstance(value, dict) and 'unit' in value)
+        component[name]['value'] = str(random.Random(1).uniform(100, 200))
+
+        devices = await api.get_Devices(facilityId)
+        assert api.fingerprint_misses == 2
+        assert api.models[facilityId].sensor(component['componentId'], name).device.state == component[name]['value']
+        assert devices is api.models[facilityId].devices
+
+    run(test, etags=True)
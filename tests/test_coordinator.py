@@ -0,0 +1,110 @@
+"""Tests of the refreshes of the coordinator."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from benchmarks.mock_server import MockFroelingConnect  # noqa: E402
+
+from .common import async_setup_coordinator, async_test_home_assistant  # noqa: E402
+
+
+def run(test):
+    """Run a test with a coordinator of a facility of the mock server, whose responses take 50 ms."""
+    async def main():
+        server = MockFroelingConnect(components=5, churn=0, latency=0.05)
+        async with async_test_home_assistant(server) as hass:
+            await test(await async_setup_coordinator(hass, server.facility_ids[0]), server)
+
+    asyncio.run(main())
+
+
+def test_concurrent_refreshes_share_one_fetch():
+    async def test(coordinator, server):
+        requests = server.overview_requests
+        await asyncio.gather(*(coordinator.async_refresh() for _ in range(3)))
+
+        assert server.overview_requests == requests + 1
+        assert coordinator.coalesced_refreshes == 2
+        assert coordinator.last_update_success
+        assert coordinator.data.devices
+
+    run(test)
+
+
+def test_requested_refreshes_are_spaced():
+    async def test(coordinator, server):
+        assert await coordinator.async_refresh_now()
+        requests = server.overview_requests
+
+        assert not await coordinator.async_refresh_now()
+        assert coordinator.throttled_refreshes == 1
+        assert server.overview_requests == requests
+
+    run(test)
+
+
+def test_scheduled_polls_do_not_throttle_requests():
+    async def test(coordinator, server):
+        await coordinator.async_refresh()
+        requests = server.overview_requests
+
+        assert await coordinator.async_refresh_now()
+        assert coordinator.throttled_refreshes == 0
+        assert server.overview_requests == requests + 1
+
+    run(test)
+
+
+def test_options_change_refreshes_after_a_request():
+    async def test(coordinator, server):
+        assert await coordinator.async_refresh_now()
+        requests = server.overview_requests
+
+        await coordinator.async_refresh_changed()
+        assert server.overview_requests == requests + 1
+        assert coordinator.throttled_refreshes == 0
+
+    run(test)
+
+
+def test_options_change_waits_for_the_refresh_in_progress():
+    async def test(coordinator, server):
+        requests = server.overview_requests
+        refresh = asyncio.ensure_future(coordinator.async_refresh())
+        await asyncio.sleep(0)
+
+        await coordinator.async_refresh_changed()
+        await refresh
+        assert server.overview_requests == requests + 2
+        assert coordinator.coalesced_refreshes == 0
+
+    run(test)
+
+
+def test_devices_are_indexed_once_per_refresh():
+    async def test(coordinator, server):
+        await coordinator.async_refresh()
+        devices = coordinator.data.devices
+        parents = [device for device in devices if device.isParent]
+        sensors = [device for device in devices if not device.isParent]
+        assert parents and sensors
+
+        assert all(coordinator.get_device_by_key(device.key) is device for device in devices)
+        # Values of the same name in several components share a unique id, the last one is found.
+        assert all(
+            coordinator.get_device_by_unique_id(device.device.device_unique_id).device.device_unique_id
+            == device.device.device_unique_id for device in devices
+        )
+        assert all(coordinator.get_device_by_unique_id(parent.device.device_unique_id) is parent for parent in parents)
+        children = [
+            child for parentIdentifier in {sensor.device.parentIdentifier for sensor in sensors}
+            for child in coordinator.get_devices_by_parent(parentIdentifier)
+        ]
+        assert sorted(child.key for child in children) == sorted(sensor.key for sensor in sensors)
+        assert coordinator.get_device_by_key('missing') is None
+        assert coordinator.get_devices_by_parent(('missing',)) == []
+
+    run(test)
@@ -0,0 +1,77 @@
+"""Tests of the lazily fetched component details."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.const import CONF_COMPONENT_DETAILS, CONF_DISCOVER  # noqa: E402
+from custom_components.froeling_connect.coordinator import FroelingDataCoordinator  # noqa: E402
+
+from benchmarks.mock_server import MockFroelingConnect  # noqa: E402
+
+from .common import async_setup_coordinator, async_test_home_assistant, mock_entry  # noqa: E402
+
+COMPONENTS = 5
+
+
+def run(test, options):
+    """Run a test with a coordinator of a facility with component details."""
+    async def main():
+        server = MockFroelingConnect(components=COMPONENTS, churn=0)
+        async with async_test_home_assistant(server) as hass:
+            coordinator = await async_setup_coordinator(
+                hass, server.facility_ids[0], {CONF_COMPONENT_DETAILS: True, **options}
+            )
+            await test(hass, coordinator, server)
+
+    asyncio.run(main())
+
+
+def test_details_without_discovery_are_not_fetched():
+    async def test(hass, coordinator, server):
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+        assert server.component_requests == 0
+        assert not coordinator.details.devices
+
+    run(test, {})
+
+
+def test_discovery_fetches_every_component_once():
+    async def test(hass, coordinator, server):
+        await coordinator.async_refresh()
+        assert server.component_requests == COMPONENTS
+        assert coordinator.details.devices
+
+        # Nothing is enabled, nothing is fetched again.
+        coordinator.details.interval = 0
+        await coordinator.async_refresh()
+        assert server.component_requests == COMPONENTS
+
+        key = next(iter(coordinator.details.devices))
+        coordinator.details.enabled.add(key)
+        await coordinator.async_refresh()
+        assert server.component_requests == COMPONENTS + 1
+
+    run(test, {CONF_DISCOVER: True})
+
+
+def test_restored_details_are_not_discovered_again():
+    async def test(hass, coordinator, server):
+        await coordinator.async_refresh()
+        await coordinator._snapshot_store.async_save(coordinator._snapshot_data())
+        await coordinator.async_shutdown()
+
+        restored = FroelingDataCoordinator(hass, mock_entry(
+            coordinator.facilityId, {CONF_COMPONENT_DETAILS: True, CONF_DISCOVER: True},
+            entry_id=coordinator.facilityId,
+        ))
+        assert await restored.async_load_snapshot()
+        assert restored.details.devices.keys() == coordinator.details.devices.keys()
+        await restored.async_refresh()
+        assert server.component_requests == COMPONENTS
+
+    run(test, {CONF_DISCOVER: True})
@@ -0,0 +1,54 @@
+"""Tests of the poll metrics and the diagnostics."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.const import DOMAIN  # noqa: E402
+from custom_components.froeling_connect.diagnostics import async_get_config_entry_diagnostics  # noqa: E402
+from custom_components.froeling_connect.metrics import RollingHistogram  # noqa: E402
+
+from benchmarks.mock_server import MockFroelingConnect  # noqa: E402
+
+from .common import USERNAME, async_setup_coordinator, async_test_home_assistant, mock_entry  # noqa: E402
+
+
+def test_histogram_keeps_a_window():
+    histogram = RollingHistogram(size=10)
+    assert histogram.summary() == {'count': 0}
+    for value in range(20):
+        histogram.add(float(value))
+
+    summary = histogram.summary()
+    assert summary['count'] == 20
+    assert summary['last'] == summary['max'] == 19.0
+    assert summary['mean'] == 14.5
+    assert summary['p50'] == 15.0
+
+
+def test_diagnostics_record_the_polls_without_credentials():
+    async def main():
+        server = MockFroelingConnect(components=3, churn=0)
+        async with async_test_home_assistant(server) as hass:
+            facilityId = server.facility_ids[0]
+            coordinator = await async_setup_coordinator(hass, facilityId)
+            await coordinator.async_refresh()
+            await coordinator.async_refresh()
+            entry = mock_entry(facilityId, entry_id=facilityId)
+            entry.as_dict = lambda: {'entry_id': entry.entry_id, 'data': entry.data, 'options': entry.options}
+            hass.data[DOMAIN] = {entry.entry_id: SimpleNamespace(coordinator=coordinator)}
+
+            diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+        assert diagnostics['poll_metrics']['polls'] == 2
+        assert diagnostics['poll_metrics']['seconds']['total']['count'] == 2
+        assert diagnostics['api']['logins'] == 1
+        assert diagnostics['api']['unchanged_overviews'] == 1
+        assert diagnostics['devices'] == len(coordinator.data.devices)
+        assert USERNAME not in str(diagnostics)
+        assert 'secret' not in str(diagnostics)
+
+    asyncio.run(main())
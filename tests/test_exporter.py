@@ -0,0 +1,84 @@
+"""Tests of the Prometheus exporter and its command."""
+
+import asyncio
+
+import httpx
+
+from froeling_client.cli import build_parser
+from froeling_client.exporter import FroelingExporter
+
+from benchmarks.mock_server import MockFroelingConnect
+
+ACCOUNT = {'username': 'test@example.com', 'password': 'secret'}
+
+
+def run(test, facilities=2):
+    """Run a test with an exporter of all facilities of the account of a mock server."""
+    async def main():
+        server = MockFroelingConnect(facilities, components=3, churn=0)
+        async with httpx.AsyncClient(transport=server.transport()) as client:
+            await test(FroelingExporter([ACCOUNT], client), server)
+
+    asyncio.run(main())
+
+
+def test_export_listens_on_localhost_by_default():
+    assert build_parser().parse_args(['export']).host == '127.0.0.1'
+
+
+def test_values_of_all_facilities_are_rendered():
+    async def test(exporter, server):
+        await exporter.async_refresh()
+        text = exporter.text.decode()
+
+        for facilityId in server.facility_ids:
+            assert f'froeling_up{{facility="{facilityId}"}} 1' in text
+            assert f'froeling_value{{facility="{facilityId}",' in text
+        assert text.count('# TYPE froeling_value gauge') == 1
+        assert server.logins == 1
+
+    run(test)
+
+
+def test_failed_facility_keeps_its_last_values():
+    async def test(exporter, server):
+        await exporter.async_refresh()
+        failed, other = server.facility_ids
+        lines = exporter.facilities[failed].lines
+        server.overviews.pop(failed)
+        await exporter.async_refresh()
+        text = exporter.text.decode()
+
+        assert f'froeling_up{{facility="{failed}"}} 0' in text
+        assert f'froeling_up{{facility="{other}"}} 1' in text
+        assert exporter.facilities[failed].lines == lines
+        assert all(line in text for line in lines)
+
+    run(test)
+
+
+def test_scrapes_are_served_from_the_last_refresh():
+    async def test(exporter, server):
+        await exporter.async_refresh()
+        requests = server.overview_requests
+        metrics = await exporter.async_serve('127.0.0.1', 0)
+        port = metrics.sockets[0].getsockname()[1]
+
+        async def get(path: str) -> bytes:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            response = await reader.read()
+            writer.close()
+            return response
+
+        async with metrics:
+            responses = [await get('/metrics') for _ in range(3)]
+            missing = await get('/')
+
+        assert all(response.startswith(b'HTTP/1.1 200 OK') for response in responses)
+        assert all(response.endswith(exporter.text) for response in responses)
+        assert missing.startswith(b'HTTP/1.1 404')
+        assert exporter.scrapes == 3
+        assert server.overview_requests == requests
+
+    run(test)
@@ -0,0 +1,33 @@
+"""Tests of the fleet poller."""
+
+import asyncio
+
+import httpx
+
+from froeling_client.fleet import FleetPoller
+from froeling_client.tsdb import TimeSeriesReader, TimeSeriesWriter
+
+from benchmarks.mock_server import MockFroelingConnect
+
+ACCOUNT = {'username': 'test@example.com', 'password': 'secret'}
+
+
+def test_polls_reuse_the_session_once(tmp_path):
+    async def main():
+        server = MockFroelingConnect(facilities=2, components=3, churn=0)
+        writer = TimeSeriesWriter(str(tmp_path))
+        async with httpx.AsyncClient(transport=server.transport()) as client:
+            poller = FleetPoller([ACCOUNT], client, writer, interval=0, rate_limit=None, seed=0)
+            await poller.async_start()
+            [(api, _)] = poller.accounts
+            reused = api.reuse_count
+            for facilityId in server.facility_ids:
+                assert await poller.async_poll(api, facilityId)
+        writer.flush()
+
+        assert api.reuse_count == reused + 2
+        assert server.logins == 1
+        assert poller.failures == 0
+        assert {found.facility for found in TimeSeriesReader(str(tmp_path)).find().values()} == set(server.facility_ids)
+
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Tests of the pellet forecast."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.forecast import PelletForecast, to_kilograms  # noqa: E402
+
+START = 1_700_000_000.0
+
+
+def consume(forecast: PelletForecast, hours: int, rate: float, remaining: float | None = None) -> None:
+    """Add hourly samples of a constant consumption rate in kg/h."""
+    for hour in range(hours):
+        forecast.add(START + hour * 3600, hour * rate, remaining)
+
+
+def test_to_kilograms():
+    assert to_kilograms('1.5', 't') == 1500.0
+    assert to_kilograms(20, 'kg') == 20.0
+    assert to_kilograms('unknown', 't') is None
+    assert to_kilograms('1', '%') is None
+
+
+def test_rate_and_refill_time():
+    forecast = PelletForecast(capacity=24, sample_interval=60)
+    assert forecast.rate is None
+    consume(forecast, 10, 2.0, remaining=100.0)
+
+    assert forecast.rate == pytest.approx(2.0)
+    assert forecast.refill_time == pytest.approx(START + 9 * 3600 + 50 * 3600)
+
+
+def test_close_samples_are_dropped():
+    forecast = PelletForecast(capacity=24, sample_interval=900)
+    assert forecast.add(START, 0.0)
+    assert not forecast.add(START + 60, 1.0)
+    assert len(forecast) == 1
+
+
+def test_counter_reset_clears_samples():
+    forecast = PelletForecast(capacity=24, sample_interval=60)
+    consume(forecast, 5, 2.0)
+    assert forecast.add(START + 5 * 3600, 1.0)
+    assert forecast.samples() == [(START + 5 * 3600, 1.0)]
+    assert forecast.rate is None
+
+
+def test_ring_buffer_keeps_recent_rate():
+    forecast = PelletForecast(capacity=8, sample_interval=60)
+    consume(forecast, 20, 1.0)
+    for hour in range(20, 40):
+        forecast.add(START + hour * 3600, 20 + (hour - 20) * 3.0)
+
+    assert len(forecast) == 8
+    assert forecast.samples()[0][0] == START + 32 * 3600
+    assert forecast.rate == pytest.approx(3.0)
+
+
+def test_restore():
+    forecast = PelletForecast(capacity=24, sample_interval=60)
+    consume(forecast, 6, 1.5, remaining=30.0)
+
+    restored = PelletForecast(capacity=4, sample_interval=60)
+    restored.restore(forecast.as_dict())
+    assert restored.samples() == forecast.samples()[-4:]
+    assert restored.remaining == 30.0
+    assert restored.rate == pytest.approx(1.5)
@@ -0,0 +1,39 @@
+"""Tests of reading a consumption history for the statistics import."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.history import read_history  # noqa: E402
+
+
+def test_csv_keeps_the_last_value_of_every_hour(tmp_path):
+    path = tmp_path / "consumption.csv"
+    path.write_text(
+        "time,value\n"
+        "2024-01-01T10:45:00+00:00,1.25\n"
+        "2024-01-01T10:15:00+00:00,1.0\n"
+        "2024-01-01T09:30:00+00:00,0.5\n"
+        "not a time,2\n"
+        "2024-01-01T11:00:00+00:00,none\n",
+        encoding="utf-8",
+    )
+
+    assert read_history(str(path), 't') == {
+        datetime(2024, 1, 1, 9, tzinfo=timezone.utc): 500.0,
+        datetime(2024, 1, 1, 10, tzinfo=timezone.utc): 1250.0,
+    }
+
+
+def test_json_times_are_converted_to_utc(tmp_path):
+    path = tmp_path / "consumption.json"
+    path.write_text(json.dumps([
+        {"time": "2024-01-01T12:10:00+01:00", "value": 20},
+        {"time": "2024-01-01T12:40:00+01:00", "value": 25},
+    ]), encoding="utf-8")
+
+    hours = read_history(str(path), 'kg')
+    assert hours == {datetime(2024, 1, 1, 11, tzinfo=timezone.utc): 25.0}
@@ -0,0 +1,24 @@
+"""Tests of the HTTP client shared by the config entries."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.http_client import async_get_http_client  # noqa: E402
+
+from .common import async_test_home_assistant  # noqa: E402
+
+
+def test_entries_share_one_client_closed_with_home_assistant():
+    async def main():
+        async with async_test_home_assistant() as hass:
+            clients = await asyncio.gather(*(async_get_http_client(hass) for _ in range(3)))
+            client = clients[0]
+            assert all(other is client for other in clients)
+            assert await async_get_http_client(hass) is client
+            assert not client.is_closed
+        return client
+
+    assert asyncio.run(main()).is_closed
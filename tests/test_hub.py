@@ -0,0 +1,83 @@
+"""Tests of the fan-out of the account hub."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+from benchmarks.mock_server import MockFroelingConnect  # noqa: E402
+
+from .common import async_setup_coordinator, async_test_home_assistant  # noqa: E402
+
+
+def run(test):
+    """Run a test with the coordinators of two facilities of one account."""
+    async def main():
+        server = MockFroelingConnect(facilities=2, components=3, churn=0)
+        async with async_test_home_assistant(server) as hass:
+            first, second = [await async_setup_coordinator(hass, facilityId) for facilityId in server.facility_ids]
+            assert first.hub is second.hub
+            await test(hass, first, second, server)
+
+    asyncio.run(main())
+
+
+def test_due_facilities_are_refreshed_with_the_fan_out():
+    async def test(hass, first, second, server):
+        await first.async_refresh()
+        await hass.async_block_till_done()
+
+        assert server.overview_requests == 2
+        assert server.logins == 1
+        assert second.last_update_success
+        assert second.data.devices
+
+        # Neither is due again, only the requesting facility is fetched.
+        await first.async_refresh()
+        await hass.async_block_till_done()
+        assert server.overview_requests == 3
+
+    run(test)
+
+
+def test_fan_out_failure_fails_the_other_refresh():
+    async def test(hass, first, second, server):
+        overview = server.overviews.pop(second.facilityId)
+        await first.async_refresh()
+        await hass.async_block_till_done()
+
+        assert first.last_update_success
+        assert not second.last_update_success
+        assert isinstance(second.last_exception, UpdateFailed)
+        assert second.metrics.failures == 1
+
+        # Fetched again with the next fan-out, as it is still due.
+        server.overviews[second.facilityId] = overview
+        await first.async_refresh()
+        await hass.async_block_till_done()
+        assert second.last_update_success
+
+    run(test)
+
+
+def test_fan_out_failure_serves_stale_devices():
+    async def test(hass, first, second, server):
+        await first.async_refresh()
+        await hass.async_block_till_done()
+        devices = second.data.devices
+
+        server.overviews.pop(second.facilityId)
+        # Due again
+        second.last_success -= second.scheduler.interval
+        await first.async_refresh()
+        await hass.async_block_till_done()
+
+        assert second.last_update_success
+        assert second.stale
+        assert second.stale_polls == 1
+        assert second.data.devices is devices
+
+    run(test)
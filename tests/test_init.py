@@ -0,0 +1,33 @@
+"""Tests of the setup and removal of config entries."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect import async_remove_entry  # noqa: E402
+from custom_components.froeling_connect.hub import session_store  # noqa: E402
+
+from .common import USERNAME, async_test_home_assistant, mock_entry  # noqa: E402
+
+
+def test_session_is_removed_with_the_last_entry_of_the_account():
+    async def main():
+        async with async_test_home_assistant() as hass:
+            first, second = mock_entry('100000', entry_id='first'), mock_entry('100001', entry_id='second')
+            # The username of the second differs in case only, so both share the store.
+            second.data['username'] = USERNAME.upper()
+            entries = [first, second]
+            hass.config_entries = SimpleNamespace(async_entries=lambda domain: list(entries))
+            await session_store(hass, USERNAME).async_save({'username': USERNAME})
+
+            await async_remove_entry(hass, first)
+            entries.remove(first)
+            assert await session_store(hass, USERNAME).async_load() is not None
+
+            await async_remove_entry(hass, second)
+            assert await session_store(hass, USERNAME).async_load() is None
+
+    asyncio.run(main())
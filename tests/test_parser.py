@@ -0,0 +1,156 @@
+"""Tests of the overview parser."""
+
+import copy
+import random
+
+import pytest
+
+from froeling_client.parser import COMPONENT_SPECS, DeviceModel, parse_devices, parse_number
+
+from benchmarks.synthetic import COMPONENTS, make_overview, mutate
+
+
+def unit_values(component: dict) -> list[str]:
+    """Return the names of the numeric values of a component."""
+    return [name for name, value in component.items() if isinstance(value, dict) and 'unit' in value]
+
+
+def test_synthetic_components_match_the_parser():
+    assert COMPONENTS == {componentType: spec.entities for componentType, spec in COMPONENT_SPECS.items()}
+    assert list(COMPONENTS) == list(COMPONENT_SPECS)
+
+
+def test_unchanged_overview_keeps_devices():
+    overview = make_overview(10)
+    model = DeviceModel('ctrl')
+    devices = model.update(overview)
+    objects = [device.device for device in devices]
+
+    assert model.update(copy.deepcopy(overview)) is devices
+    assert [device.device for device in devices] == objects
+    assert model.revision == 2
+
+
+def test_changed_values_are_patched_in_place():
+    overview = make_overview(10)
+    model = DeviceModel('ctrl')
+    devices = model.update(overview)
+    component = overview['components'][0]
+    name = unit_values(component)[0]
+    sensor = model.sensor(component['componentId'], name)
+
+    mutate(overview, 1.0, random.Random(1))
+    component[name]['value'] = '42.5'
+
+    assert model.update(overview) is devices
+    assert model.sensor(component['componentId'], name) is sensor
+    assert sensor.device.state == '42.5'
+    assert sensor.device.native_value == 42.5
+
+
+def test_added_and_removed_components():
+    overview = make_overview(10)
+    model = DeviceModel('ctrl')
+    devices = model.update(overview)
+    removed = overview['components'].pop()
+
+    shrunk = model.update(overview)
+    assert shrunk is not devices
+    assert removed['componentId'] not in model.components
+    assert all(model.sensor(removed['componentId'], name) is None for name in unit_values(removed))
+    assert len(shrunk) < len(devices)
+
+    overview['components'].append(removed)
+    grown = model.update(overview)
+    assert grown is not shrunk
+    assert removed['componentId'] in model.components
+    assert len(grown) == len(devices)
+
+
+def test_parse_devices_matches_model():
+    overview = make_overview(25)
+    assert [device.key for device in parse_devices('ctrl', overview)] == [
+        device.key for device in DeviceModel('ctrl').update(overview)
+    ]
+
+
+# Values as the overview sends them, some with a display value in the locale of the account
+OVERVIEW = {
+    'outTemp': {'value': '-2,5', 'unit': '°C', 'displayName': 'Außentemperatur'},
+    'components': [
+        {
+            'componentId': '1_100', 'componentNumber': 1, 'displayName': 'Kessel', 'type': 'BOILER',
+            'state': {'displayValue': 'Heizen'},
+            'boilerTemp': {'id': 1, 'name': 'boilerTemp', 'displayName': 'Kesseltemperatur', 'value': '68',
+                           'unit': '°C'},
+            'mode2': {'id': 2, 'name': 'mode2', 'displayName': 'Betriebsart', 'value': '1', 'displayValue': 'Heizen'},
+            'ignitionWhenBufferTempBelow': {'id': 3, 'name': 'ignitionWhenBufferTempBelow', 'value': '45.5',
+                                            'displayValue': '45,5 °C', 'unit': '°C'},
+        },
+        {
+            'componentId': '2_200', 'componentNumber': 1, 'displayName': 'Puffer', 'type': 'BUFFER_TANK',
+            'active': True,
+            'bufferPumpControl': {'id': 4, 'name': 'bufferPumpControl', 'value': '0', 'unit': '%'},
+            'bufferTankCharge': {'id': 5, 'name': 'bufferTankCharge', 'value': '87', 'displayValue': '87 %',
+                                 'unit': '%'},
+            'bufferTempBottom': {'id': 6, 'name': 'bufferTempBottom', 'value': '---', 'unit': '°C'},
+            'bufferTempTop': {'id': 7, 'name': 'bufferTempTop', 'value': '71.0', 'unit': '°C'},
+        },
+        {
+            'componentId': '3_300', 'componentNumber': 1, 'displayName': 'Austragung', 'type': 'FEED_SYSTEM',
+            'pelletsUsageCounter': {'id': 8, 'name': 'pelletsUsageCounter', 'value': '1,2', 'unit': 't'},
+            'remainingPelletsAmount': {'id': 9, 'name': 'remainingPelletsAmount', 'value': '2.35', 'unit': 't'},
+            'totalPelletConsumption': {'id': 10, 'name': 'totalPelletConsumption', 'value': '12.345,6',
+                                       'displayValue': '12.345,6 kg', 'unit': 'kg'},
+        },
+    ],
+}
+
+
+@pytest.mark.parametrize(('state', 'number'), [
+    ('68', 68.0), ('-2,5', -2.5), ('45,5 °C', 45.5), ('87 %', 87.0), ('12.345,6 kg', 12345.6), (21, 21.0),
+])
+def test_parse_number(state, number):
+    assert parse_number(state) == number
+
+
+@pytest.mark.parametrize('state', ['---', 'Heizen', '12:30', '', None, True])
+def test_parse_number_rejects_other_states(state):
+    with pytest.raises(ValueError):
+        parse_number(state)
+
+
+def test_ingest_converts_states_to_native_values():
+    model = DeviceModel('ctrl')
+    model.update(copy.deepcopy(OVERVIEW))
+
+    def native(componentId, entity):
+        device = model.sensor(componentId, entity).device
+        return device.native_value, device.invalid
+
+    assert native('1_100', 'boilerTemp') == (68.0, None)
+    assert native('1_100', 'ignitionWhenBufferTempBelow') == (45.5, None)
+    assert native('1_100', 'mode2') == ('Heizen', None)
+    assert native('2_200', 'bufferTankCharge') == (87.0, None)
+    assert native('2_200', 'bufferTempTop') == (71.0, None)
+    assert native('2_200', 'bufferTempBottom') == (None, '---')
+    # Tonnes become kilograms.
+    assert native('3_300', 'pelletsUsageCounter') == (1200.0, None)
+    assert native('3_300', 'remainingPelletsAmount') == (2350.0, None)
+    assert native('3_300', 'totalPelletConsumption') == (12345.6, None)
+    assert model.components['3_300'].device.native_value == 2350.0
+
+
+def test_ingest_runs_again_when_the_state_changes():
+    overview = copy.deepcopy(OVERVIEW)
+    model = DeviceModel('ctrl')
+    model.update(overview)
+    device = model.sensor('2_200', 'bufferTempBottom').device
+
+    overview['components'][1]['bufferTempBottom']['value'] = '38,5'
+    model.update(overview)
+    assert (device.native_value, device.invalid) == (38.5, None)
+
+    overview['components'][1]['bufferTempBottom']['value'] = 'Fehler'
+    model.update(overview)
+    assert (device.native_value, device.invalid) == (None, 'Fehler')
@@ -0,0 +1,81 @@
+"""Tests of the circuit breaker."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from froeling_client.api import API, APIConnectionError
+from froeling_client.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+from benchmarks.mock_server import MockFroelingConnect
+
+
+def opened(reset_timeout: float = 0.0) -> CircuitBreaker:
+    """Return a breaker opened by a failure."""
+    breaker = CircuitBreaker(1, reset_timeout)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_open_circuit_rejects_calls():
+    breaker = opened(reset_timeout=60)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.rejected_count == 1
+    assert breaker.retry_after > 0
+
+
+def test_half_open_circuit_lets_one_probe_through():
+    breaker = opened()
+    assert breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert not breaker.before_call()
+    assert not breaker.before_call()
+
+
+def test_failed_probe_opens_the_circuit_again():
+    breaker = opened(reset_timeout=60)
+    breaker._opened -= 60
+    assert breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.open_count == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_aborted_probe_lets_another_probe_through():
+    breaker = opened()
+    assert breaker.before_call()
+    breaker.record_aborted()
+    assert breaker.before_call()
+
+
+def test_concurrent_requests_while_half_open():
+    async def main():
+        server = MockFroelingConnect(components=3, churn=0, latency=0.05)
+        breaker = CircuitBreaker(1, 0)
+        async with httpx.AsyncClient(transport=server.transport()) as client:
+            api = API('test@example.com', 'secret', client, breaker=breaker)
+            facilityId = server.facility_ids[0]
+            await api.get_Devices(facilityId)
+            breaker.record_failure()
+            requests = server.overview_requests
+
+            results = await asyncio.gather(
+                *(api.get_Devices(facilityId) for _ in range(3)), return_exceptions=True
+            )
+        assert server.overview_requests == requests + 1
+        assert sum(isinstance(result, APIConnectionError) for result in results) == 2
+        assert breaker.state == CLOSED
+
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""Tests of the adaptive poll interval."""
+
+import random
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.const import ADAPTIVE_ACTIVE_HOLD  # noqa: E402
+from custom_components.froeling_connect.froeling_client.parser import DeviceModel  # noqa: E402
+from custom_components.froeling_connect.scheduler import AdaptivePollScheduler  # noqa: E402
+
+from benchmarks.synthetic import make_component  # noqa: E402
+
+
+class Boiler:
+    """Overview of a facility with one boiler, whose state and temperature can be set."""
+
+    def __init__(self) -> None:
+        self.component = make_component('BOILER', 0, random.Random(0))
+        self.component['mode2']['displayValue'] = 'Auto'
+        self.overview = {
+            'outTemp': {'value': '4.5', 'unit': '°C', 'displayName': 'Außentemperatur'},
+            'components': [self.component],
+        }
+        self.model = DeviceModel('ctrl')
+
+    def devices(self, state: str = 'Betriebsbereit', temperature: float = 60.0):
+        self.component['state']['displayValue'] = state
+        self.component['boilerTemp']['value'] = str(temperature)
+        return self.model.update(self.overview)
+
+
+def test_stable_values_back_off():
+    boiler, scheduler = Boiler(), AdaptivePollScheduler(60, 10, 600)
+    intervals = [scheduler.update(boiler.devices(), now=minute * 60.0) for minute in range(8)]
+
+    assert intervals[:4] == [90, 135, 202, 303]
+    assert intervals[-1] == 600
+    assert intervals == sorted(intervals)
+
+
+def test_changing_temperature_resets_the_interval():
+    boiler, scheduler = Boiler(), AdaptivePollScheduler(60, 10, 600)
+    for minute in range(5):
+        scheduler.update(boiler.devices(), now=minute * 60.0)
+
+    assert scheduler.update(boiler.devices(temperature=70.0), now=300.0) == 60
+
+
+def test_active_boiler_holds_the_minimum_for_a_while():
+    boiler, scheduler = Boiler(), AdaptivePollScheduler(60, 10, 600)
+    scheduler.update(boiler.devices(), now=0.0)
+
+    assert scheduler.update(boiler.devices('Zündung'), now=100.0) == 10
+    assert scheduler.update(boiler.devices('Zündung'), now=100.0 + ADAPTIVE_ACTIVE_HOLD - 1) == 10
+    # Heating for hours is polled at the configured interval.
+    assert scheduler.update(boiler.devices('Zündung'), now=100.0 + ADAPTIVE_ACTIVE_HOLD) == 60
+    assert scheduler.update(boiler.devices('Zündung'), now=3600.0) == 60
+    # A new active state follows the transition closely again.
+    assert scheduler.update(boiler.devices('Heizen'), now=3700.0) == 10
+
+
+def test_active_states_match_whole_values():
+    boiler, scheduler = Boiler(), AdaptivePollScheduler(60, 10, 600)
+    assert scheduler.update(boiler.devices(' HEIZEN '), now=0.0) == 10
+
+    scheduler = AdaptivePollScheduler(60, 10, 600)
+    assert scheduler.update(boiler.devices('Heizkreis aus'), now=0.0) == 90
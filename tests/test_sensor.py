@@ -0,0 +1,138 @@
+"""Tests of the sensors and their incremental discovery."""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import STATE_UNAVAILABLE  # noqa: E402
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+from custom_components.froeling_connect.const import CONF_DENY, CONF_DISCOVER  # noqa: E402
+from custom_components.froeling_connect.entity import async_add_new_entities  # noqa: E402
+from custom_components.froeling_connect.sensor import FroelingSensor  # noqa: E402
+
+from benchmarks.mock_server import MockFroelingConnect  # noqa: E402
+from benchmarks.synthetic import make_component, make_value  # noqa: E402
+
+from .common import async_setup_coordinator, async_test_home_assistant  # noqa: E402
+
+
+def run(test, options=None):
+    """Run a test with the sensors of a facility, added like the sensor platform does."""
+    async def main():
+        server = MockFroelingConnect(components=3, churn=0)
+        async with async_test_home_assistant(server) as hass:
+            coordinator = await async_setup_coordinator(hass, server.facility_ids[0], options)
+            await coordinator.async_refresh()
+            entry = SimpleNamespace(entry_id='test', async_on_unload=lambda unload: None)
+            sensors: dict[str, FroelingSensor] = {}
+
+            def add_entities(entities):
+                for number, sensor in enumerate(entities, len(sensors)):
+                    sensor.hass = hass
+                    sensor.entity_id = f"sensor.test_{number}"
+                    coordinator.async_add_listener(sensor._handle_coordinator_update)
+                    sensors[sensor.key] = sensor
+
+            async_add_new_entities(
+                coordinator, entry, add_entities,
+                lambda froelingDevice: [FroelingSensor(hass, coordinator, froelingDevice, entry)],
+            )
+            await test(hass, coordinator, server, sensors)
+
+    asyncio.run(main())
+
+
+def test_new_components_and_values_are_added():
+    async def test(hass, coordinator, server, sensors):
+        overview = server.overviews[coordinator.facilityId]
+        keys = set(sensors)
+        component = overview['components'][0]
+        component['newValue'] = make_value('newValue', random.Random(0))
+        component['deniedValue'] = make_value('deniedValue', random.Random(0))
+        overview['components'].append(make_component('BUFFER_TANK', 9, random.Random(9)))
+        await coordinator.async_refresh()
+
+        added = set(sensors) - keys
+        assert any(key.endswith('_newValue') for key in added)
+        assert not any(key.endswith('_deniedValue') for key in sensors)
+        assert sum(key.endswith('_bufferTempTop') for key in added) == 1
+        assert keys <= set(sensors)
+
+        # Nothing new, nothing is added.
+        await coordinator.async_refresh()
+        assert len(sensors) == len(keys) + len(added)
+
+    run(test, {CONF_DISCOVER: True, CONF_DENY: 'deniedValue'})
+
+
+def test_missing_values_make_their_sensors_unavailable():
+    async def test(hass, coordinator, server, sensors):
+        overview = server.overviews[coordinator.facilityId]
+        component = overview['components'].pop()
+        gone = [sensor for sensor in sensors.values() if component['componentId'] in sensor.key]
+        assert gone
+        await coordinator.async_refresh()
+
+        for sensor in gone:
+            assert not sensor.available
+            assert hass.states.get(sensor.entity_id).state == STATE_UNAVAILABLE
+        assert all(sensor.available for sensor in sensors.values() if sensor not in gone)
+
+        overview['components'].append(component)
+        await coordinator.async_refresh()
+        assert all(sensor.available for sensor in gone)
+        assert all(hass.states.get(sensor.entity_id).state != STATE_UNAVAILABLE for sensor in gone)
+
+    run(test)
+
+
+
+def test_stale_values_are_served_until_the_grace_expires():
+    async def test(hass, coordinator, server, sensors):
+        sensor = next(iter(sensors.values()))
+        devices = coordinator.data.devices
+        server.overviews.pop(coordinator.facilityId)
+
+        # Within the grace window, the last values are served with the stale flag.
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator.data.devices is devices
+        assert sensor.available
+        assert hass.states.get(sensor.entity_id).attributes['stale']
+
+        # Past it, the refresh fails and the sensors become unavailable.
+        coordinator.last_success -= coordinator.stale_grace + 1
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        assert isinstance(coordinator.last_exception, UpdateFailed)
+        assert not sensor.available
+        assert hass.states.get(sensor.entity_id).state == STATE_UNAVAILABLE
+        assert coordinator.stale_polls == 1
+
+    run(test)
+
+
+def test_only_changed_sensors_write_their_state():
+    async def test(hass, coordinator, server, sensors):
+        writes = coordinator.state_writes
+        await coordinator.async_refresh()
+        assert coordinator.state_writes == writes
+        assert coordinator.state_writes_skipped >= len(sensors)
+
+        component = server.overviews[coordinator.facilityId]['components'][0]
+        name = next(name for name, value in component.items() if isinstance(value, dict) and 'unit' in value)
+        component[name]['value'] = '42.5'
+        sensor = next(
+            sensor for key, sensor in sensors.items() if component['componentId'] in key and key.endswith(f"_{name}")
+        )
+        await coordinator.async_refresh()
+
+        assert coordinator.state_writes == writes + 1
+        assert float(hass.states.get(sensor.entity_id).state) == 42.5
+
+    run(test)
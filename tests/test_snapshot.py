@@ -0,0 +1,66 @@
+"""Tests of the startup from the last known devices."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.coordinator import FroelingDataCoordinator  # noqa: E402
+from custom_components.froeling_connect.froeling_client.parser import parse_devices  # noqa: E402
+from custom_components.froeling_connect.snapshot import dump_snapshot, load_snapshot  # noqa: E402
+
+from benchmarks.mock_server import MockFroelingConnect  # noqa: E402
+from benchmarks.synthetic import make_overview  # noqa: E402
+
+from .common import async_setup_coordinator, async_test_home_assistant, mock_entry  # noqa: E402
+
+
+def test_snapshot_round_trip():
+    devices = parse_devices('ctrl', make_overview(10))
+    # Saved as JSON by the store
+    snapshot = json.loads(json.dumps(dump_snapshot(devices)))
+    # Written by another version of the integration
+    snapshot['devices'].append({'key': 'other', 'isParent': False, 'class': 'Unknown', 'device': {}})
+
+    loaded, details = load_snapshot(snapshot)
+    assert loaded == devices
+    assert details == []
+
+
+def test_coordinator_starts_from_the_snapshot():
+    async def main():
+        server = MockFroelingConnect(components=3, churn=0)
+        async with async_test_home_assistant(server) as hass:
+            facilityId = server.facility_ids[0]
+            first = await async_setup_coordinator(hass, facilityId)
+            await first.async_refresh()
+            await first._snapshot_store.async_save(first._snapshot_data())
+            logins = server.logins
+
+            # Set up again, like after a restart.
+            coordinator = FroelingDataCoordinator(hass, mock_entry(facilityId, entry_id=facilityId))
+            assert await coordinator.async_load_snapshot()
+            assert coordinator.hub is None
+            assert coordinator.stale
+            assert coordinator.data.devices == first.data.devices
+            assert server.logins == logins
+
+            await coordinator.async_refresh()
+            assert coordinator.last_update_success
+            assert not coordinator.stale
+            assert coordinator.hub is first.hub
+
+    asyncio.run(main())
+
+
+def test_no_snapshot_needs_the_first_refresh():
+    async def main():
+        server = MockFroelingConnect(components=3, churn=0)
+        async with async_test_home_assistant(server) as hass:
+            coordinator = FroelingDataCoordinator(hass, mock_entry(server.facility_ids[0]))
+            assert not await coordinator.async_load_snapshot()
+            assert coordinator.data is None
+
+    asyncio.run(main())
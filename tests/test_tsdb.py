@@ -0,0 +1,74 @@
+"""Tests of the time-series store."""
+
+import os
+
+from froeling_client.tsdb import RECORD_SIZE, Series, TimeSeriesReader, TimeSeriesWriter, segment_name
+
+BOILER = Series('100000', '1_100', 'Boiler', '°C')
+BUFFER = Series('100001', '2_200', 'Buffer', '%')
+# 2024-01-01 00:00:00 UTC
+DAY = 1_704_067_200
+
+
+def test_query_range_and_series(tmp_path):
+    writer = TimeSeriesWriter(str(tmp_path))
+    for second in range(10):
+        writer.append(DAY + second, BOILER, 60.0 + second)
+        writer.append(DAY + second, BUFFER, float(second))
+    writer.flush()
+
+    reader = TimeSeriesReader(str(tmp_path))
+    assert reader.find(facility='100000') == {0: BOILER}
+    assert reader.find(name='Buffer') == {1: BUFFER}
+    assert list(reader.query(DAY + 2, DAY + 4, {0})) == [(DAY + 2, 0, 62.0), (DAY + 3, 0, 63.0)]
+    assert len(list(reader.query(DAY, DAY + 10))) == 20
+    assert list(reader.query(DAY + 10, DAY + 20)) == []
+
+
+def test_segments_per_day(tmp_path):
+    writer = TimeSeriesWriter(str(tmp_path))
+    writer.append(DAY - 1, BOILER, 1.0)
+    writer.append(DAY, BOILER, 2.0)
+    writer.flush()
+
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith('.bin')) == [
+        segment_name(DAY - 1), segment_name(DAY)
+    ]
+    assert [value for _, _, value in TimeSeriesReader(str(tmp_path)).query(DAY - 1, DAY + 1)] == [1.0, 2.0]
+    assert writer.bytes_written == 2 * RECORD_SIZE
+
+
+def test_timestamps_keep_their_order(tmp_path):
+    writer = TimeSeriesWriter(str(tmp_path))
+    writer.append(DAY + 5, BOILER, 1.0)
+    writer.append(DAY + 3, BOILER, 2.0)
+    writer.flush()
+
+    assert [timestamp for timestamp, _, _ in TimeSeriesReader(str(tmp_path)).query(DAY, DAY + 10)] == [
+        DAY + 5, DAY + 5
+    ]
+
+
+def test_reopened_store_keeps_series_ids(tmp_path):
+    writer = TimeSeriesWriter(str(tmp_path))
+    writer.append(DAY, BOILER, 1.0)
+    writer.flush()
+
+    writer = TimeSeriesWriter(str(tmp_path))
+    writer.append(DAY + 1, BUFFER, 2.0)
+    writer.append(DAY + 2, BOILER, 3.0)
+    writer.flush()
+
+    reader = TimeSeriesReader(str(tmp_path))
+    assert reader.series == [BOILER, BUFFER]
+    assert list(reader.query(DAY, DAY + 3)) == [(DAY, 0, 1.0), (DAY + 1, 1, 2.0), (DAY + 2, 0, 3.0)]
+
+
+def test_partial_record_is_ignored(tmp_path):
+    writer = TimeSeriesWriter(str(tmp_path))
+    writer.append(DAY, BOILER, 1.0)
+    writer.flush()
+    with open(tmp_path / segment_name(DAY), 'ab') as handle:
+        handle.write(b'\0' * (RECORD_SIZE // 2))
+
+    assert list(TimeSeriesReader(str(tmp_path)).query(DAY, DAY + 1)) == [(DAY, 0, 1.0)]
@@ -0,0 +1,127 @@
+"""Tests of the debounced parameter writes."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.froeling_connect.froeling_client.api import APIConnectionError  # noqa: E402
+from custom_components.froeling_connect.writer import ParameterWriter  # noqa: E402
+
+from .common import async_test_home_assistant  # noqa: E402
+
+DELAY = 0.01
+
+
+class FakeApi:
+    """Records the written parameters, failing with error if set."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.writes: list[tuple[str, int, str]] = []
+        # Holds the writes while cleared
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def set_parameter(self, facilityId: str, componentId: str, parameterId: int, value: str) -> None:
+        self.writes.append((componentId, parameterId, value))
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+
+
+def run(test, hub=...):
+    """Run a test with a writer of a coordinator, whose hub has a FakeApi unless given."""
+    async def main():
+        async with async_test_home_assistant() as hass:
+            refreshes = []
+
+            async def request_refresh():
+                refreshes.append(True)
+
+            coordinator = SimpleNamespace(
+                hass=hass, facilityId='100000', async_request_refresh=request_refresh,
+                hub=SimpleNamespace(api=FakeApi()) if hub is ... else hub,
+            )
+            writer = ParameterWriter(coordinator, DELAY)
+            try:
+                await test(writer, coordinator, refreshes)
+            finally:
+                writer.async_shutdown()
+
+    asyncio.run(main())
+
+
+async def settle(hass) -> None:
+    await asyncio.sleep(DELAY * 5)
+    await hass.async_block_till_done()
+
+
+def test_changes_are_merged():
+    async def test(writer, coordinator, refreshes):
+        rollbacks = []
+        writer.async_set('1_100', 1, '20', lambda: rollbacks.append(1))
+        writer.async_set('1_100', 1, '21', lambda: rollbacks.append(2))
+        writer.async_set('1_100', 2, '5', lambda: rollbacks.append(3))
+        assert writer.pending('1_100', 1)
+        await settle(coordinator.hass)
+
+        assert coordinator.hub.api.writes == [('1_100', 1, '21'), ('1_100', 2, '5')]
+        assert (writer.requested, writer.coalesced, writer.written, writer.failed) == (3, 1, 2, 0)
+        assert not writer.pending('1_100', 1)
+        assert not rollbacks
+        assert refreshes
+
+    run(test)
+
+
+@pytest.mark.parametrize('error', [APIConnectionError("offline"), RuntimeError("unexpected")])
+def test_failed_write_rolls_back(error):
+    async def test(writer, coordinator, refreshes):
+        coordinator.hub.api.error = error
+        rollbacks = []
+        writer.async_set('1_100', 1, '20', lambda: rollbacks.append(1))
+        writer.async_set('1_100', 1, '21', lambda: rollbacks.append(2))
+        await settle(coordinator.hass)
+
+        assert rollbacks == [1, 2]
+        assert writer.failed == 1
+        assert not writer.pending('1_100', 1)
+        assert not refreshes
+
+    run(test)
+
+
+def test_missing_hub_rolls_back():
+    async def test(writer, coordinator, refreshes):
+        rollbacks = []
+        writer.async_set('1_100', 1, '20', lambda: rollbacks.append(1))
+        await settle(coordinator.hass)
+
+        assert rollbacks == [1]
+        assert not writer.pending('1_100', 1)
+
+    run(test, hub=None)
+
+
+def test_change_during_write_is_written_after_it():
+    async def test(writer, coordinator, refreshes):
+        api = coordinator.hub.api
+        api.release.clear()
+        rollbacks = []
+        writer.async_set('1_100', 1, '20', lambda: rollbacks.append(1))
+        await asyncio.sleep(DELAY * 5)
+        assert api.writes == [('1_100', 1, '20')]
+
+        writer.async_set('1_100', 1, '22', lambda: rollbacks.append(2))
+        api.release.set()
+        await settle(coordinator.hass)
+
+        assert api.writes == [('1_100', 1, '20'), ('1_100', 1, '22')]
+        assert writer.written == 2
+        assert not writer.pending('1_100', 1)
+        assert not rollbacks
+
+    run(test)